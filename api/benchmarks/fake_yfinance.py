@@ -0,0 +1,157 @@
+"""A deterministic stand-in for yfinance, with configurable latency.
+
+`install()` registers it as the `yfinance` module, so the price and quote
+services import it instead of calling Yahoo. Prices and bars are derived
+from the ticker symbol, so every run and every worker sees the same data,
+and each call sleeps for `latency` plus up to `jitter` seconds drawn from
+a seeded generator, like a blocking HTTP call would.
+"""
+
+# built-in modules
+import sys
+import time
+import types
+import random
+import hashlib
+import threading
+from datetime import datetime, timedelta
+
+# Trading days returned by `history()` per period
+PERIOD_DAYS = {
+    "1d": 1,
+    "5d": 5,
+    "1mo": 21,
+    "3mo": 63,
+    "6mo": 126,
+    "1y": 252,
+    "2y": 504,
+    "5y": 1260,
+    "10y": 2520,
+    "ytd": 200,
+    "max": 5000,
+}
+
+
+class FakeYahoo:
+    """Upstream state shared by every `Ticker`: latency and call counts."""
+
+    def __init__(
+        self,
+        latency: float = 0.05,
+        jitter: float = 0.02,
+        seed: int = 0,
+        known: set[str] | None = None,
+    ):
+        self.latency = latency
+        self.jitter = jitter
+        self.known = known
+        self.calls = 0
+
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def wait(self):
+        with self._lock:
+            self.calls += 1
+            delay = self.latency + self._rng.uniform(0, self.jitter)
+        if delay > 0:
+            time.sleep(delay)
+
+    def is_known(self, ticker: str) -> bool:
+        return self.known is None or ticker in self.known
+
+
+def _base_price(ticker: str) -> float:
+    digest = hashlib.blake2b(ticker.encode(), digest_size=4).digest()
+    return 5 + int.from_bytes(digest, "big") % 100_000 / 100
+
+
+class Ticker:
+    def __init__(self, ticker: str, yahoo: FakeYahoo):
+        self.ticker = ticker
+        self._yahoo = yahoo
+
+    @property
+    def info(self) -> dict:
+        self._yahoo.wait()
+        if not self._yahoo.is_known(self.ticker):
+            # What Yahoo returns for unknown symbols
+            return {"trailingPegRatio": None}
+
+        price = _base_price(self.ticker)
+        change = round(price * 0.01, 2)
+        return {
+            "currentPrice": price,
+            "regularMarketPrice": price,
+            "regularMarketChange": change,
+            "regularMarketChangePercent": 1.0,
+            "volume": int(price * 10_000),
+            "averageVolume": int(price * 12_000),
+        }
+
+    def history(self, period="1mo", interval="1d", start=None, end=None):
+        # pandas is only needed once quotes are requested, as with yfinance
+        import pandas as pd
+
+        self._yahoo.wait()
+
+        if start:
+            end_date = datetime.fromisoformat(end) if end else datetime(2025, 1, 1)
+            days = max(1, (end_date - datetime.fromisoformat(start)).days)
+        else:
+            end_date = datetime(2025, 1, 1)
+            days = PERIOD_DAYS.get(period, 21)
+
+        if not self._yahoo.is_known(self.ticker):
+            days = 0
+
+        # A deterministic random walk around the ticker's base price
+        rng = random.Random(self.ticker)
+        price = _base_price(self.ticker)
+        rows = []
+        for _ in range(days):
+            open_ = price
+            price = max(1.0, price * (1 + rng.uniform(-0.02, 0.02)))
+            rows.append(
+                (
+                    open_,
+                    price,
+                    max(open_, price) * 1.01,
+                    min(open_, price) * 0.99,
+                    rng.randint(10**5, 10**7),
+                )
+            )
+
+        index = pd.DatetimeIndex(
+            [end_date - timedelta(days=days - i) for i in range(days)], tz="UTC"
+        )
+        return pd.DataFrame(
+            rows, index=index, columns=["Open", "Close", "High", "Low", "Volume"]
+        )
+
+
+def install(
+    latency: float = 0.05,
+    jitter: float = 0.02,
+    seed: int = 0,
+    known: set[str] | None = None,
+) -> FakeYahoo:
+    """Register the fake as the `yfinance` module of this process.
+
+    Args:
+        latency (float): Seconds every call blocks for
+        jitter (float): Extra seconds, drawn uniformly, added to `latency`
+        seed (int): Seed of the jitter, so runs are reproducible
+        known (set): Tickers Yahoo knows; None knows every ticker
+
+    Returns:
+        FakeYahoo: The upstream, to read its call count from
+    """
+    yahoo = FakeYahoo(latency, jitter, seed, known)
+
+    module = types.ModuleType("yfinance")
+    module.Ticker = lambda ticker: Ticker(ticker, yahoo)
+    module.upstream = yahoo
+    sys.modules["yfinance"] = module
+
+    return yahoo
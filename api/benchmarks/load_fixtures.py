@@ -0,0 +1,286 @@
+"""Seed a MongoDB database with synthetic stocks, indices, news and users.
+
+Documents are generated deterministically from `--seed`, in the shape the
+scrapers store them, so the same scale always produces the same data. Use
+it to fill a local MongoDB for `load_test.py --url`; the in-process load
+test seeds mongomock with the same generator.
+
+Usage (from the api directory, MONGODB_URI pointing at a local server):
+    python benchmarks/load_fixtures.py --stocks 5000 --news 50000 --drop
+"""
+
+# built-in modules
+import os
+import sys
+import random
+import argparse
+from datetime import datetime, timedelta
+
+# pip modules
+from dotenv import load_dotenv
+from passlib.hash import bcrypt
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+# Fixture sizes by name, as (stocks, indices, news, users)
+SCALES = {
+    "small": (500, 20, 2_000, 10),
+    "medium": (5_000, 50, 20_000, 100),
+    "large": (10_000, 100, 200_000, 1_000),
+}
+
+SECTORS = [
+    "Technology",
+    "Healthcare",
+    "Financial Services",
+    "Consumer Cyclical",
+    "Energy",
+    "Industrials",
+    "Communication Services",
+    "Utilities",
+]
+SUFFIXES = ["Inc.", "Corporation", "Holdings", "Group", "Technologies", "plc"]
+WORDS = [
+    "Apex", "Blue", "Cedar", "Delta", "Ember", "Frontier", "Granite", "Harbor",
+    "Iron", "Juniper", "Keystone", "Lumen", "Meridian", "Northern", "Orbit",
+    "Pioneer", "Quantum", "Ridge", "Summit", "Titan", "Unity", "Vertex",
+    "Willow", "Zenith", "Atlas", "Beacon", "Crest", "Dynamo", "Evergreen",
+]  # fmt: skip
+HEADLINES = [
+    "{company} beats quarterly earnings estimates",
+    "{company} shares fall after guidance cut",
+    "{company} announces ${amount} billion buyback",
+    "Analysts upgrade {company} on strong demand",
+    "{company} to acquire rival in ${amount} billion deal",
+    "{company} misses revenue forecast as costs rise",
+    "{company} raises dividend by {amount}%",
+    "Regulators open probe into {company}",
+]
+PUBLISHERS = [
+    ("Yahoo Finance", "https://finance.yahoo.com"),
+    ("Reuters", "https://www.reuters.com"),
+    ("CNBC", "https://www.cnbc.com"),
+    ("MarketWatch", "https://www.marketwatch.com"),
+]
+SENTIMENTS = [("Positive", 0.6), ("Neutral", 0.0), ("Negative", -0.6)]
+
+# Every seeded user logs in with this password
+PASSWORD = "load-test-password"
+
+
+def make_ticker(index: int) -> str:
+    letters = ""
+    index += 26  # at least two letters
+    while index:
+        index, remainder = divmod(index, 26)
+        letters = chr(ord("A") + remainder) + letters
+    return letters
+
+
+def generate_stocks(count: int, rng: random.Random, now: datetime) -> list[dict]:
+    stocks = []
+    for i in range(count):
+        name = f"{rng.choice(WORDS)} {rng.choice(WORDS)} {rng.choice(SUFFIXES)}"
+        stocks.append(
+            {
+                "ticker": make_ticker(i),
+                "companyName": name,
+                "description": f"{name} is a synthetic company used in load tests.",
+                "sector": rng.choice(SECTORS),
+                "industry": "Synthetic",
+                "exchange": {"name": "NASDAQ", "symbol": "NMS"},
+                "logoUrl": "https://example.com/logo.png",
+                "website": "https://example.com",
+                "locale": "us",
+                "country": "United States",
+                "address": {"city": "New York", "state": "NY", "zip_code": "10001"},
+                "market": "stocks",
+                "employees": rng.randint(10, 200_000),
+                "companyOfficers": [
+                    {"name": "Jane Doe", "title": "CEO", "age": rng.randint(40, 70)}
+                ],
+                "currency": "USD",
+                "marketCap": rng.randint(10**7, 3 * 10**12),
+                "createdAt": now,
+                "updatedAt": now,
+            }
+        )
+    return stocks
+
+
+def generate_indices(count: int, now: datetime) -> list[dict]:
+    return [
+        {
+            "ticker": f"^IDX{i}",
+            "name": f"Synthetic Index {i}",
+            "exchangeName": "SNP",
+            "exchange": "SNP",
+            "locale": "US",
+            "market": "indices",
+            "currency": "USD",
+            "createdAt": now,
+            "updatedAt": now,
+        }
+        for i in range(count)
+    ]
+
+
+def generate_news(
+    count: int, stocks: list[dict], rng: random.Random, now: datetime
+) -> list[dict]:
+    # A few tickers get most of the coverage, like real news
+    weights = [1 / (rank + 1) for rank in range(len(stocks))]
+
+    news = []
+    for i in range(count):
+        mentioned = {
+            stock["ticker"]: stock
+            for stock in rng.choices(stocks, weights=weights, k=rng.randint(1, 3))
+        }
+        first = next(iter(mentioned.values()))
+        title = rng.choice(HEADLINES).format(
+            company=first["companyName"], amount=rng.randint(1, 50)
+        )
+        publisher, homepage = rng.choice(PUBLISHERS)
+        published_at = now - timedelta(minutes=rng.randint(0, 60 * 24 * 365))
+
+        insights = []
+        for ticker in mentioned:
+            sentiment, score = rng.choice(SENTIMENTS)
+            insights.append(
+                {
+                    "ticker": ticker,
+                    "sentiment": sentiment,
+                    "sentimentReasoning": title,
+                    "sentimentScore": round(score + rng.uniform(-0.3, 0.3), 4),
+                }
+            )
+
+        news.append(
+            {
+                "title": title,
+                "description": "",
+                "articleUrl": f"https://example.com/news/{i}",
+                "imageUrl": "https://example.com/image.png",
+                "authors": [],
+                "publishedAt": published_at,
+                "publisher": {
+                    "name": publisher,
+                    "homepageUrl": homepage,
+                    "logoUrl": f"{homepage}/logo.png",
+                },
+                "tickers": list(mentioned),
+                "insights": insights,
+                "createdAt": published_at,
+                "updatedAt": published_at,
+            }
+        )
+    return news
+
+
+def generate_users(count: int, rng: random.Random, now: datetime) -> list[dict]:
+    # Hashing once keeps large user counts cheap to generate
+    password = bcrypt.using(rounds=4).hash(PASSWORD)
+    return [
+        {
+            "name": f"Load Test {i}",
+            "email": f"load-test-{i}@example.com",
+            "password": password,
+            "apiKey": "lt_" + "%032x" % rng.getrandbits(128),
+            "createdAt": now,
+            "updatedAt": now,
+        }
+        for i in range(count)
+    ]
+
+
+def seed(
+    db,
+    stocks: int,
+    indices: int,
+    news: int,
+    users: int,
+    seed: int = 0,
+    batch_size: int = 5000,
+) -> dict:
+    """Insert the fixtures into `db` (a pymongo or mongomock database).
+
+    Returns:
+        dict: The seeded `tickers` (stocks by market cap, then indices) and
+            user `api_keys`, for the load test to build requests from
+    """
+    rng = random.Random(seed)
+    now = datetime(2025, 1, 1)
+
+    stock_docs = generate_stocks(stocks, rng, now)
+    index_docs = generate_indices(indices, now)
+    user_docs = generate_users(users, rng, now)
+
+    for collection, docs in (
+        ("stocks", stock_docs),
+        ("indices", index_docs),
+        ("users", user_docs),
+    ):
+        if docs:
+            db[collection].insert_many(docs)
+
+    stock_docs.sort(key=lambda stock: stock["marketCap"], reverse=True)
+    for start in range(0, news, batch_size):
+        db["news_articles"].insert_many(
+            generate_news(min(batch_size, news - start), stock_docs, rng, now)
+        )
+
+    return {
+        "tickers": [stock["ticker"] for stock in stock_docs]
+        + [index["ticker"] for index in index_docs],
+        "api_keys": [user["apiKey"] for user in user_docs],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scale", choices=SCALES, default="small")
+    parser.add_argument("--stocks", type=int)
+    parser.add_argument("--indices", type=int)
+    parser.add_argument("--news", type=int)
+    parser.add_argument("--users", type=int)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--drop", action="store_true", help="Drop existing data")
+    parser.add_argument("--keys-file", default="load_test_keys.txt")
+    args = parser.parse_args()
+
+    load_dotenv()
+
+    # Imported after load_dotenv, which provides MONGODB_URI
+    from configs.db import connect_db
+    from mongoengine import connection
+
+    if not connect_db():
+        raise SystemExit("MongoDB is unreachable")
+
+    db = connection.get_db()
+    if args.drop:
+        for collection in ("stocks", "indices", "news_articles", "users"):
+            db.drop_collection(collection)
+
+    stocks, indices, news, users = SCALES[args.scale]
+    fixtures = seed(
+        db,
+        stocks=args.stocks if args.stocks is not None else stocks,
+        indices=args.indices if args.indices is not None else indices,
+        news=args.news if args.news is not None else news,
+        users=args.users if args.users is not None else users,
+        seed=args.seed,
+    )
+
+    with open(args.keys_file, "w") as file:
+        file.write("\n".join(fixtures["api_keys"]) + "\n")
+
+    print(
+        f"Seeded {len(fixtures['tickers'])} tickers and "
+        f"{len(fixtures['api_keys'])} users, API keys written to {args.keys_file}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,324 @@
+"""Load test the /api/v1 routes with mongomock and a fake yfinance.
+
+By default the app runs in this process: mongomock is seeded by
+load_fixtures.py, fake_yfinance.py stands in for Yahoo, and requests go
+through httpx's ASGI transport, so no Atlas, Yahoo or network is involved.
+The driver shares the event loop with the app, so numbers are a lower
+bound of a real server's; use them to compare runs with each other.
+mongomock is not thread-safe (it edits projections in place), so routes
+running queries on several threads may show a few errors in process.
+
+`--serve PORT` runs the same seeded app under uvicorn for external load
+generators (wrk, k6) or for `--url`, which drives any running server given
+one of its API keys (e.g. a server on a MongoDB seeded by load_fixtures.py).
+
+Every route is hammered in turn by `--concurrency` clients for `--duration`
+seconds after a short warm-up. Tickers are drawn with Zipf-like weights, so
+a few are hot, as with real traffic.
+
+Needs the test dependencies (`pip install -r requirements-dev.txt`).
+
+Usage (from the api directory):
+    python benchmarks/load_test.py --concurrency 32 --duration 10
+    python benchmarks/load_test.py --routes price quotes --yfinance-latency 0.2
+    python benchmarks/load_test.py --serve 8001
+    python benchmarks/load_test.py --url http://localhost:8001 --api-key lt_...
+"""
+
+# built-in modules
+import os
+import sys
+import json
+import time
+import random
+import asyncio
+import argparse
+import tempfile
+import statistics
+
+# pip modules
+import httpx
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+# custom modules
+import fake_yfinance
+from load_fixtures import SCALES, seed
+
+# Request paths by route name, built from a picked ticker and the tickers
+ROUTES = {
+    "tickers": lambda ticker, pick: (
+        "/api/v1/tickers?limit=50&sort_by=marketCap&order=desc"
+    ),
+    "ticker": lambda ticker, pick: f"/api/v1/tickers/{ticker}",
+    "news": lambda ticker, pick: f"/api/v1/news?ticker={ticker}&limit=20",
+    "news_export": lambda ticker, pick: f"/api/v1/news/export?ticker={ticker}",
+    "sentiment": lambda ticker, pick: f"/api/v1/sentiments/trend/{ticker}",
+    "search": lambda ticker, pick: f"/api/v1/search?q={ticker[:2].lower()}",
+    "price": lambda ticker, pick: f"/api/v1/prices/{ticker}",
+    "prices": lambda ticker, pick: (
+        f"/api/v1/prices?tickers={ticker},{pick()},{pick()}"
+    ),
+    "quotes": lambda ticker, pick: f"/api/v1/quotes/{ticker}",
+}
+
+# Tickers requests are drawn from, most traded first
+HOT_TICKERS = 1000
+
+
+def configure_environment():
+    """Defaults for a self-contained run, set before the app is imported."""
+    # Rate limiting would otherwise cap every client at 60 requests
+    os.environ.setdefault("RATE_LIMIT_CAPACITY", "1000000000")
+    os.environ.setdefault("RATE_LIMIT_REFILL_RATE", "1000000000")
+    # Keep the shared cache from carrying entries over between runs
+    os.environ.setdefault("CACHE_BACKEND", "memory")
+    # mongomock has neither Atlas Search nor $text, so news search runs on
+    # a BM25 index of the seeded articles, in a file of its own
+    os.environ.setdefault("NEWS_SEARCH_BACKEND", "bm25")
+    os.environ.setdefault(
+        "NEWS_INDEX_PATH",
+        os.path.join(tempfile.mkdtemp(prefix="load-test-"), "news_index.sqlite3"),
+    )
+    os.environ.setdefault("JWT_SECRET_KEY", "load-test")
+    os.environ.setdefault("JWT_ALGORITHM", "HS256")
+    os.environ.setdefault("JWT_EXPIRATION_TIME", "60")
+
+
+def start_app(args):
+    """Seed mongomock, install the fake yfinance and return the warmed app."""
+    import mongomock
+    from mongoengine import connect, connection
+
+    configure_environment()
+
+    connect(db="finoxa_db", alias="default", mongo_client_class=mongomock.MongoClient)
+
+    stocks, indices, news, users = (
+        default if value is None else value
+        for value, default in zip(
+            (args.stocks, args.indices, args.news, args.users), SCALES[args.scale]
+        )
+    )
+    started_at = time.perf_counter()
+    fixtures = seed(connection.get_db(), stocks, indices, news, users, seed=args.seed)
+    print(
+        f"Seeded {len(fixtures['tickers'])} tickers and {news} articles "
+        f"in {time.perf_counter() - started_at:.1f}s"
+    )
+
+    fake_yfinance.install(
+        latency=args.yfinance_latency,
+        jitter=args.yfinance_jitter,
+        seed=args.seed,
+        known=set(fixtures["tickers"]),
+    )
+
+    from services.news_search_service import BM25NewsSearch, get_news_search_backend
+
+    news_search = get_news_search_backend()
+    if isinstance(news_search, BM25NewsSearch):
+        news_search.rebuild()
+
+    # The lifespan handler would connect to MONGODB_URI, so start up here
+    import server
+    from services.warmup_service import warm_up
+
+    warm_up()
+    server.app.state.ready = True
+
+    stock_tickers = [ticker for ticker in fixtures["tickers"] if "^" not in ticker]
+    return server.app, stock_tickers, fixtures["api_keys"][0]
+
+
+def percentile(values: list[float], q: int) -> float:
+    if len(values) < 2:
+        return values[0] if values else 0.0
+    return statistics.quantiles(values, n=100)[q - 1]
+
+
+async def hammer(
+    client: httpx.AsyncClient,
+    route: str,
+    tickers: list[str],
+    concurrency: int,
+    duration: float,
+    seed_: int,
+) -> tuple[list[float], dict[int, int], int]:
+    """Run `concurrency` clients against `route` for `duration` seconds.
+
+    Returns:
+        tuple: Latencies in ms, responses by status code, failed requests
+    """
+    make_path = ROUTES[route]
+    weights = [1 / (rank + 1) for rank in range(len(tickers))]
+    latencies = []
+    statuses: dict[int, int] = {}
+    failures = 0
+    deadline = time.perf_counter() + duration
+
+    async def worker(worker_id: int):
+        nonlocal failures
+        rng = random.Random(seed_ * 1000 + worker_id)
+
+        def pick() -> str:
+            return rng.choices(tickers, weights=weights)[0]
+
+        while time.perf_counter() < deadline:
+            path = make_path(pick(), pick)
+            started_at = time.perf_counter()
+            try:
+                response = await client.get(path)
+            except Exception:
+                # In process, errors raised by the app surface here too
+                failures += 1
+                continue
+            latencies.append((time.perf_counter() - started_at) * 1000)
+            statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+
+    await asyncio.gather(*(worker(i) for i in range(concurrency)))
+    return latencies, statuses, failures
+
+
+async def run(args, client: httpx.AsyncClient, tickers: list[str]) -> dict:
+    results = {}
+    print(
+        f"{'route':>12} {'requests':>9} {'errors':>7} {'req/s':>9} "
+        f"{'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}"
+    )
+    for route in args.routes:
+        # Fill caches and lazy state before measuring
+        await hammer(client, route, tickers, args.concurrency, args.warmup, args.seed)
+        latencies, statuses, failures = await hammer(
+            client, route, tickers, args.concurrency, args.duration, args.seed
+        )
+
+        errors = failures + sum(n for code, n in statuses.items() if code >= 400)
+        results[route] = {
+            "requests": len(latencies),
+            "errors": errors,
+            "statuses": {str(code): count for code, count in sorted(statuses.items())},
+            "rps": round(len(latencies) / args.duration, 1),
+            "p50_ms": round(percentile(latencies, 50), 2),
+            "p95_ms": round(percentile(latencies, 95), 2),
+            "p99_ms": round(percentile(latencies, 99), 2),
+        }
+        stats = results[route]
+        print(
+            f"{route:>12} {stats['requests']:9d} {stats['errors']:7d} "
+            f"{stats['rps']:9.1f} {stats['p50_ms']:8.2f} {stats['p95_ms']:8.2f} "
+            f"{stats['p99_ms']:8.2f}"
+        )
+    return results
+
+
+async def fetch_tickers(client: httpx.AsyncClient) -> list[str]:
+    response = await client.get(
+        "/api/v1/tickers",
+        params={
+            "market": "stocks",
+            "sort_by": "marketCap",
+            "order": "desc",
+            "limit": HOT_TICKERS,
+        },
+    )
+    response.raise_for_status()
+    return [ticker["ticker"] for ticker in response.json()["data"]]
+
+
+async def drive(args):
+    if args.url:
+        transport = None
+        base_url = args.url
+        api_key = args.api_key
+        tickers = None
+    else:
+        app, tickers, api_key = start_app(args)
+        transport = httpx.ASGITransport(app=app)
+        base_url = "http://load-test"
+
+    async with httpx.AsyncClient(
+        transport=transport,
+        base_url=base_url,
+        headers={"Authorization": f"Bearer {api_key}"},
+        timeout=args.timeout,
+        limits=httpx.Limits(max_connections=args.concurrency),
+    ) as client:
+        if tickers is None:
+            tickers = await fetch_tickers(client)
+        tickers = tickers[:HOT_TICKERS]
+        if not tickers:
+            raise SystemExit("No stocks to request")
+
+        print(
+            f"{args.concurrency} clients, {args.duration}s per route "
+            f"after {args.warmup}s warm-up"
+        )
+        return await run(args, client, tickers)
+
+
+def serve(args):
+    import uvicorn
+
+    app, _, api_key = start_app(args)
+    print(f"Serving on port {args.serve}, API key {api_key}")
+    uvicorn.run(app, host="127.0.0.1", port=args.serve, lifespan="off")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--routes", nargs="+", choices=ROUTES, default=list(ROUTES))
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=5, help="Seconds per route")
+    parser.add_argument("--warmup", type=float, default=1, help="Seconds per route")
+    parser.add_argument("--timeout", type=float, default=30)
+    parser.add_argument("--output", help="Save the results as JSON")
+
+    fixtures = parser.add_argument_group("in-process fixtures")
+    fixtures.add_argument("--scale", choices=SCALES, default="small")
+    fixtures.add_argument("--stocks", type=int)
+    fixtures.add_argument("--indices", type=int)
+    fixtures.add_argument("--news", type=int)
+    fixtures.add_argument("--users", type=int)
+    fixtures.add_argument("--seed", type=int, default=0)
+    fixtures.add_argument(
+        "--yfinance-latency", type=float, default=0.05, help="Seconds per call"
+    )
+    fixtures.add_argument(
+        "--yfinance-jitter", type=float, default=0.02, help="Extra seconds, at most"
+    )
+
+    remote = parser.add_argument_group("remote server")
+    remote.add_argument("--serve", type=int, metavar="PORT")
+    remote.add_argument("--url")
+    remote.add_argument("--api-key")
+    args = parser.parse_args()
+
+    if args.url and not args.api_key:
+        parser.error("--url needs --api-key")
+
+    if args.serve:
+        serve(args)
+        return
+
+    results = asyncio.run(drive(args))
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(
+                {
+                    "concurrency": args.concurrency,
+                    "duration": args.duration,
+                    "target": args.url or f"in-process ({args.scale})",
+                    "yfinance_latency": None if args.url else args.yfinance_latency,
+                    "routes": results,
+                },
+                file,
+                indent=2,
+            )
+        print(f"Results saved to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""Compare the BM25 news index with MongoDB `$text` search.
+
+Builds a throwaway BM25 index from the `news_articles` collection, then runs
+the same queries (words sampled from stored titles, plus partially typed
+prefixes) against both backends and reports latency and result overlap.
+
+Usage (from the api directory):
+    python benchmarks/news_search_benchmark.py --queries 200
+"""
+
+# built-in modules
+import os
+import sys
+import time
+import random
+import argparse
+import statistics
+import tempfile
+
+# pip modules
+from dotenv import load_dotenv
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+# custom modules
+from configs.db import connect_db
+from models.newsArticle_model import NewsArticle
+from services.news_search_service import (
+    BM25NewsSearch,
+    MongoTextNewsSearch,
+    tokenize,
+)
+from services.read_service import find_raw
+
+
+def sample_queries(count: int, seed: int) -> list[str]:
+    rng = random.Random(seed)
+    titles = [doc["title"] for doc in find_raw(NewsArticle, projection={"title": 1})]
+    if not titles:
+        raise SystemExit("No news articles to benchmark against")
+
+    queries = []
+    while len(queries) < count:
+        words = tokenize(rng.choice(titles))
+        if not words:
+            continue
+        start = rng.randrange(len(words))
+        query = " ".join(words[start : start + rng.randint(1, 3)])
+        # Every third query is cut short, like a user still typing
+        if len(queries) % 3 == 2 and len(query) > 4:
+            query = query[: rng.randint(3, len(query) - 1)]
+        queries.append(query)
+
+    return queries
+
+
+def run(backend, queries: list[str], limit: int) -> tuple[list[float], list[list[str]]]:
+    latencies = []
+    results = []
+    for query in queries:
+        started_at = time.perf_counter()
+        articles = backend.search(query, limit=limit)
+        latencies.append((time.perf_counter() - started_at) * 1000)
+        results.append([str(article["_id"]) for article in articles])
+    return latencies, results
+
+
+def report(name: str, latencies: list[float], results: list[list[str]]):
+    ordered = sorted(latencies)
+    p95 = ordered[max(0, int(len(ordered) * 0.95) - 1)]
+    hits = sum(1 for result in results if result)
+    print(
+        f"{name:>6}: mean {statistics.mean(latencies):7.2f} ms | "
+        f"p50 {statistics.median(latencies):7.2f} ms | p95 {p95:7.2f} ms | "
+        f"queries with results {hits}/{len(results)}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--limit", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    load_dotenv()
+    if not connect_db():
+        raise SystemExit("Failed to connect to MongoDB")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        bm25 = BM25NewsSearch(path=os.path.join(tmp, "news_index.sqlite3"))
+
+        started_at = time.perf_counter()
+        bm25.rebuild()
+        print(f"Built BM25 index in {time.perf_counter() - started_at:.2f}s")
+
+        queries = sample_queries(args.queries, args.seed)
+
+        bm25_latencies, bm25_results = run(bm25, queries, args.limit)
+        report("bm25", bm25_latencies, bm25_results)
+
+        try:
+            text_latencies, text_results = run(MongoTextNewsSearch(), queries, args.limit)
+        except Exception as e:
+            print(f"  text: unavailable ({e})")
+            return
+        report("text", text_latencies, text_results)
+
+        overlaps = [
+            len(set(a) & set(b)) / max(len(a), len(b))
+            for a, b in zip(bm25_results, text_results)
+            if a or b
+        ]
+        if overlaps:
+            print(f"Mean top-{args.limit} overlap: {statistics.mean(overlaps):.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,233 @@
+"""Find the best split of cores between the NLP stages and inference.
+
+Runs the news scraper's two pipeline stages over benchmarks/data/articles.jsonl
+(summarise and spaCy on the NLP cores, sentiment inference on the inference
+cores, connected by a `StagedRunner`) once per candidate split, each in a
+fresh interpreter restricted to `--cores` cores, since thread pools are
+sized when torch and numpy load. The candidates are every number of
+inference cores, times every `--spacy-processes` value, plus an unpinned
+baseline where every pool is sized to all the cores, as by default.
+
+The best split's settings are printed as the PIPELINE_* variables to give
+the scraper on a machine of that size.
+
+Usage (from the api directory):
+    python benchmarks/parallelism_benchmark.py --repeat 3
+    python benchmarks/parallelism_benchmark.py --cores 4 --spacy-processes 1 2
+"""
+
+# built-in modules
+import os
+import sys
+import json
+import time
+import argparse
+import subprocess
+import tempfile
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+# custom modules
+from pipeline_benchmark import API_DIR, DATA_DIR, DEFAULT_MODEL_PATH, load_corpus
+
+
+def candidates(cores: int, spacy_processes: list[int]) -> list[dict]:
+    """PIPELINE_* settings to try on a machine with `cores` cores."""
+    configs = [
+        {
+            "name": "unpinned",
+            "env": {
+                "PIPELINE_PIN_CORES": "false",
+                "PIPELINE_TORCH_THREADS": str(cores),
+                "PIPELINE_BLAS_THREADS": str(cores),
+            },
+        }
+    ]
+    for inference_cores in range(1, max(cores, 2)):
+        for processes in spacy_processes:
+            configs.append(
+                {
+                    # NLP+inference cores, and spaCy processes when several
+                    "name": (
+                        f"{cores - inference_cores}+{inference_cores}"
+                        if cores > 1
+                        else "shared"
+                    )
+                    + (f" x{processes}" if processes > 1 else ""),
+                    "env": {
+                        "PIPELINE_INFERENCE_CORES": str(inference_cores),
+                        "PIPELINE_SPACY_PROCESSES": str(processes),
+                    },
+                }
+            )
+    return configs
+
+
+def run_config(args) -> dict:
+    """Run the pipeline in this process, as configured by the environment."""
+    if hasattr(os, "sched_setaffinity"):
+        os.sched_setaffinity(0, sorted(os.sched_getaffinity(0))[: args.cores])
+
+    from pipelines.parallelism import split_cores, limit_blas_threads
+
+    nlp_budget, inference_budget = split_cores()
+    limit_blas_threads(nlp_budget.threads)
+
+    from pipelines.parallelism import configure_process
+    from pipelines.summarization import Summarizer
+    from pipelines.ticker_validation import TickerValidator
+    from pipelines.prediction import Prediction
+    from pipelines.runner import Stage, StagedRunner
+
+    configure_process(nlp_budget, inference_budget)
+
+    summarizer = Summarizer()
+    validator = TickerValidator(ticker_data_path=args.tickers)
+    prediction = Prediction(args.model_path)
+
+    def enrich(article):
+        sentences = summarizer.summarize(article["content"])
+        infos = validator.validate_many(
+            sentences, n_process=nlp_budget.spacy_processes
+        )
+        return [
+            sentence
+            for sentence, info in zip(sentences, infos)
+            if info.get("validated_companies")
+        ]
+
+    def score(sentences):
+        return [prediction.predict(sentence) for sentence in sentences]
+
+    runner = StagedRunner(
+        [
+            Stage("enrich", enrich, budget=nlp_budget),
+            Stage(
+                "score",
+                score,
+                budget=inference_budget,
+                setup=inference_budget.apply_torch_threads,
+            ),
+        ]
+    )
+
+    corpus = load_corpus(args.corpus)
+    # One untimed pass to warm caches and lazy initialisation
+    runner.run(corpus)
+
+    started_at = time.perf_counter()
+    completed = runner.run(article for _ in range(args.repeat) for article in corpus)
+    elapsed = time.perf_counter() - started_at
+
+    if runner.errors:
+        stage, _, error = runner.errors[0]
+        raise RuntimeError(f"{len(runner.errors)} failures, first in {stage}: {error}")
+
+    return {
+        "budgets": [repr(nlp_budget), repr(inference_budget)],
+        "articles": completed,
+        "total_s": round(elapsed, 3),
+        "articles_per_s": round(completed / elapsed, 3),
+    }
+
+
+def spawn_config(config: dict, args) -> dict:
+    with tempfile.TemporaryDirectory() as directory:
+        result_path = os.path.join(directory, "result.json")
+        subprocess.run(
+            [
+                sys.executable,
+                os.path.abspath(__file__),
+                "--worker",
+                "--result",
+                result_path,
+                "--cores",
+                str(args.cores),
+                "--corpus",
+                args.corpus,
+                "--tickers",
+                args.tickers,
+                "--model-path",
+                args.model_path,
+                "--repeat",
+                str(args.repeat),
+            ],
+            cwd=API_DIR,
+            # Settings left in this shell would override the candidate's
+            env={
+                **{
+                    name: value
+                    for name, value in os.environ.items()
+                    if not name.startswith("PIPELINE_")
+                },
+                **config["env"],
+            },
+            check=True,
+            stdout=subprocess.DEVNULL,
+        )
+        with open(result_path, encoding="utf-8") as file:
+            return json.load(file)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--cores",
+        type=int,
+        default=len(os.sched_getaffinity(0))
+        if hasattr(os, "sched_getaffinity")
+        else os.cpu_count(),
+        help="Machine size to find the split for",
+    )
+    parser.add_argument("--spacy-processes", type=int, nargs="+", default=[1])
+    parser.add_argument("--corpus", default=os.path.join(DATA_DIR, "articles.jsonl"))
+    parser.add_argument("--tickers", default=os.path.join(DATA_DIR, "tickers.csv"))
+    parser.add_argument("--model-path", default=DEFAULT_MODEL_PATH)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", help="Save the results as JSON")
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--result", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        result = run_config(args)
+        with open(args.result, "w", encoding="utf-8") as file:
+            json.dump(result, file)
+        return
+
+    articles = len(load_corpus(args.corpus))
+    print(f"{args.cores} cores, {articles} articles x {args.repeat}")
+    print(f"{'split':>12} {'art/s':>8} {'total s':>8}  budgets")
+
+    results = {}
+    for config in candidates(args.cores, args.spacy_processes):
+        try:
+            stats = spawn_config(config, args)
+        except subprocess.CalledProcessError:
+            print(f"{config['name']:>12} failed, see the error above")
+            continue
+
+        results[config["name"]] = {**stats, "env": config["env"]}
+        print(
+            f"{config['name']:>12} {stats['articles_per_s']:8.2f} "
+            f"{stats['total_s']:8.2f}  {'; '.join(stats['budgets'])}"
+        )
+
+    if not results:
+        raise SystemExit("Every configuration failed")
+
+    best = max(results, key=lambda name: results[name]["articles_per_s"])
+    print(f"\nBest split on {args.cores} cores: {best}")
+    for name, value in results[best]["env"].items():
+        print(f"    {name}={value}")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(
+                {"cores": args.cores, "best": best, "configs": results}, file, indent=2
+            )
+        print(f"\nResults saved to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
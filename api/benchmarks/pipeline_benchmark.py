@@ -0,0 +1,305 @@
+"""Benchmark the NLP pipeline stages on a fixed article corpus.
+
+Runs `Summarizer.summarize`, `TickerValidator.validate` and
+`Prediction.predict` over benchmarks/data/articles.jsonl, with the frozen
+ticker universe in benchmarks/data/tickers.csv so no network is needed
+(besides downloading the model and NLTK data once). As in the news scraper,
+validation and prediction run on the summary sentences of each article.
+
+Each stage runs in a fresh interpreter, so its peak RSS (model load
+included) is its own. Results are saved as JSON and can be compared with a
+previous run; the exit code is 1 when a stage regressed past the threshold.
+
+Usage (from the api directory):
+    python benchmarks/pipeline_benchmark.py --repeat 3 --output baseline.json
+    python benchmarks/pipeline_benchmark.py --compare baseline.json
+"""
+
+# built-in modules
+import os
+import sys
+import json
+import time
+import hashlib
+import argparse
+import platform
+import resource
+import statistics
+import subprocess
+import tempfile
+
+API_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+
+sys.path.append(API_DIR)
+
+STAGES = ["summarize", "validate", "predict"]
+DEFAULT_MODEL_PATH = "abdallahjoudeh/finoxa-model"
+
+# Metrics compared between runs, and whether higher is better
+COMPARED_METRICS = {
+    "p50_ms": False,
+    "p95_ms": False,
+    "sentences_per_s": True,
+    "peak_rss_mb": False,
+}
+
+
+def load_corpus(path: str) -> list[dict]:
+    with open(path, encoding="utf-8") as file:
+        return [json.loads(line) for line in file if line.strip()]
+
+
+def file_digest(path: str) -> str:
+    with open(path, "rb") as file:
+        return hashlib.blake2b(file.read(), digest_size=8).hexdigest()
+
+
+def peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Kilobytes on Linux, bytes on macOS
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def percentile(values: list[float], q: int) -> float:
+    if len(values) < 2:
+        return values[0] if values else 0.0
+    return statistics.quantiles(values, n=100)[q - 1]
+
+
+def run_stage(stage: str, corpus: list[dict], summaries: list[list[str]], args):
+    """Run one stage in this process and return its measurements."""
+    started_at = time.perf_counter()
+    if stage == "summarize":
+        from pipelines.summarization import Summarizer
+
+        summarizer = Summarizer()
+        inputs = [article["content"] for article in corpus]
+        sentence_count = sum(
+            len(summarizer.tokenize_sentences(summarizer.clean_article_text(text)))
+            for text in inputs
+        )
+
+        def call(text):
+            return summarizer.summarize(text, top_n=args.top_n)
+
+    elif stage == "validate":
+        from pipelines.ticker_validation import TickerValidator
+
+        validator = TickerValidator(ticker_data_path=args.tickers)
+        inputs = [sentence for sentences in summaries for sentence in sentences]
+        sentence_count = len(inputs)
+        call = validator.validate
+
+    else:
+        from pipelines.prediction import Prediction
+
+        prediction = Prediction(args.model_path)
+        inputs = [sentence for sentences in summaries for sentence in sentences]
+        sentence_count = len(inputs)
+        call = prediction.predict
+
+    load_seconds = time.perf_counter() - started_at
+
+    # One untimed pass to warm caches and lazy initialisation
+    outputs = [call(value) for value in inputs]
+
+    latencies = []
+    started_at = time.perf_counter()
+    for _ in range(args.repeat):
+        for value in inputs:
+            call_started_at = time.perf_counter()
+            call(value)
+            latencies.append((time.perf_counter() - call_started_at) * 1000)
+    elapsed = time.perf_counter() - started_at
+
+    return {
+        "load_s": round(load_seconds, 3),
+        "calls": len(latencies),
+        "total_s": round(elapsed, 3),
+        "articles_per_s": round(len(corpus) * args.repeat / elapsed, 3),
+        "sentences_per_s": round(sentence_count * args.repeat / elapsed, 3),
+        "mean_ms": round(statistics.mean(latencies), 3),
+        "p50_ms": round(percentile(latencies, 50), 3),
+        "p95_ms": round(percentile(latencies, 95), 3),
+        "p99_ms": round(percentile(latencies, 99), 3),
+        "peak_rss_mb": round(peak_rss_mb(), 1),
+        "summaries": outputs if stage == "summarize" else None,
+    }
+
+
+def run_worker(args):
+    corpus = load_corpus(args.corpus)
+    summaries = []
+    if args.summaries:
+        with open(args.summaries, encoding="utf-8") as file:
+            summaries = json.load(file)
+
+    result = run_stage(args.worker, corpus, summaries, args)
+    with open(args.result, "w", encoding="utf-8") as file:
+        json.dump(result, file)
+
+
+def spawn_stage(stage: str, args, summaries_path: str | None) -> dict:
+    with tempfile.TemporaryDirectory() as directory:
+        result_path = os.path.join(directory, "result.json")
+        command = [
+            sys.executable,
+            os.path.abspath(__file__),
+            "--worker",
+            stage,
+            "--result",
+            result_path,
+            "--corpus",
+            args.corpus,
+            "--tickers",
+            args.tickers,
+            "--model-path",
+            args.model_path,
+            "--repeat",
+            str(args.repeat),
+            "--top-n",
+            str(args.top_n),
+        ]
+        if summaries_path:
+            command += ["--summaries", summaries_path]
+
+        # Pipeline modules print while loading, keep that out of the report
+        subprocess.run(command, cwd=API_DIR, check=True, stdout=subprocess.DEVNULL)
+        with open(result_path, encoding="utf-8") as file:
+            return json.load(file)
+
+
+def git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=API_DIR,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def report(results: dict):
+    print(
+        f"Corpus: {results['corpus']['articles']} articles, "
+        f"{results['corpus']['summary_sentences']} summary sentences, "
+        f"repeat {results['repeat']}"
+    )
+    print(
+        f"{'stage':>10} {'load s':>7} {'art/s':>8} {'sent/s':>8} "
+        f"{'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'peak MB':>8}"
+    )
+    for stage, stats in results["stages"].items():
+        print(
+            f"{stage:>10} {stats['load_s']:7.2f} {stats['articles_per_s']:8.2f} "
+            f"{stats['sentences_per_s']:8.2f} {stats['p50_ms']:8.2f} "
+            f"{stats['p95_ms']:8.2f} {stats['p99_ms']:8.2f} "
+            f"{stats['peak_rss_mb']:8.1f}"
+        )
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list[str]:
+    """Return the metrics that got worse than `baseline` by more than `threshold`."""
+    if baseline.get("corpus", {}).get("digest") != results["corpus"]["digest"]:
+        print("Warning: the baseline was measured on a different corpus")
+
+    print(f"\nCompared with {baseline.get('commit') or 'baseline'}:")
+    regressions = []
+    for stage, stats in results["stages"].items():
+        previous = baseline.get("stages", {}).get(stage)
+        if not previous:
+            continue
+
+        for metric, higher_is_better in COMPARED_METRICS.items():
+            before, after = previous[metric], stats[metric]
+            if not before:
+                continue
+            change = (after - before) / before
+            worse = -change if higher_is_better else change
+            flag = "  REGRESSION" if worse > threshold else ""
+            print(
+                f"{stage:>10} {metric:>16}: {before:10.2f} -> {after:10.2f} "
+                f"({change:+.1%}){flag}"
+            )
+            if flag:
+                regressions.append(f"{stage} {metric}")
+
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--corpus", default=os.path.join(DATA_DIR, "articles.jsonl"))
+    parser.add_argument("--tickers", default=os.path.join(DATA_DIR, "tickers.csv"))
+    parser.add_argument("--model-path", default=DEFAULT_MODEL_PATH)
+    parser.add_argument("--stages", nargs="+", choices=STAGES, default=STAGES)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--top-n", type=int, default=5)
+    parser.add_argument("--output", help="Save the results as JSON")
+    parser.add_argument("--compare", help="Results JSON of a previous run")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.1,
+        help="Relative change counted as a regression",
+    )
+    parser.add_argument("--worker", choices=STAGES, help=argparse.SUPPRESS)
+    parser.add_argument("--result", help=argparse.SUPPRESS)
+    parser.add_argument("--summaries", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        run_worker(args)
+        return
+
+    # Validation and prediction need the summaries, so summarization always runs
+    summarize = spawn_stage("summarize", args, None)
+    summaries = summarize.pop("summaries")
+    stages = {"summarize": summarize} if "summarize" in args.stages else {}
+
+    with tempfile.NamedTemporaryFile(
+        "w", suffix=".json", delete=False, encoding="utf-8"
+    ) as file:
+        json.dump(summaries, file)
+    try:
+        for stage in ("validate", "predict"):
+            if stage in args.stages:
+                stages[stage] = spawn_stage(stage, args, file.name)
+                stages[stage].pop("summaries")
+    finally:
+        os.remove(file.name)
+
+    results = {
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "repeat": args.repeat,
+        "corpus": {
+            "articles": len(load_corpus(args.corpus)),
+            "summary_sentences": sum(len(sentences) for sentences in summaries),
+            "digest": file_digest(args.corpus),
+            "tickers_digest": file_digest(args.tickers),
+        },
+        "stages": stages,
+    }
+    report(results)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(results, file, indent=2)
+        print(f"\nResults saved to {args.output}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as file:
+            regressions = compare(results, json.load(file), args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s): {', '.join(regressions)}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
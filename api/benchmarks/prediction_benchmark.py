@@ -0,0 +1,205 @@
+"""Compare the Prediction backends: accuracy parity, latency and memory.
+
+Every backend (eager fp32, dynamic int8, TorchScript, ONNX Runtime) scores
+the labelled sentences in benchmarks/data/sentiment_sample.jsonl in its
+own interpreter, so load time and memory are measured in isolation. The
+eager fp32 model is the reference: each other backend reports how often it
+agrees with it and how far its probabilities drift, alongside accuracy
+against the labels. The exit code is 1 when a backend agrees with fp32 on
+fewer than `--min-agreement` of the sentences.
+
+Usage (from the api directory):
+    python benchmarks/prediction_benchmark.py --repeat 5 --output backends.json
+    python benchmarks/prediction_benchmark.py --backends eager quantized
+"""
+
+# built-in modules
+import os
+import sys
+import json
+import time
+import argparse
+import subprocess
+import tempfile
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+# custom modules
+from pipeline_benchmark import (
+    API_DIR,
+    DATA_DIR,
+    DEFAULT_MODEL_PATH,
+    peak_rss_mb,
+    percentile,
+)
+
+BACKENDS = ["eager", "quantized", "torchscript", "onnx"]
+SAMPLE_PATH = os.path.join(DATA_DIR, "sentiment_sample.jsonl")
+
+
+def current_rss_mb() -> float:
+    """Resident memory now (Linux), or the peak where /proc is unavailable."""
+    try:
+        with open("/proc/self/status") as file:
+            for line in file:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return peak_rss_mb()
+
+
+def load_sample(path: str) -> list[dict]:
+    with open(path, encoding="utf-8") as file:
+        return [json.loads(line) for line in file if line.strip()]
+
+
+def run_backend(backend: str, args) -> dict:
+    from pipelines.prediction import Prediction
+
+    sample = load_sample(args.sample)
+    rss_before = current_rss_mb()
+
+    started_at = time.perf_counter()
+    prediction = Prediction(args.model_path, backend=backend)
+    load_seconds = time.perf_counter() - started_at
+    rss_loaded = current_rss_mb()
+
+    # The first pass is untimed and gives the predictions compared for parity
+    outputs = [prediction.predict(row["sentence"]) for row in sample]
+
+    latencies = []
+    for _ in range(args.repeat):
+        for row in sample:
+            started_at = time.perf_counter()
+            prediction.predict(row["sentence"])
+            latencies.append((time.perf_counter() - started_at) * 1000)
+
+    return {
+        "load_s": round(load_seconds, 3),
+        "model_rss_mb": round(rss_loaded - rss_before, 1),
+        "peak_rss_mb": round(peak_rss_mb(), 1),
+        "p50_ms": round(percentile(latencies, 50), 3),
+        "p95_ms": round(percentile(latencies, 95), 3),
+        "sentences_per_s": round(len(latencies) / (sum(latencies) / 1000), 2),
+        "predictions": [
+            {"sentiment": output["sentiment"], "probabilities": output["probabilities"]}
+            for output in outputs
+        ],
+    }
+
+
+def spawn_backend(backend: str, args) -> dict:
+    with tempfile.TemporaryDirectory() as directory:
+        result_path = os.path.join(directory, "result.json")
+        subprocess.run(
+            [
+                sys.executable,
+                os.path.abspath(__file__),
+                "--worker",
+                backend,
+                "--result",
+                result_path,
+                "--sample",
+                args.sample,
+                "--model-path",
+                args.model_path,
+                "--repeat",
+                str(args.repeat),
+            ],
+            cwd=API_DIR,
+            check=True,
+            stdout=subprocess.DEVNULL,
+        )
+        with open(result_path, encoding="utf-8") as file:
+            return json.load(file)
+
+
+def parity(predictions: list[dict], reference: list[dict], labels: list[str]):
+    """Accuracy, label agreement with `reference` and largest probability drift."""
+    agreement = sum(
+        prediction["sentiment"] == expected["sentiment"]
+        for prediction, expected in zip(predictions, reference)
+    ) / len(reference)
+    accuracy = sum(
+        prediction["sentiment"] == label
+        for prediction, label in zip(predictions, labels)
+    ) / len(labels)
+    drift = max(
+        abs(prediction["probabilities"][label] - expected["probabilities"][label])
+        for prediction, expected in zip(predictions, reference)
+        for label in expected["probabilities"]
+    )
+    return round(accuracy, 4), round(agreement, 4), round(drift, 4)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sample", default=SAMPLE_PATH)
+    parser.add_argument("--model-path", default=DEFAULT_MODEL_PATH)
+    parser.add_argument("--backends", nargs="+", choices=BACKENDS, default=BACKENDS)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--min-agreement", type=float, default=0.98)
+    parser.add_argument("--output", help="Save the results as JSON")
+    parser.add_argument("--worker", choices=BACKENDS, help=argparse.SUPPRESS)
+    parser.add_argument("--result", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        result = run_backend(args.worker, args)
+        with open(args.result, "w", encoding="utf-8") as file:
+            json.dump(result, file)
+        return
+
+    labels = [row["label"] for row in load_sample(args.sample)]
+
+    # fp32 is the reference, so it always runs first
+    results = {}
+    failed = []
+    for backend in ["eager"] + [name for name in args.backends if name != "eager"]:
+        try:
+            results[backend] = spawn_backend(backend, args)
+        except subprocess.CalledProcessError:
+            print(f"{backend}: failed, see the error above")
+            failed.append(backend)
+
+    if "eager" not in results:
+        raise SystemExit("The eager fp32 reference failed to run")
+
+    reference = results["eager"]["predictions"]
+    print(f"{len(labels)} labelled sentences, repeat {args.repeat}")
+    print(
+        f"{'backend':>12} {'accuracy':>8} {'agree':>6} {'drift':>6} {'load s':>7} "
+        f"{'model MB':>8} {'peak MB':>8} {'p50 ms':>7} {'p95 ms':>7} {'sent/s':>7}"
+    )
+
+    for backend, stats in results.items():
+        accuracy, agreement, drift = parity(stats.pop("predictions"), reference, labels)
+        stats.update(accuracy=accuracy, agreement=agreement, max_prob_drift=drift)
+        if agreement < args.min_agreement:
+            failed.append(backend)
+
+        print(
+            f"{backend:>12} {accuracy:8.1%} {agreement:6.1%} {drift:6.3f} "
+            f"{stats['load_s']:7.2f} {stats['model_rss_mb']:8.1f} "
+            f"{stats['peak_rss_mb']:8.1f} {stats['p50_ms']:7.2f} "
+            f"{stats['p95_ms']:7.2f} {stats['sentences_per_s']:7.1f}"
+        )
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(
+                {"model_path": args.model_path, "backends": results}, file, indent=2
+            )
+        print(f"\nResults saved to {args.output}")
+
+    if failed:
+        print(
+            f"\nFailed or below {args.min_agreement:.0%} agreement with fp32: "
+            f"{', '.join(failed)}"
+        )
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
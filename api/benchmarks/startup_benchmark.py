@@ -0,0 +1,110 @@
+"""Profile API cold start: `import server` timing and an -X importtime breakdown.
+
+Each run imports `server` in a fresh interpreter, so nothing is cached
+between runs except the OS page cache and bytecode. No database is needed:
+the connection is only made in the lifespan handler.
+
+Usage (from the api directory):
+    python benchmarks/startup_benchmark.py --runs 5 --top 25
+"""
+
+# built-in modules
+import os
+import sys
+import json
+import argparse
+import statistics
+import subprocess
+
+API_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+# Modules that should only be imported on first use, never at startup
+LAZY_MODULES = ["yfinance", "pandas", "numpy", "torch", "transformers", "spacy"]
+
+_IMPORT_SERVER = """
+import sys, time, json
+started_at = time.perf_counter()
+import server
+elapsed = time.perf_counter() - started_at
+print(json.dumps([elapsed, [m for m in sys.argv[1:] if m in sys.modules]]))
+"""
+
+
+def time_import(lazy_modules: list[str]) -> tuple[float, list[str]]:
+    result = subprocess.run(
+        [sys.executable, "-c", _IMPORT_SERVER, *lazy_modules],
+        cwd=API_DIR,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    elapsed, loaded = json.loads(result.stdout.strip().splitlines()[-1])
+    return elapsed, loaded
+
+
+def import_profile() -> list[tuple[str, int, int]]:
+    """Return (module, self us, cumulative us) for every module `server` imports."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import server"],
+        cwd=API_DIR,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    profile = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        self_us, cumulative_us, module = line[len("import time:") :].split("|")
+        if not self_us.strip().isdigit():
+            continue
+        profile.append((module.rstrip(), int(self_us), int(cumulative_us)))
+
+    return profile
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=25)
+    args = parser.parse_args()
+
+    profile = import_profile()
+    print(f"Top {args.top} imports by cumulative time:")
+    print(f"{'cumulative ms':>14} {'self ms':>8}  module")
+    for module, self_us, cumulative_us in sorted(
+        profile, key=lambda row: row[2], reverse=True
+    )[: args.top]:
+        print(f"{cumulative_us / 1000:14.1f} {self_us / 1000:8.1f}  {module}")
+
+    # Top level packages, summed over their submodules' self time
+    packages = {}
+    for module, self_us, _ in profile:
+        package = module.strip().split(".")[0]
+        packages[package] = packages.get(package, 0) + self_us
+    print("\nSelf time by top level package:")
+    for package, self_us in sorted(
+        packages.items(), key=lambda item: item[1], reverse=True
+    )[: args.top]:
+        print(f"{self_us / 1000:14.1f}  {package}")
+
+    timings = []
+    loaded = []
+    for _ in range(args.runs):
+        elapsed, loaded = time_import(LAZY_MODULES)
+        timings.append(elapsed)
+
+    print(
+        f"\nimport server over {args.runs} runs: "
+        f"median {statistics.median(timings) * 1000:.0f}ms, "
+        f"min {min(timings) * 1000:.0f}ms, max {max(timings) * 1000:.0f}ms"
+    )
+    if loaded:
+        print(f"Warning: heavy modules imported at startup: {', '.join(loaded)}")
+    else:
+        print(f"None of {', '.join(LAZY_MODULES)} imported at startup")
+
+
+if __name__ == "__main__":
+    main()
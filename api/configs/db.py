@@ -1,5 +1,7 @@
 import os
 import sys
+import time
+import random
 
 from mongoengine import connect, connection
 from pymongo.errors import ConnectionFailure, OperationFailure
@@ -9,23 +11,66 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".
 from utils.logger_util import logger
 
 
-def connect_db():
-    """Connect to the MongoDB database."""
+def _env_int(name: str, default: int | None) -> int | None:
+    value = os.getenv(name)
+    return int(value) if value else default
 
-    try:
-        connect(
-            db="finoxa_db",
-            host=os.getenv("MONGODB_URI"),
-            alias="default",
-        )
 
-        logger.info(
-            f"Connected to MongoDB successfully: {connection.get_connection().server_info()['ok']}"
-        )
-    except ConnectionFailure as cf:
-        logger.error("Failed to connect to MongoDB:", cf)
-        sys.exit(1)
+def pool_options() -> dict:
+    """Connection pool settings of this process's MongoClient.
 
-    except OperationFailure as of:
-        logger.error("Authentication failed:", of)
-        sys.exit(1)
+    Every worker process has its own client, so these apply per worker:
+    `MONGO_MAX_POOL_SIZE` x workers is the most connections the API opens.
+    """
+    return {
+        "maxPoolSize": _env_int("MONGO_MAX_POOL_SIZE", 50),
+        "minPoolSize": _env_int("MONGO_MIN_POOL_SIZE", 5),
+        "maxIdleTimeMS": _env_int("MONGO_MAX_IDLE_TIME_MS", 60000),
+        "waitQueueTimeoutMS": _env_int("MONGO_WAIT_QUEUE_TIMEOUT_MS", 5000),
+        "connectTimeoutMS": _env_int("MONGO_CONNECT_TIMEOUT_MS", 5000),
+        "serverSelectionTimeoutMS": _env_int("MONGO_SERVER_SELECTION_TIMEOUT_MS", 5000),
+        "socketTimeoutMS": _env_int("MONGO_SOCKET_TIMEOUT_MS", None),
+    }
+
+
+def connect_db(timeout: float | None = 30, max_delay: float = 30) -> bool:
+    """Connect to the MongoDB database, retrying with exponential backoff.
+
+    Args:
+        timeout (float, optional): Seconds to keep retrying. `None` retries
+            until the database is reachable.
+        max_delay (float): Upper bound of the delay between attempts
+
+    Returns:
+        bool: True once the server answered a ping, False if `timeout` passed
+    """
+
+    # Registering the connection does not touch the network
+    connect(
+        db="finoxa_db",
+        host=os.getenv("MONGODB_URI"),
+        alias="default",
+        **pool_options(),
+    )
+
+    deadline = None if timeout is None else time.monotonic() + timeout
+    delay = 0.5
+    attempt = 1
+
+    while True:
+        try:
+            connection.get_connection().admin.command("ping")
+            logger.info("Connected to MongoDB successfully")
+            return True
+        except ConnectionFailure as cf:
+            logger.warning(f"Failed to connect to MongoDB (attempt {attempt}): {cf}")
+        except OperationFailure as of:
+            logger.error(f"Authentication failed (attempt {attempt}): {of}")
+
+        if deadline is not None and time.monotonic() + delay > deadline:
+            return False
+
+        # Jitter keeps the workers from retrying in lockstep
+        time.sleep(delay * random.uniform(0.5, 1.0))
+        delay = min(delay * 2, max_delay)
+        attempt += 1
@@ -1,20 +1,18 @@
 import os
+import time
 from typing import Annotated
 
 from fastapi import Header, Response, HTTPException, status, Request
 
 
 from services.auth_service import decode_jwt_token
+from services.metrics_service import auth_lookup_duration
+from services.token_cache_service import token_cache
 from models.user_model import User
-from utils import rename_keys
+from utils.serializer_util import Serializer
 
 
-key_map = {
-    "_id": "id",
-    "apiKey": "api_key",
-    "createdAt": "created_at",
-    "updatedAt": "updated_at",
-}
+user_serializer = Serializer(User, exclude={"password"})
 
 
 def protect_route(
@@ -38,6 +36,14 @@ def protect_route(
             "message": "Unauthorized - No token provided",
         }
 
+    started_at = time.perf_counter()
+    cached_user = token_cache.get(token)
+    if cached_user is not None:
+        auth_lookup_duration.observe(time.perf_counter() - started_at, "token", "cache")
+        return {
+            "data": cached_user,
+        }
+
     try:
         payload = decode_jwt_token(token)
 
@@ -49,7 +55,8 @@ def protect_route(
         }
 
     try:
-        user = User.objects(email=payload["sub"]).first()
+        user = User.objects(email=payload["sub"]).as_pymongo().first()
+        auth_lookup_duration.observe(time.perf_counter() - started_at, "token", "mongo")
 
         if not user:
             response.status_code = status.HTTP_401_UNAUTHORIZED
@@ -58,10 +65,10 @@ def protect_route(
                 "message": "Unathorized - User not found",
             }
 
-        user_dict: dict = user.to_mongo().to_dict()
-        user_dict["_id"] = str(user_dict["_id"])
-        user_dict = rename_keys(user_dict, key_map)
-        user_dict.pop("password")
+        user_dict = user_serializer(user)
+
+        token_cache.set(token, payload, user_dict)
+
         return {
             "data": user_dict,
         }
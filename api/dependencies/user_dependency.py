@@ -1,8 +1,10 @@
+import time
 from typing import Annotated
 
 from fastapi import status, Header, Response
 
 from models.user_model import User
+from services.metrics_service import auth_lookup_duration
 
 
 async def verfiy_api_key(
@@ -29,7 +31,9 @@ async def verfiy_api_key(
             "message": "Unauthorized - No API key provided",
         }
 
+    started_at = time.perf_counter()
     user = User.objects(api_key=api_key).first()
+    auth_lookup_duration.observe(time.perf_counter() - started_at, "api_key", "mongo")
     if not user:
         response.status_code = status.HTTP_401_UNAUTHORIZED
         return {
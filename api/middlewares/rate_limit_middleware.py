@@ -0,0 +1,113 @@
+# built-in modules
+import asyncio
+import math
+
+# pip modules
+from fastapi import Request, status
+from fastapi.responses import JSONResponse
+from starlette.concurrency import run_in_threadpool
+from starlette.middleware.base import BaseHTTPMiddleware
+
+# custom modules
+from services.rate_limit_service import RateLimiter
+
+
+# Token cost of a single request, by route prefix. Routes not listed here
+# (auth, user) are not rate limited. More specific prefixes go first.
+route_costs = {
+    "/api/v1/news/export": 10,
+    "/api/v1/prices": 1,
+    "/api/v1/quotes": 2,
+    "/api/v1/news": 1,
+    "/api/v1/tickers": 1,
+    "/api/v1/sentiments": 2,
+    "/api/v1/search": 1,
+}
+
+
+def get_api_key(request: Request) -> str | None:
+    api_key = request.query_params.get("api_key")
+    if api_key:
+        return api_key
+
+    authorization = request.headers.get("Authorization")
+    if authorization and authorization.startswith("Bearer "):
+        return authorization.split(" ")[1] or None
+
+    return None
+
+
+def get_route_cost(request: Request) -> tuple[str | None, int]:
+    path = request.url.path.rstrip("/")
+
+    for route, cost in route_costs.items():
+        if path == route or path.startswith(route + "/"):
+            # Bulk price calls hit Yahoo once per ticker
+            if path == "/api/v1/prices":
+                tickers = request.query_params.get("tickers") or ""
+                cost *= max(1, len([t for t in tickers.split(",") if t]))
+            return route, cost
+
+    return None, 0
+
+
+class RateLimitMiddleware(BaseHTTPMiddleware):
+    def __init__(self, app, limiter: RateLimiter | None = None):
+        super().__init__(app)
+        self.limiter = limiter or RateLimiter.from_env()
+
+    def _too_many_requests(self, retry_after: float, remaining: float) -> JSONResponse:
+        headers = {
+            "X-RateLimit-Limit": str(int(self.limiter.capacity)),
+            "X-RateLimit-Remaining": str(int(remaining)),
+        }
+        if math.isfinite(retry_after):
+            headers["Retry-After"] = str(math.ceil(retry_after))
+            message = "Too many requests - Rate limit exceeded"
+        else:
+            message = "Too many requests - Request cost exceeds the rate limit"
+
+        return JSONResponse(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            content={"status": False, "message": message},
+            headers=headers,
+        )
+
+    async def dispatch(self, request: Request, call_next):
+        route, cost = get_route_cost(request)
+        api_key = get_api_key(request) if route else None
+
+        # Requests without a key are rejected by verfiy_api_key
+        if not api_key:
+            return await call_next(request)
+
+        if not self.limiter.is_loaded(api_key):
+            # Keys get a bucket only once a user is found for them, so made
+            # up keys can't each get a full bucket or evict the real ones.
+            # Until then the lookup is charged to the client's address.
+            address = request.client.host if request.client else "unknown"
+            allowed, retry_after, remaining = self.limiter.acquire(
+                f"ip:{address}", route, cost, record=False
+            )
+            if not allowed:
+                return self._too_many_requests(retry_after, remaining)
+
+            if not await run_in_threadpool(self.limiter.load, api_key):
+                # Rejected by verfiy_api_key, without a bucket or usage row
+                return await call_next(request)
+
+        allowed, retry_after, remaining = self.limiter.acquire(api_key, route, cost)
+        if not allowed:
+            return self._too_many_requests(retry_after, remaining)
+
+        if self.limiter.should_flush():
+            asyncio.get_running_loop().run_in_executor(None, self.limiter.flush)
+
+        response = await call_next(request)
+        response.headers.update(
+            {
+                "X-RateLimit-Limit": str(int(self.limiter.capacity)),
+                "X-RateLimit-Remaining": str(int(remaining)),
+            }
+        )
+        return response
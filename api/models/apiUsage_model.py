@@ -0,0 +1,49 @@
+from mongoengine import *
+from datetime import datetime
+
+
+class ApiQuota(Document):
+    api_key = StringField(
+        db_field="apiKey",
+        required=True,
+        unique=True,
+    )
+    tokens = FloatField(required=True)
+    refilled_at = FloatField(
+        db_field="refilledAt",
+        required=True,
+    )
+    updated_at = DateTimeField(
+        db_field="updatedAt",
+        default=datetime.now,
+    )
+
+    meta = {
+        "collection": "api_quotas",
+        "indexes": ["api_key"],
+    }
+
+
+class ApiUsage(Document):
+    api_key = StringField(
+        db_field="apiKey",
+        required=True,
+    )
+    day = StringField(required=True)
+    route = StringField(required=True)
+    requests = IntField(default=0)
+    cost = IntField(default=0)
+    updated_at = DateTimeField(
+        db_field="updatedAt",
+        default=datetime.now,
+    )
+
+    meta = {
+        "collection": "api_usage",
+        "indexes": [
+            {
+                "fields": ["api_key", "day", "route"],
+                "unique": True,
+            },
+        ],
+    }
@@ -27,7 +27,7 @@ class Index(Document):
 
     meta = {
         "collection": "indices",
-        "indexes": ["ticker"],
+        "indexes": ["ticker", "-updated_at"],
     }
 
     def save(self, *args, **kwargs):
@@ -46,6 +46,9 @@ class NewsArticle(Document):
     publisher = EmbeddedDocumentField(Publisher)
     tickers = ListField(StringField())
     insights = EmbeddedDocumentListField(Insight)
+    # Id of the article this one is a near-duplicate of, whose insights it
+    # reuses; unset for original articles
+    duplicate_of = StringField(db_field="duplicateOf")
     created_at = DateTimeField(
         db_field="createdAt",
         required=True,
@@ -67,6 +70,7 @@ class NewsArticle(Document):
                     "company_name": 100,
                 },
             },
+            ("tickers", "-published_at"),
         ],
     }
 
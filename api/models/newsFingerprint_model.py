@@ -0,0 +1,31 @@
+import os
+from mongoengine import *
+from datetime import datetime
+
+# Fingerprints are only compared with recent articles, older ones expire
+NEWS_DEDUP_WINDOW_HOURS = float(os.getenv("NEWS_DEDUP_WINDOW_HOURS") or 72)
+
+
+class NewsFingerprint(Document):
+    article_url = StringField(
+        db_field="articleUrl",
+        required=True,
+        unique=True,
+    )
+    # MinHash signature of the article's content, little-endian uint32s
+    minhash = BinaryField(required=True)
+    created_at = DateTimeField(
+        db_field="createdAt",
+        required=True,
+        default=datetime.now,
+    )
+
+    meta = {
+        "collection": "news_fingerprints",
+        "indexes": [
+            {
+                "fields": ["created_at"],
+                "expireAfterSeconds": int(NEWS_DEDUP_WINDOW_HOURS * 3600),
+            },
+        ],
+    }
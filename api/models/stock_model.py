@@ -72,7 +72,7 @@ class Stock(Document):
 
     meta = {
         "collection": "stocks",
-        "indexes": ["ticker"],
+        "indexes": ["ticker", "-updated_at"],
     }
 
     def save(self, *args, **kwargs):
@@ -7,7 +7,10 @@ class User(Document):
         required=True,
         max_length=50,
     )
-    email = EmailField()
+    email = EmailField(
+        required=True,
+        unique=True,
+    )
     password = StringField(
         required=True,
         min_length=8,
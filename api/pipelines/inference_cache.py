@@ -0,0 +1,156 @@
+# built-in modules
+import os
+import re
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+import unicodedata
+
+# Persistent memo of sentiment predictions, shared by scraper runs
+PREDICTION_CACHE_PATH = os.getenv("PREDICTION_CACHE_PATH") or os.path.join(
+    os.path.dirname(__file__), "..", ".cache", "predictions.sqlite3"
+)
+PREDICTION_CACHE_MAX_ENTRIES = int(
+    os.getenv("PREDICTION_CACHE_MAX_ENTRIES") or 1_000_000
+)
+
+_whitespace = re.compile(r"\s+")
+
+
+def normalize_sentence(sentence: str) -> str:
+    """Fold the differences republished copies of a sentence tend to have.
+
+    Unicode variants (non-breaking spaces, full width characters) and
+    whitespace are normalised. Case and punctuation are kept, since the
+    model may read them.
+    """
+    return _whitespace.sub(" ", unicodedata.normalize("NFKC", sentence)).strip()
+
+
+class InferenceCache:
+    """SQLite memo of predictions, keyed by model version and sentence.
+
+    Keys are the hash of the model version and the normalised sentence, so
+    a new model or backend never reads another one's results. The least
+    recently used entries are evicted once `max_entries` is exceeded by
+    10%, so eviction runs in batches rather than on every write. The
+    stage threads share one cache, so its counters are updated under a lock.
+
+    Args:
+        path (str): SQLite file to store the predictions in
+        max_entries (int): Entries kept after an eviction
+    """
+
+    def __init__(
+        self,
+        path: str = PREDICTION_CACHE_PATH,
+        max_entries: int = PREDICTION_CACHE_MAX_ENTRIES,
+    ):
+        self.path = path
+        self.max_entries = max_entries
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._create_schema()
+        self._size = (
+            self._connection().execute("SELECT COUNT(*) FROM predictions").fetchone()[0]
+        )
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _create_schema(self):
+        self._connection().executescript(
+            """
+            CREATE TABLE IF NOT EXISTS predictions (
+                key BLOB PRIMARY KEY,
+                result TEXT NOT NULL,
+                used_at REAL NOT NULL
+            ) WITHOUT ROWID;
+            CREATE INDEX IF NOT EXISTS predictions_used_at ON predictions (used_at);
+            """
+        )
+
+    @staticmethod
+    def key(version: str, sentence: str) -> bytes:
+        return hashlib.blake2b(
+            f"{version}\0{normalize_sentence(sentence)}".encode(), digest_size=16
+        ).digest()
+
+    @property
+    def hit_ratio(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "size": self._size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hit_ratio, 4),
+                "evictions": self.evictions,
+            }
+
+    def get(self, version: str, sentence: str) -> dict | None:
+        key = self.key(version, sentence)
+        conn = self._connection()
+        row = conn.execute(
+            "SELECT result FROM predictions WHERE key = ?", (key,)
+        ).fetchone()
+
+        if row is None:
+            with self._lock:
+                self.misses += 1
+            return None
+
+        with self._lock:
+            self.hits += 1
+        conn.execute(
+            "UPDATE predictions SET used_at = ? WHERE key = ?", (time.time(), key)
+        )
+        return json.loads(row[0])
+
+    def set(self, version: str, sentence: str, result: dict):
+        cursor = self._connection().execute(
+            "INSERT OR REPLACE INTO predictions VALUES (?, ?, ?)",
+            (self.key(version, sentence), json.dumps(result), time.time()),
+        )
+        with self._lock:
+            self._size += cursor.rowcount
+            if self._size > self.max_entries * 1.1:
+                self._evict()
+
+    def _evict(self):
+        # Called with the lock held, so threads don't evict the same batch
+        conn = self._connection()
+        # Other processes may have written too, so recount first
+        self._size = conn.execute("SELECT COUNT(*) FROM predictions").fetchone()[0]
+        excess = self._size - self.max_entries
+        if excess <= 0:
+            return
+
+        conn.execute(
+            """
+            DELETE FROM predictions WHERE key IN (
+                SELECT key FROM predictions ORDER BY used_at LIMIT ?
+            )
+            """,
+            (excess,),
+        )
+        self._size -= excess
+        self.evictions += excess
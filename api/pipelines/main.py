@@ -1,5 +1,8 @@
 # built-in modules
 import os
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
 # custom modules
 from summarization import Summarizer
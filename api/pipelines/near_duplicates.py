@@ -0,0 +1,169 @@
+# built-in modules
+import os
+import re
+import time
+import hashlib
+import threading
+
+# pip modules
+import numpy as np
+
+# Estimated Jaccard similarity of word shingles from which an article is a
+# near-duplicate (syndicated copies differ in bylines, boilerplate and edits)
+NEWS_DEDUP_THRESHOLD = float(os.getenv("NEWS_DEDUP_THRESHOLD") or 0.8)
+# How far back the canonical article of a near-duplicate can be
+NEWS_DEDUP_WINDOW_HOURS = float(os.getenv("NEWS_DEDUP_WINDOW_HOURS") or 72)
+
+NUM_PERM = 128
+SHINGLE_SIZE = 5
+
+# Universal hashing modulo a prime just above 2^32; multipliers stay under
+# 2^31 so products of 32 bit hashes fit in uint64
+_PRIME = np.uint64((1 << 32) + 15)
+_MAX_HASH = np.uint64((1 << 32) - 1)
+_word = re.compile(r"[a-z0-9]+")
+
+
+def shingles(text: str, size: int = SHINGLE_SIZE) -> set[str]:
+    """Overlapping runs of `size` words, case and punctuation folded."""
+    words = _word.findall(text.lower())
+    if len(words) <= size:
+        return {" ".join(words)} if words else set()
+    return {" ".join(words[i : i + size]) for i in range(len(words) - size + 1)}
+
+
+class MinHasher:
+    """MinHash signatures of texts, comparable when made with the same seed.
+
+    The share of equal values in two signatures estimates the Jaccard
+    similarity of the texts' shingle sets.
+
+    Args:
+        num_perm (int): Hash functions, the signature's length
+        seed (int): Seed the hash functions are drawn from
+    """
+
+    def __init__(self, num_perm: int = NUM_PERM, seed: int = 1):
+        rng = np.random.default_rng(seed)
+        self.num_perm = num_perm
+        self._a = rng.integers(1, 1 << 31, size=(num_perm, 1), dtype=np.uint64)
+        self._b = rng.integers(0, 1 << 31, size=(num_perm, 1), dtype=np.uint64)
+
+    def signature(self, text: str) -> np.ndarray | None:
+        """The text's signature, or None when it has no words to compare."""
+        hashes = np.fromiter(
+            (
+                int.from_bytes(
+                    hashlib.blake2b(shingle.encode(), digest_size=4).digest(), "big"
+                )
+                for shingle in shingles(text)
+            ),
+            dtype=np.uint64,
+        )
+        if not len(hashes):
+            return None
+
+        permuted = (self._a * hashes + self._b) % _PRIME & _MAX_HASH
+        return permuted.min(axis=1).astype(np.uint32)
+
+
+def similarity(first: np.ndarray, second: np.ndarray) -> float:
+    return float(np.count_nonzero(first == second)) / len(first)
+
+
+def signature_to_bytes(signature: np.ndarray) -> bytes:
+    return signature.astype("<u4").tobytes()
+
+
+def signature_from_bytes(raw: bytes) -> np.ndarray:
+    return np.frombuffer(raw, dtype="<u4").astype(np.uint32)
+
+
+class NearDuplicateIndex:
+    """LSH index of the MinHash signatures of recent articles.
+
+    Signatures are cut into `bands`; articles sharing any band are
+    candidates, and a candidate is a near-duplicate when its estimated
+    similarity reaches `threshold`. With 16 bands of 8 values, articles at
+    0.8 similarity share a band 95% of the time, at 0.9 over 99.9%, and at
+    0.5 only 6%, so lookups compare a handful of signatures rather than the
+    whole window. Articles older than `window_hours` are forgotten.
+
+    Args:
+        threshold (float): Estimated similarity of a near-duplicate
+        bands (int): Bands signatures are cut into for bucketing
+        window_hours (float): Age after which articles are dropped
+    """
+
+    def __init__(
+        self,
+        threshold: float = NEWS_DEDUP_THRESHOLD,
+        bands: int = 16,
+        window_hours: float = NEWS_DEDUP_WINDOW_HOURS,
+    ):
+        self.threshold = threshold
+        self.bands = bands
+        self.window = window_hours * 3600
+
+        self._signatures: dict[str, tuple[np.ndarray, float]] = {}
+        self._buckets: list[dict[bytes, set[str]]] = [{} for _ in range(bands)]
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._signatures)
+
+    def _band_keys(self, signature: np.ndarray) -> list[bytes]:
+        return [band.tobytes() for band in np.array_split(signature, self.bands)]
+
+    def add(self, key: str, signature: np.ndarray, added_at: float | None = None):
+        added_at = time.time() if added_at is None else added_at
+        with self._lock:
+            self._prune()
+            if key in self._signatures:
+                return
+            self._signatures[key] = (signature, added_at)
+            for buckets, band in zip(self._buckets, self._band_keys(signature)):
+                buckets.setdefault(band, set()).add(key)
+
+    def remove(self, key: str):
+        """Forget an article, e.g. one that failed to save."""
+        with self._lock:
+            self._remove(key)
+
+    def query(self, signature: np.ndarray) -> tuple[str, float] | None:
+        """The most similar indexed article at or over the threshold, if any.
+
+        Returns:
+            tuple: The article's key and its estimated similarity
+        """
+        with self._lock:
+            candidates = set()
+            for buckets, band in zip(self._buckets, self._band_keys(signature)):
+                candidates |= buckets.get(band, set())
+
+            best = None
+            for key in candidates:
+                score = similarity(signature, self._signatures[key][0])
+                if score >= self.threshold and (best is None or score > best[1]):
+                    best = (key, score)
+            return best
+
+    def _prune(self):
+        cutoff = time.time() - self.window
+        expired = [
+            key for key, (_, added_at) in self._signatures.items() if added_at < cutoff
+        ]
+        for key in expired:
+            self._remove(key)
+
+    def _remove(self, key: str):
+        entry = self._signatures.pop(key, None)
+        if entry is None:
+            return
+
+        for buckets, band in zip(self._buckets, self._band_keys(entry[0])):
+            keys = buckets.get(band)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del buckets[band]
@@ -0,0 +1,170 @@
+# built-in modules
+import os
+import sys
+
+# Cores given to sentiment inference; the rest go to summarisation and spaCy.
+# 0 splits the cores available to the process in half.
+PIPELINE_INFERENCE_CORES = int(os.getenv("PIPELINE_INFERENCE_CORES") or 0)
+# Thread pool sizes, 0 sizes a pool to the cores of its stage
+PIPELINE_TORCH_THREADS = int(os.getenv("PIPELINE_TORCH_THREADS") or 0)
+PIPELINE_TORCH_INTEROP_THREADS = int(os.getenv("PIPELINE_TORCH_INTEROP_THREADS") or 1)
+PIPELINE_BLAS_THREADS = int(os.getenv("PIPELINE_BLAS_THREADS") or 0)
+# spaCy worker processes for `TickerValidator.validate_many`
+PIPELINE_SPACY_PROCESSES = int(os.getenv("PIPELINE_SPACY_PROCESSES") or 1)
+# Pin each stage's thread to its cores (Linux only)
+PIPELINE_PIN_CORES = (os.getenv("PIPELINE_PIN_CORES") or "true").lower() == "true"
+
+# Read by OpenMP, MKL, OpenBLAS, Accelerate and numexpr when they load
+BLAS_ENV_VARS = (
+    "OMP_NUM_THREADS",
+    "MKL_NUM_THREADS",
+    "OPENBLAS_NUM_THREADS",
+    "VECLIB_MAXIMUM_THREADS",
+    "NUMEXPR_NUM_THREADS",
+)
+
+
+def available_cores() -> list[int]:
+    """Cores this process may run on, which can be fewer than the machine's."""
+    if hasattr(os, "sched_getaffinity"):
+        return sorted(os.sched_getaffinity(0))
+    return list(range(os.cpu_count() or 1))
+
+
+class CoreBudget:
+    """The cores a pipeline stage runs on and the sizes of its thread pools.
+
+    Args:
+        name (str): Stage name, for logs
+        cores (list): CPU ids the stage's thread is pinned to
+        threads (int): Intra-op threads (torch) or BLAS threads of the stage
+        interop_threads (int): torch inter-op threads, for torch stages
+        spacy_processes (int): spaCy worker processes, for spaCy stages
+    """
+
+    def __init__(
+        self,
+        name: str,
+        cores: list[int],
+        threads: int = 0,
+        interop_threads: int = 0,
+        spacy_processes: int = 1,
+    ):
+        self.name = name
+        self.cores = list(cores)
+        self.threads = threads or len(self.cores)
+        self.interop_threads = interop_threads
+        self.spacy_processes = spacy_processes
+
+    def __repr__(self) -> str:
+        return (
+            f"{self.name}: cores {format_cores(self.cores)}, {self.threads} threads"
+            + (f", {self.interop_threads} interop" if self.interop_threads else "")
+            + (
+                f", {self.spacy_processes} spaCy processes"
+                if self.spacy_processes > 1
+                else ""
+            )
+        )
+
+    def pin_current_thread(self):
+        """Run the calling thread, and threads or processes it starts, on `cores`.
+
+        Thread pools are created by the first thread that uses them and
+        inherit its affinity, so call this before the stage's first torch
+        op or spaCy `pipe`.
+        """
+        if not PIPELINE_PIN_CORES or not hasattr(os, "sched_setaffinity"):
+            return
+        try:
+            # On Linux, pid 0 is the calling thread rather than the process
+            os.sched_setaffinity(0, self.cores)
+        except OSError:
+            pass
+
+    def apply_torch_threads(self):
+        """Size torch's intra-op pool of the calling thread to the budget."""
+        import torch
+
+        torch.set_num_threads(self.threads)
+
+
+def format_cores(cores: list[int]) -> str:
+    if len(cores) > 1 and cores == list(range(cores[0], cores[-1] + 1)):
+        return f"{cores[0]}-{cores[-1]}"
+    return ",".join(str(core) for core in cores)
+
+
+def split_cores(
+    inference_cores: int = PIPELINE_INFERENCE_CORES,
+    cores: list[int] | None = None,
+) -> tuple[CoreBudget, CoreBudget]:
+    """Split the cores between the NLP stages and sentiment inference.
+
+    Summarisation and spaCy run on the first cores, inference on the last
+    `inference_cores`, so the two never compete for a core. On a single
+    core both stages share it.
+
+    Returns:
+        tuple: The NLP budget and the inference budget
+    """
+    cores = cores or available_cores()
+    if len(cores) == 1:
+        nlp_cores = inference = cores
+    else:
+        count = min(max(inference_cores or len(cores) // 2, 1), len(cores) - 1)
+        nlp_cores, inference = cores[:-count], cores[-count:]
+
+    return (
+        CoreBudget(
+            "nlp",
+            nlp_cores,
+            threads=PIPELINE_BLAS_THREADS,
+            spacy_processes=PIPELINE_SPACY_PROCESSES,
+        ),
+        CoreBudget(
+            "inference",
+            inference,
+            threads=PIPELINE_TORCH_THREADS,
+            interop_threads=PIPELINE_TORCH_INTEROP_THREADS,
+        ),
+    )
+
+
+def limit_blas_threads(threads: int):
+    """Cap the OpenMP and BLAS pools of libraries not loaded yet.
+
+    The variables are only read when numpy, torch or spaCy load, so this
+    must run before they are imported; values already set in the
+    environment win.
+    """
+    for variable in BLAS_ENV_VARS:
+        os.environ.setdefault(variable, str(threads))
+
+
+def configure_process(nlp: CoreBudget, inference: CoreBudget):
+    """Size the process-wide thread pools so the stages don't oversubscribe.
+
+    BLAS pools (numpy, spaCy's thinc ops) are shared by the process and get
+    the NLP budget; torch's inter-op pool is created once per process and
+    gets the inference budget. Intra-op torch threads are sized per stage
+    thread by `CoreBudget.apply_torch_threads`.
+    """
+    limit_blas_threads(nlp.threads)
+
+    # threadpoolctl also reaches pools that were loaded before the variables
+    # were set, e.g. when torch was imported first
+    from threadpoolctl import threadpool_limits
+
+    threadpool_limits(limits=nlp.threads, user_api="blas")
+
+    if "torch" in sys.modules or inference.interop_threads:
+        import torch
+
+        torch.set_num_threads(inference.threads)
+        if inference.interop_threads:
+            try:
+                torch.set_num_interop_threads(inference.interop_threads)
+            except RuntimeError:
+                # Only settable before the first inter-op work of the process
+                pass
@@ -1,15 +1,158 @@
+# built-in modules
+import os
+
 # pip modules
 import torch
 import torch.nn.functional as F
-from transformers import AutoTokenizer, AutoModelForSequenceClassification
+from transformers import (
+    AutoConfig,
+    AutoTokenizer,
+    AutoModelForSequenceClassification,
+)
+
+# custom modules
+from pipelines.inference_cache import InferenceCache
+
+# Inference backend: "eager" (fp32 PyTorch), "quantized" (dynamic int8
+# Linear layers), "torchscript" (traced graph) or "onnx" (ONNX Runtime)
+PREDICTION_BACKEND = (os.getenv("PREDICTION_BACKEND") or "eager").lower()
+BACKENDS = ("eager", "quantized", "torchscript", "onnx")
+
+# Where the ONNX export is written and reused from
+ONNX_CACHE_DIR = os.getenv("PREDICTION_ONNX_DIR") or os.path.join(
+    os.path.dirname(__file__), "..", ".cache", "onnx"
+)
 
 
 class Prediction:
-    def __init__(self, model_path: str):
+    def __init__(
+        self,
+        model_path: str,
+        backend: str = PREDICTION_BACKEND,
+        cache: InferenceCache | None = None,
+    ):
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown prediction backend {backend!r}, use {BACKENDS}")
+
         self._model_path = model_path
+        self._backend = backend
+        self._cache = cache
+
+        # Hub models are versioned by their commit, local ones by path only
+        commit = getattr(AutoConfig.from_pretrained(model_path), "_commit_hash", None)
+        self._revision = os.getenv("PREDICTION_MODEL_VERSION") or commit or "local"
+        self._version = f"{model_path}@{self._revision}/{backend}"
+
         self._tokenizer = AutoTokenizer.from_pretrained(model_path)
-        self._model = AutoModelForSequenceClassification.from_pretrained(model_path)
         self._labels = ["Neutral", "Positive", "Negative"]
+        self._run = getattr(self, f"_load_{backend}")()
+
+    @property
+    def backend(self) -> str:
+        return self._backend
+
+    @property
+    def version(self) -> str:
+        """Identifies the model weights and backend results come from."""
+        return self._version
+
+    @property
+    def cache(self) -> InferenceCache | None:
+        return self._cache
+
+    def _load_model(self, **kwargs):
+        model = AutoModelForSequenceClassification.from_pretrained(
+            self._model_path, **kwargs
+        )
+        model.eval()
+        return model
+
+    def _load_eager(self):
+        model = self._load_model()
+        return lambda inputs: model(**inputs).logits
+
+    def _load_quantized(self):
+        # int8 weights for the Linear layers (most of a transformer's compute
+        # and memory), activations quantized on the fly
+        model = torch.ao.quantization.quantize_dynamic(
+            self._load_model(), {torch.nn.Linear}, dtype=torch.qint8
+        )
+        return lambda inputs: model(**inputs).logits
+
+    def _example_inputs(self, return_tensors: str = "pt"):
+        return self._tokenizer(
+            "Shares rose after the company raised its guidance.",
+            return_tensors=return_tensors,
+        )
+
+    def _load_torchscript(self):
+        # torchscript=True makes the model return tuples, which tracing needs
+        model = self._load_model(torchscript=True)
+        example = self._example_inputs()
+        with torch.no_grad():
+            traced = torch.jit.trace(
+                model,
+                (example["input_ids"], example["attention_mask"]),
+                strict=False,
+            )
+        traced = torch.jit.freeze(traced)
+
+        return lambda inputs: traced(inputs["input_ids"], inputs["attention_mask"])[0]
+
+    def _onnx_path(self) -> str:
+        # One export per model revision, reused by later runs
+        name = self._model_path.strip("/").replace("/", "--")
+        return os.path.join(ONNX_CACHE_DIR, f"{name}@{self._revision}.onnx")
+
+    def _load_onnx(self):
+        # ONNX Runtime is optional, only the onnx backend needs it
+        import onnxruntime as ort
+
+        path = self._onnx_path()
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            model = self._load_model()
+            example = self._example_inputs()
+            # Exported next to the final path and moved in place once complete,
+            # so a run killed mid-export never leaves a truncated model behind
+            partial_path = f"{path}.{os.getpid()}.partial"
+            try:
+                torch.onnx.export(
+                    model,
+                    (example["input_ids"], example["attention_mask"]),
+                    partial_path,
+                    input_names=["input_ids", "attention_mask"],
+                    output_names=["logits"],
+                    dynamic_axes={
+                        "input_ids": {0: "batch", 1: "sequence"},
+                        "attention_mask": {0: "batch", 1: "sequence"},
+                        "logits": {0: "batch"},
+                    },
+                    opset_version=17,
+                )
+                os.replace(partial_path, path)
+            finally:
+                if os.path.exists(partial_path):
+                    os.remove(partial_path)
+            del model
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        session = ort.InferenceSession(
+            path, options, providers=["CPUExecutionProvider"]
+        )
+
+        def run(inputs):
+            (logits,) = session.run(
+                ["logits"],
+                {
+                    "input_ids": inputs["input_ids"].numpy(),
+                    "attention_mask": inputs["attention_mask"].numpy(),
+                },
+            )
+            return torch.from_numpy(logits)
+
+        return run
 
     def _compute_sentiment_score(self, probabilities: dict) -> float:
         label_weights = {"Negative": -1, "Neutral": 0, "Positive": 1}
@@ -19,6 +162,18 @@ class Prediction:
         return round(score, 4)
 
     def predict(self, sentence: str) -> dict:
+        if self._cache is not None:
+            cached = self._cache.get(self._version, sentence)
+            if cached is not None:
+                return cached
+
+        result = self._predict(sentence)
+
+        if self._cache is not None:
+            self._cache.set(self._version, sentence, result)
+        return result
+
+    def _predict(self, sentence: str) -> dict:
         inputs = self._tokenizer(
             sentence,
             return_tensors="pt",
@@ -28,8 +183,8 @@ class Prediction:
         )
 
         with torch.no_grad():
-            outputs = self._model(**inputs)
-            probs = F.softmax(outputs.logits, dim=-1)
+            logits = self._run(inputs)
+            probs = F.softmax(logits, dim=-1)
             prediction = torch.argmax(probs, dim=-1).item()
             confidence = probs[0][prediction].item()
 
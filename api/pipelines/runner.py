@@ -0,0 +1,199 @@
+# built-in modules
+import os
+import time
+import queue
+import threading
+import contextvars
+from collections.abc import Callable, Iterable
+
+# custom modules
+from pipelines.parallelism import CoreBudget
+
+# Items buffered in front of each stage, which bounds the items in flight
+PIPELINE_QUEUE_SIZE = int(os.getenv("PIPELINE_QUEUE_SIZE") or 8)
+
+# Put after the last item, one per worker of the stage
+_DONE = object()
+
+
+class Stage:
+    """One step of a `StagedRunner`.
+
+    `fn(item)` returns what the next stage receives, or None to drop the
+    item. Each of the stage's `workers` threads is pinned to `budget` and
+    calls `setup()` before its first item, e.g. to size torch's pool of
+    that thread.
+
+    With a `batch_size`, `fn` receives lists of up to that many items,
+    gathered for at most `batch_wait` seconds after the first one arrives,
+    so a quiet stream doesn't hold items back indefinitely.
+
+    Args:
+        name (str): Stage name, for errors
+        fn (callable): Processes one item, or one batch
+        budget (CoreBudget): Cores the stage's threads are pinned to
+        workers (int): Threads running the stage
+        setup (callable): Called once in each worker thread
+        batch_size (int): Items per call of `fn`, 0 for single items
+        batch_wait (float): Seconds a batch waits to fill up
+    """
+
+    def __init__(
+        self,
+        name: str,
+        fn: Callable,
+        budget: CoreBudget | None = None,
+        workers: int = 1,
+        setup: Callable | None = None,
+        batch_size: int = 0,
+        batch_wait: float = 1.0,
+    ):
+        self.name = name
+        self.fn = fn
+        self.budget = budget
+        self.workers = workers
+        self.setup = setup
+        self.batch_size = batch_size
+        self.batch_wait = batch_wait
+
+
+class StagedRunner:
+    """Runs items through stages on their own threads, connected by queues.
+
+    Stages work on different items at the same time, so e.g. spaCy parses
+    the next article while the model scores the current one. Queues hold at
+    most `queue_size` items, so a slow stage makes the ones before it wait
+    rather than pile items up in memory. Threads start in a copy of the
+    caller's context, so an active tracer sees their spans.
+
+    An item whose stage raises is dropped and recorded in `errors` as
+    (stage name, item, exception); the other items carry on.
+
+    Args:
+        stages (list): Stages, in the order items go through them
+        queue_size (int): Items buffered in front of each stage
+    """
+
+    def __init__(self, stages: list[Stage], queue_size: int = PIPELINE_QUEUE_SIZE):
+        self.stages = stages
+        self.queue_size = queue_size
+        self.errors: list[tuple[str, object, Exception]] = []
+        self.completed = 0
+        self._lock = threading.Lock()
+
+    def run(self, items: Iterable) -> int:
+        """Feed `items` through the stages and return how many came out."""
+        self.errors = []
+        self.completed = 0
+        queues = [queue.Queue(maxsize=self.queue_size) for _ in self.stages]
+
+        threads = []
+        for index, stage in enumerate(self.stages):
+            outbox = queues[index + 1] if index + 1 < len(queues) else None
+            next_workers = (
+                self.stages[index + 1].workers if index + 1 < len(queues) else 0
+            )
+            remaining = [stage.workers]
+            for worker in range(stage.workers):
+                context = contextvars.copy_context()
+                thread = threading.Thread(
+                    target=context.run,
+                    args=(
+                        self._work,
+                        stage,
+                        queues[index],
+                        outbox,
+                        next_workers,
+                        remaining,
+                    ),
+                    name=f"pipeline-{stage.name}-{worker}",
+                    daemon=True,
+                )
+                thread.start()
+                threads.append(thread)
+
+        try:
+            # Blocks whenever the first stage is `queue_size` items behind
+            for item in items:
+                queues[0].put(item)
+        finally:
+            # Also when `items` raises, so the items already in the queues
+            # are finished before the error leaves the run
+            for _ in range(self.stages[0].workers):
+                queues[0].put(_DONE)
+            for thread in threads:
+                thread.join()
+        return self.completed
+
+    def _work(
+        self,
+        stage: Stage,
+        inbox: queue.Queue,
+        outbox: queue.Queue | None,
+        next_workers: int,
+        remaining: list[int],
+    ):
+        if stage.budget is not None:
+            stage.budget.pin_current_thread()
+        if stage.setup is not None:
+            try:
+                stage.setup()
+            except Exception as e:
+                # Only tuning, the stage still works without it
+                with self._lock:
+                    self.errors.append((stage.name, None, e))
+
+        done = False
+        while not done:
+            item = inbox.get()
+            if item is _DONE:
+                break
+            if stage.batch_size:
+                item, done = self._gather(stage, inbox, item)
+
+            try:
+                result = stage.fn(item)
+            except Exception as e:
+                with self._lock:
+                    self.errors.append((stage.name, item, e))
+                continue
+
+            if result is None:
+                continue
+            if outbox is not None:
+                outbox.put(result)
+            else:
+                with self._lock:
+                    self.completed += 1
+
+        self._finish(outbox, next_workers, remaining)
+
+    @staticmethod
+    def _gather(stage: Stage, inbox: queue.Queue, first) -> tuple[list, bool]:
+        """Batch `first` with the items that arrive within the stage's wait.
+
+        Returns:
+            tuple: The batch, and whether the stream ended while gathering it
+        """
+        batch = [first]
+        deadline = time.monotonic() + stage.batch_wait
+        while len(batch) < stage.batch_size:
+            try:
+                item = inbox.get(timeout=max(deadline - time.monotonic(), 0))
+            except queue.Empty:
+                break
+            if item is _DONE:
+                return batch, True
+            batch.append(item)
+        return batch, False
+
+    def _finish(
+        self, outbox: queue.Queue | None, next_workers: int, remaining: list[int]
+    ):
+        # The last worker of a stage to finish tells the next stage's workers
+        with self._lock:
+            remaining[0] -= 1
+            last = remaining[0] == 0
+        if last and outbox is not None:
+            for _ in range(next_workers):
+                outbox.put(_DONE)
@@ -9,8 +9,15 @@ import numpy as np
 import networkx as nx
 
 
-nltk.download("punkt")
-nltk.download("stopwords")
+# Download the NLTK data once, so runs without network work after that
+for resource, package in (
+    ("tokenizers/punkt", "punkt"),
+    ("corpora/stopwords", "stopwords"),
+):
+    try:
+        nltk.data.find(resource)
+    except LookupError:
+        nltk.download(package)
 
 
 class Summarizer:
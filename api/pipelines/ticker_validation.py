@@ -1,21 +1,28 @@
 # built-in modules
 import re
+import csv
 
 # pip modules
 import requests
 import spacy
 
+# custom modules
+from pipelines.tracing import span
+
 nlp = spacy.load("en_core_web_lg")
 
 
 class TickerValidator:
-    def __init__(self):
+    def __init__(self, ticker_data_path=None):
         """
         Initialize the ticker validator with optional ticker data
 
         Parameters:
-        ticker_data_path (str): Path to CSV file containing ticker data
+        ticker_data_path (str): Path to CSV file containing ticker data, with
+            `ticker` and `name` columns. When given, the ticker universe is
+            loaded from it instead of the API (no network needed).
         """
+        self.ticker_data_path = ticker_data_path
         self.company_to_ticker = {}
         self.ticker_to_company = {}
         self.all_tickers = set()
@@ -33,7 +40,10 @@ class TickerValidator:
         # API endpoint for ticker validation
         self.api_url = "https://stockanalysis.com/api/screener/s/f?m=s&s=desc&c=s,n&sc=industry&cn=6000&p=1&i=stocks"
 
-        self.fetch_ticker_data_from_api()
+        if ticker_data_path:
+            self.load_ticker_data_from_file(ticker_data_path)
+        else:
+            self.fetch_ticker_data_from_api()
 
     def clean_article_text(self, text):
         """Remove social sharing text and clean the article"""
@@ -64,25 +74,9 @@ class TickerValidator:
                 if "data" in data and "data" in data["data"]:
                     ticker_data = data["data"]["data"]
 
-                    # Clear existing data
-                    self.company_to_ticker = {}
-                    self.ticker_to_company = {}
-                    self.all_tickers = set()
-
-                    # Process each ticker entry
-                    for entry in ticker_data:
-                        ticker = entry["s"]
-                        company_name = entry["n"]
-
-                        # Store data in dictionaries
-                        self.company_to_ticker[company_name] = ticker
-                        self.ticker_to_company[ticker] = company_name
-                        self.all_tickers.add(ticker)
-
-                        # Handle shortened company names without Inc, Corp, etc.
-                        shortened_name = self._get_shortened_company_name(company_name)
-                        if shortened_name and shortened_name != company_name:
-                            self.company_to_ticker[shortened_name] = ticker
+                    self._load_ticker_data(
+                        (entry["s"], entry["n"]) for entry in ticker_data
+                    )
 
                     print(
                         f"Successfully loaded {len(self.all_tickers)} tickers from API"
@@ -98,6 +92,46 @@ class TickerValidator:
             print(f"Error fetching ticker data from API: {e}")
             self._load_fallback_data()
 
+    def load_ticker_data_from_file(self, path):
+        """
+        Load ticker data from a CSV file with `ticker` and `name` columns
+        """
+        with open(path, newline="", encoding="utf-8") as file:
+            self._load_ticker_data(
+                (row["ticker"], row["name"]) for row in csv.DictReader(file)
+            )
+
+        print(f"Successfully loaded {len(self.all_tickers)} tickers from {path}")
+
+    def _load_fallback_data(self):
+        """
+        Load ticker data from `ticker_data_path` when the API is unavailable
+        """
+        if self.ticker_data_path:
+            self.load_ticker_data_from_file(self.ticker_data_path)
+        else:
+            print("No ticker data file to fall back to, no tickers loaded")
+
+    def _load_ticker_data(self, entries):
+        """
+        Replace the ticker universe with (ticker, company name) pairs
+        """
+        # Clear existing data
+        self.company_to_ticker = {}
+        self.ticker_to_company = {}
+        self.all_tickers = set()
+
+        for ticker, company_name in entries:
+            # Store data in dictionaries
+            self.company_to_ticker[company_name] = ticker
+            self.ticker_to_company[ticker] = company_name
+            self.all_tickers.add(ticker)
+
+            # Handle shortened company names without Inc, Corp, etc.
+            shortened_name = self._get_shortened_company_name(company_name)
+            if shortened_name and shortened_name != company_name:
+                self.company_to_ticker[shortened_name] = ticker
+
     def _get_shortened_company_name(self, company_name):
         """
         Extract shortened company name by removing suffixes like Inc., Corp., etc.
@@ -149,12 +183,13 @@ class TickerValidator:
 
         return False
 
-    def identify_companies(self, text):
+    def identify_companies(self, text, doc=None):
         """
         Identify company names in text using SpaCy's NER
 
         Parameters:
             text (str): Text to analyze
+            doc (Doc): SpaCy parse of the cleaned text, parsed here when None
 
         Returns:
             list: List of identified company entities
@@ -162,7 +197,8 @@ class TickerValidator:
         # First clean the text to remove sharing buttons and metadata
         cleaned_text = self.clean_article_text(text)
 
-        doc = nlp(cleaned_text)
+        if doc is None:
+            doc = nlp(cleaned_text)
         companies = []
 
         # Extract organizations using SpaCy's NER
@@ -230,8 +266,9 @@ class TickerValidator:
                     continue
 
             name = company["name"]
-            if self._get_shortened_company_name(name) in self.company_to_ticker:
-                ticker = self.company_to_ticker[name]
+            shortened_name = self._get_shortened_company_name(name)
+            if shortened_name in self.company_to_ticker:
+                ticker = self.company_to_ticker[shortened_name]
                 if self.is_valid_ticker(ticker):
                     company["ticker"] = ticker
                     company["ticker_source"] = "exact_match"
@@ -264,20 +301,20 @@ class TickerValidator:
 
         return companies
 
-    def analyze_company_context(self, text, companies):
+    def analyze_company_context(self, text, companies, doc=None):
         """
         Analyze the context around mentioned companies using dependency parsing
 
         Parameters:
             text (str): Text to analyze
             companies (list): List of company dictionaries with position info
+            doc (Doc): SpaCy parse of the cleaned text, parsed here when None
 
         Returns:
             list: List of companies with contextual analysis
         """
-        # Clean the text first
-        cleaned_text = self.clean_article_text(text)
-        doc = nlp(cleaned_text)
+        if doc is None:
+            doc = nlp(self.clean_article_text(text))
 
         # Map each token's position back to the original text
         token_to_char = {}
@@ -464,12 +501,13 @@ class TickerValidator:
 
         return token.doc[start_idx:end_idx].text
 
-    def validate(self, text):
+    def validate(self, text, doc=None):
         """
         Main method to validate tickers in news text
 
         Parameters:
             text (str): Financial news text
+            doc (Doc): SpaCy parse of the cleaned text, parsed here when None
 
         Returns:
             dict: Analysis results including companies, tickers, and context
@@ -477,11 +515,19 @@ class TickerValidator:
         # Clean the text first
         cleaned_text = self.clean_article_text(text)
 
-        companies = self.identify_companies(cleaned_text)
-        companies_with_tickers = self.match_companies_to_tickers(companies)
-        companies_with_context = self.analyze_company_context(
-            cleaned_text, companies_with_tickers
-        )
+        # One parse serves both the entity and the dependency passes
+        if doc is None:
+            with span("spacy_parse"):
+                doc = nlp(cleaned_text)
+
+        with span("company_match"):
+            companies = self.identify_companies(cleaned_text, doc)
+        with span("ticker_match"):
+            companies_with_tickers = self.match_companies_to_tickers(companies)
+        with span("spacy_context"):
+            companies_with_context = self.analyze_company_context(
+                cleaned_text, companies_with_tickers, doc
+            )
 
         # Organize results
         valid_companies = []
@@ -503,3 +549,26 @@ class TickerValidator:
         }
 
         return summary
+
+    def validate_many(self, texts, n_process=1, batch_size=64):
+        """
+        Validate tickers in several texts, parsing them in batches
+
+        Parameters:
+            texts (list): Financial news texts
+            n_process (int): SpaCy worker processes; more than one only pays
+                off for hundreds of texts, as each call starts a process pool
+            batch_size (int): Texts parsed per batch
+
+        Returns:
+            list: One `validate` result per text, in order
+        """
+        cleaned_texts = [self.clean_article_text(text) for text in texts]
+        docs = nlp.pipe(cleaned_texts, n_process=n_process, batch_size=batch_size)
+
+        results = []
+        for cleaned_text in cleaned_texts:
+            with span("spacy_parse"):
+                doc = next(docs)
+            results.append(self.validate(cleaned_text, doc))
+        return results
@@ -0,0 +1,255 @@
+# built-in modules
+import os
+import heapq
+import time
+import pstats
+import cProfile
+import threading
+import statistics
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+
+
+# Number of slowest items whose cProfile stats are kept per run (0 disables
+# profiling, which otherwise roughly doubles the pipeline's Python time)
+PIPELINE_PROFILE_SLOWEST = int(os.getenv("PIPELINE_PROFILE_SLOWEST") or 0)
+PIPELINE_PROFILE_DIR = os.getenv("PIPELINE_PROFILE_DIR") or os.path.join(
+    os.path.dirname(__file__), "..", "logs", "profiles"
+)
+
+_current_tracer: ContextVar["Tracer | None"] = ContextVar("tracer", default=None)
+# Stage times of the item being processed in this context
+_item_stages: ContextVar[dict[str, float] | None] = ContextVar(
+    "item_stages", default=None
+)
+
+
+class StageStats:
+    def __init__(self):
+        self.durations: list[float] = []
+
+    @property
+    def calls(self) -> int:
+        return len(self.durations)
+
+    @property
+    def total(self) -> float:
+        return sum(self.durations)
+
+    def percentile(self, q: float) -> float:
+        if len(self.durations) < 2:
+            return self.durations[0] if self.durations else 0.0
+        return statistics.quantiles(self.durations, n=100)[int(q) - 1]
+
+
+class Tracer:
+    """Times the stages of a pipeline run, per item and in total.
+
+    Items (e.g. articles) are traced with `item()`, and the stages inside
+    them with `span()`. Spans are not nested, so stage totals never count the
+    same time twice and their shares of the traced time can be compared
+    directly. `count()` keeps plain counters (sentences, insights, skipped
+    articles, ...).
+
+    When `profile_slowest` is set, every item runs under cProfile and the
+    stats of the N slowest are written to `profile_dir` as `.prof` files
+    (readable with `pstats` or snakeviz). For whole-process sampling attach
+    py-spy instead (`py-spy record --pid <scraper pid>`), which costs
+    nothing while the scraper is not being sampled.
+
+    Items whose stages run on several threads (see `StagedRunner`) are
+    traced with `begin()`, `resume()` and `end()` instead; their time is
+    the sum of their spans, queueing excluded, and each `resume()` block
+    is profiled on its own thread, the profiles of an item being merged.
+
+    Args:
+        profile_slowest (int): Number of slowest items to keep profiles of
+        profile_dir (str): Directory the profiles are written to
+    """
+
+    def __init__(
+        self,
+        profile_slowest: int = PIPELINE_PROFILE_SLOWEST,
+        profile_dir: str = PIPELINE_PROFILE_DIR,
+    ):
+        self.profile_slowest = profile_slowest
+        self.profile_dir = profile_dir
+
+        self.stages: dict[str, StageStats] = {}
+        self.counters: dict[str, int] = {}
+        self.items: list[tuple[float, str, dict]] = []
+        self.started_at = time.perf_counter()
+
+        # Min-heap of (elapsed, sequence, key, profiles) for the slowest items
+        self._profiles: list[tuple[float, int, str, list[cProfile.Profile]]] = []
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def activate(self):
+        """Make this tracer the one module level `span()` calls report to."""
+        token = _current_tracer.set(self)
+        try:
+            yield self
+        finally:
+            _current_tracer.reset(token)
+
+    @contextmanager
+    def span(self, stage: str):
+        started_at = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - started_at
+            item_stages = _item_stages.get()
+            with self._lock:
+                self.stages.setdefault(stage, StageStats()).durations.append(elapsed)
+                if item_stages is not None:
+                    item_stages[stage] = item_stages.get(stage, 0) + elapsed
+
+    def count(self, name: str, amount: int = 1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    def begin(self, key: str) -> tuple[str, dict[str, float], list]:
+        """Start tracing an item whose stages may run on other threads."""
+        return key, {}, []
+
+    @contextmanager
+    def resume(self, trace: tuple[str, dict[str, float], list]):
+        """Count the spans of this context towards `trace`'s item."""
+        token = _item_stages.set(trace[1])
+        profiler = cProfile.Profile() if self.profile_slowest > 0 else None
+        if profiler is not None:
+            profiler.enable()
+        try:
+            yield
+        finally:
+            if profiler is not None:
+                profiler.disable()
+                trace[2].append(profiler)
+            _item_stages.reset(token)
+
+    def end(self, trace: tuple[str, dict[str, float], list]):
+        key, stages, profilers = trace
+        elapsed = sum(stages.values())
+        with self._lock:
+            self.items.append((elapsed, key, stages))
+            if profilers:
+                self._keep_profile(elapsed, key, profilers)
+
+    @contextmanager
+    def item(self, key: str):
+        item_stages = {}
+        token = _item_stages.set(item_stages)
+        profiler = cProfile.Profile() if self.profile_slowest > 0 else None
+        started_at = time.perf_counter()
+        if profiler is not None:
+            profiler.enable()
+        try:
+            yield
+        finally:
+            if profiler is not None:
+                profiler.disable()
+            elapsed = time.perf_counter() - started_at
+
+            _item_stages.reset(token)
+            self.items.append((elapsed, key, item_stages))
+            if profiler is not None:
+                self._keep_profile(elapsed, key, [profiler])
+
+    def _keep_profile(
+        self, elapsed: float, key: str, profilers: list[cProfile.Profile]
+    ):
+        entry = (elapsed, len(self.items), key, profilers)
+        if len(self._profiles) < self.profile_slowest:
+            heapq.heappush(self._profiles, entry)
+        elif elapsed > self._profiles[0][0]:
+            heapq.heapreplace(self._profiles, entry)
+
+    def save_profiles(self) -> list[str]:
+        """Write the kept profiles, slowest first, and return their paths."""
+        if not self._profiles:
+            return []
+
+        os.makedirs(self.profile_dir, exist_ok=True)
+        run = time.strftime("%Y%m%d-%H%M%S")
+        paths = []
+        for rank, (elapsed, _, key, profilers) in enumerate(
+            sorted(self._profiles, reverse=True), start=1
+        ):
+            path = os.path.join(self.profile_dir, f"{run}-{rank:02d}.prof")
+            pstats.Stats(*profilers).dump_stats(path)
+            paths.append(f"{path} ({key}, {elapsed:.2f}s)")
+
+        self._profiles = []
+        return paths
+
+    def summary(self, slowest: int = 5) -> dict:
+        traced = sum(elapsed for elapsed, _, _ in self.items)
+        return {
+            "elapsed": time.perf_counter() - self.started_at,
+            "items": len(self.items),
+            "traced": traced,
+            "stages": {
+                stage: {
+                    "calls": stats.calls,
+                    "total": stats.total,
+                    "mean": stats.total / stats.calls,
+                    "p95": stats.percentile(95),
+                    "share": stats.total / traced if traced else 0.0,
+                }
+                for stage, stats in sorted(
+                    self.stages.items(), key=lambda item: item[1].total, reverse=True
+                )
+            },
+            "counters": dict(self.counters),
+            "slowest": sorted(self.items, key=lambda item: item[0], reverse=True)[
+                :slowest
+            ],
+        }
+
+    def log_summary(self, logger, slowest: int = 5):
+        summary = self.summary(slowest)
+        logger.info(
+            "Pipeline run: %d items in %.2fs (%.2fs traced)",
+            summary["items"],
+            summary["elapsed"],
+            summary["traced"],
+        )
+        for stage, stats in summary["stages"].items():
+            logger.info(
+                "  %-16s %6d calls %9.2fs total %9.1fms mean %9.1fms p95 %5.1f%%",
+                stage,
+                stats["calls"],
+                stats["total"],
+                stats["mean"] * 1000,
+                stats["p95"] * 1000,
+                stats["share"] * 100,
+            )
+        if summary["counters"]:
+            counters = summary["counters"].items()
+            logger.info(
+                "  counters: %s", ", ".join(f"{name}={value}" for name, value in counters)
+            )
+        for elapsed, key, stages in summary["slowest"]:
+            breakdown = ", ".join(
+                f"{stage} {seconds:.2f}s"
+                for stage, seconds in sorted(
+                    stages.items(), key=lambda item: item[1], reverse=True
+                )
+            )
+            logger.info("  slow item %.2fs %s: %s", elapsed, key, breakdown)
+        for path in self.save_profiles():
+            logger.info("  profile written to %s", path)
+
+
+def span(stage: str):
+    """Time `stage` on the active tracer, or do nothing when none is active."""
+    tracer = _current_tracer.get()
+    return tracer.span(stage) if tracer is not None else nullcontext()
+
+
+def count(name: str, amount: int = 1):
+    tracer = _current_tracer.get()
+    if tracer is not None:
+        tracer.count(name, amount)
@@ -7,23 +7,17 @@ from fastapi import APIRouter, Response, Depends, status
 from models.user_model import User
 from schemas.auth_schema import LoginUserSchema, SigninUserSchema
 from services.auth_service import (
+    PasswordHasherBusy,
     generate_jwt_token,
     hash_password,
+    password_hasher,
     verify_password,
 )
-from dependencies.auth_dependency import protect_route
-from utils import rename_keys
+from dependencies.auth_dependency import protect_route, user_serializer
 
 
 router = APIRouter()
 
-key_map = {
-    "_id": "id",
-    "apiKey": "api_key",
-    "createdAt": "created_at",
-    "updatedAt": "updated_at",
-}
-
 
 @router.post("/signup")
 async def signup(
@@ -40,7 +34,14 @@ async def signup(
         }
 
     # Hash the password
-    hashed_password = hash_password(user_data.password)
+    try:
+        hashed_password = await hash_password(user_data.password)
+    except PasswordHasherBusy as e:
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+        return {
+            "status": False,
+            "message": str(e),
+        }
 
     # Create a new user
     user = User(name=user_data.name, email=user_data.email, password=hashed_password)
@@ -49,10 +50,7 @@ async def signup(
     # Generate JWT access token
     access_token = generate_jwt_token(data={"sub": user.email})
 
-    user_dict: dict = user.to_mongo().to_dict()
-    user_dict["_id"] = str(user_dict["_id"])
-    user_dict = rename_keys(user_dict, key_map)
-    user_dict.pop("password")
+    user_dict = user_serializer(user.to_mongo())
 
     return {
         "status": True,
@@ -68,20 +66,34 @@ async def login(
 ):
     # Check if user exists and verify password
     user = User.objects(email=user_data.email).first()
-    if not user or not verify_password(user_data.password, user.password):
+    try:
+        is_valid = user and await verify_password(user_data.password, user.password)
+    except PasswordHasherBusy as e:
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+        return {
+            "status": False,
+            "message": str(e),
+        }
+
+    if not is_valid:
         response.status_code = status.HTTP_401_UNAUTHORIZED
         return {
             "status": False,
             "message": "Invalid credentials",
         }
 
+    # Upgrade hashes made with an older work factor, best effort
+    if password_hasher.needs_rehash(user.password):
+        try:
+            user.password = await hash_password(user_data.password)
+            user.save()
+        except PasswordHasherBusy:
+            pass
+
     # Generate JWT access token
     access_token = generate_jwt_token(data={"sub": user.email})
 
-    user_dict: dict = user.to_mongo().to_dict()
-    user_dict["_id"] = str(user_dict["_id"])
-    user_dict = rename_keys(user_dict, key_map)
-    user_dict.pop("password")
+    user_dict = user_serializer(user.to_mongo())
 
     return {
         "status": True,
@@ -0,0 +1,19 @@
+from fastapi import APIRouter, Request, Response, status
+
+router = APIRouter()
+
+
+@router.get("/health")
+async def health():
+    """Liveness: the process is up and serving requests."""
+    return {"status": True, "message": "OK"}
+
+
+@router.get("/ready")
+async def ready(request: Request, response: Response):
+    """Readiness: the worker has finished warming up its caches."""
+    if not getattr(request.app.state, "ready", False):
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+        return {"status": False, "message": "Warming up"}
+
+    return {"status": True, "message": "Ready"}
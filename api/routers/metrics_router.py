@@ -0,0 +1,88 @@
+import os
+import hmac
+from typing import Annotated
+
+from fastapi import APIRouter, Header, Response, status
+from fastapi.responses import PlainTextResponse
+
+from services.auth_service import password_hasher
+from services.cache_service import caches
+from services.metrics_service import registry
+from services.news_feed_service import news_feed
+from services.price_service import price_hub
+
+router = APIRouter()
+
+# Optional bearer token required to scrape /metrics
+METRICS_TOKEN = os.getenv("METRICS_TOKEN")
+
+
+def cache_stat(level: str, key: str):
+    def collect() -> dict:
+        values = {}
+        for cache in caches:
+            stats = cache.stats()
+            values[(cache.namespace,)] = stats[level][key] if level else stats[key]
+        return values
+
+    return collect
+
+
+CACHE_METRICS = (
+    ("cache_l1_hits_total", "In-process cache hits", "l1", "hits", "counter"),
+    ("cache_l1_misses_total", "In-process cache misses", "l1", "misses", "counter"),
+    ("cache_l1_evictions_total", "In-process evictions", "l1", "evictions", "counter"),
+    ("cache_l1_rejections_total", "TinyLFU rejections", "l1", "rejections", "counter"),
+    ("cache_l1_entries", "In-process cache entries", "l1", "size", "gauge"),
+    ("cache_l2_hits_total", "Shared cache hits", None, "l2_hits", "counter"),
+    ("cache_l2_misses_total", "Shared cache misses", None, "l2_misses", "counter"),
+    ("cache_loads_total", "Misses loaded from the source", None, "loads", "counter"),
+)
+for name, description, level, key, kind in CACHE_METRICS:
+    registry.gauge(name, description, cache_stat(level, key), ("namespace",), kind)
+
+registry.gauge(
+    "password_hasher_pending",
+    "bcrypt hash/verify calls queued or running",
+    lambda: password_hasher.pending,
+)
+registry.gauge(
+    "price_stream_tickers",
+    "Tickers polled for price streams",
+    lambda: price_hub.stats()["tickers"],
+)
+registry.gauge(
+    "price_stream_subscriptions",
+    "Ticker subscriptions of open price streams",
+    lambda: price_hub.stats()["subscriptions"],
+)
+registry.gauge(
+    "price_stream_upstream_calls_total",
+    "Yahoo Finance calls made by price stream pollers",
+    lambda: price_hub.stats()["upstream_calls"],
+    kind="counter",
+)
+registry.gauge(
+    "news_feed_subscriptions",
+    "Open news feed connections",
+    lambda: news_feed.subscriptions,
+)
+
+
+@router.get("/metrics")
+async def metrics(
+    response: Response,
+    Authorization: Annotated[str | None, Header()] = None,
+):
+    if METRICS_TOKEN and not hmac.compare_digest(
+        Authorization or "", f"Bearer {METRICS_TOKEN}"
+    ):
+        response.status_code = status.HTTP_401_UNAUTHORIZED
+        return {
+            "status": False,
+            "message": "Unauthorized - Invalid metrics token",
+        }
+
+    return PlainTextResponse(
+        registry.render(), media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
@@ -1,18 +1,42 @@
+import asyncio
 from typing import Annotated, Optional
 from datetime import datetime
 
-from fastapi import APIRouter, Depends, Query, Response, status
+import orjson
+from bson import ObjectId
+from fastapi import APIRouter, Depends, Header, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
+from starlette.concurrency import run_in_threadpool
 
 from dependencies.user_dependency import verfiy_api_key
 from models.newsArticle_model import NewsArticle
-from utils import rename_keys
+from services.export_service import export_news, parse_cursor
+from services.news_feed_service import news_feed
+from services.read_service import count_raw, find_raw, sort_spec
+from utils.http_cache_util import (
+    NEWS_MAX_AGE,
+    cache_control,
+    cache_headers,
+    is_not_modified,
+    make_etag,
+    not_modified,
+)
+from utils.serializer_util import FastJSONResponse, Serializer
 
 router = APIRouter()
 
+news_article_serializer = Serializer(
+    NewsArticle,
+    exclude={"created_at", "updated_at"},
+)
+# `updatedAt` is loaded for the ETag, the serializer drops it
+news_article_projection = {"createdAt": 0}
+
 
 @router.get("")
 async def get_news(
     api_key: Annotated[str, Depends(verfiy_api_key)],
+    request: Request,
     response: Response,
     ticker: Optional[str] = None,
     from_date: Optional[str] = Query(
@@ -31,22 +55,22 @@ async def get_news(
         return api_key
 
     # Start with base query
-    news_articles = NewsArticle.objects()
+    query = {}
 
     # Apply filters
     if ticker:
-        news_articles = news_articles.filter(tickers=ticker)
+        query["tickers"] = ticker
 
     # Date filtering
     try:
         if from_date:
             from_datetime = datetime.strptime(from_date, "%Y-%m-%d")
-            news_articles = news_articles.filter(published_at__gte=from_datetime)
+            query.setdefault("publishedAt", {})["$gte"] = from_datetime
 
         if to_date:
             to_datetime = datetime.strptime(to_date, "%Y-%m-%d")
             to_datetime = to_datetime.replace(hour=23, minute=59, second=59)
-            news_articles = news_articles.filter(published_at__lte=to_datetime)
+            query.setdefault("publishedAt", {})["$lte"] = to_datetime
     except ValueError:
         response.status_code = status.HTTP_400_BAD_REQUEST
         return {
@@ -55,18 +79,18 @@ async def get_news(
         }
 
     # Apply sorting
+    sort = None
     if sort_by:
-        # Determine sort direction
-        sort_direction = "-" if order and order.lower() == "desc" else ""
-        sort_field = f"{sort_direction}{sort_by}"  # eg: "-publishedAt"
-        news_articles = news_articles.order_by(sort_field)
+        try:
+            sort = sort_spec(
+                NewsArticle, sort_by, descending=bool(order and order.lower() == "desc")
+            )
+        except ValueError:
+            response.status_code = status.HTTP_400_BAD_REQUEST
+            return {"status": False, "message": f"Cannot sort by {sort_by}"}
 
     # Get total count before pagination
-    total_count = news_articles.count()
-
-    # Apply pagination
-    skip = (page - 1) * limit
-    news_articles = news_articles.skip(skip).limit(limit)
+    total_count = count_raw(NewsArticle, query)
 
     # Calculate pagination metadata
     total_pages = (total_count + limit - 1) // limit
@@ -78,38 +102,243 @@ async def get_news(
             "message": "Page number exceeds total pages",
         }
 
-    # Process results
-    key_map = {
-        "_id": "id",
-        "articleUrl": "article_url",
-        "imageUrl": "image_url",
-        "publishedAt": "published_at",
-        "sentimentReasoning": "sentiment_reasoning",
-        "sentimentScore": "sentiment_score",
-        "homepageUrl": "homepage_url",
-        "logoUrl": "logo_url",
-        "createdAt": "created_at",
-        "updatedAt": "updated_at",
-    }
-
-    news = []
-    for news_article in news_articles:
-        news_article_dict: dict = news_article.to_mongo().to_dict()
-        news_article_dict["_id"] = str(news_article_dict["_id"])
-        news_article_dict = rename_keys(news_article_dict, key_map)
-        news_article_dict.pop("created_at")
-        news_article_dict.pop("updated_at")
-        news.append(news_article_dict)
-
-    return {
-        "status": True,
-        "data": news,
-        "pagination": {
-            "count": len(news),
-            "total": total_count,
-            "page": page,
-            "total_pages": total_pages,
-            "has_next": page < total_pages,
-            "has_prev": page > 1,
+    # Apply pagination
+    news_articles = list(
+        find_raw(
+            NewsArticle,
+            query,
+            projection=news_article_projection,
+            sort=sort,
+            skip=(page - 1) * limit,
+            limit=limit,
+        )
+    )
+
+    # The page is fully determined by its articles' versions and the total
+    etag = make_etag(
+        total_count,
+        [(article["_id"], article.get("updatedAt")) for article in news_articles],
+    )
+    cache_control_ = cache_control(NEWS_MAX_AGE)
+    if is_not_modified(request, etag):
+        return not_modified(etag, cache_control_)
+
+    news = news_article_serializer.many(news_articles)
+
+    return FastJSONResponse(
+        {
+            "status": True,
+            "data": news,
+            "pagination": {
+                "count": len(news),
+                "total": total_count,
+                "page": page,
+                "total_pages": total_pages,
+                "has_next": page < total_pages,
+                "has_prev": page > 1,
+            },
         },
-    }
+        headers=cache_headers(etag, cache_control_),
+    )
+
+
+@router.get("/export")
+async def export_news_articles(
+    api_key: Annotated[str, Depends(verfiy_api_key)],
+    response: Response,
+    ticker: Optional[str] = None,
+    from_date: Optional[str] = Query(
+        None, alias="from", description="Start date (YYYY-MM-DD)"
+    ),
+    to_date: Optional[str] = Query(
+        None, alias="to", description="End date (YYYY-MM-DD)"
+    ),
+    format_: str = Query(
+        "ndjson", alias="format", description="Output format (ndjson or csv)"
+    ),
+    rows: str = Query(
+        "articles",
+        description="One row per article (articles) or per article insight (insights)",
+    ),
+    cursor: Optional[str] = Query(
+        None,
+        description="Resume after this article id (the `id` or `article_id` of the last complete article received)",
+    ),
+):
+
+    if not api_key["status"]:
+        return api_key
+
+    format_ = format_.lower()
+    rows = rows.lower()
+
+    if format_ not in ("ndjson", "csv"):
+        response.status_code = status.HTTP_400_BAD_REQUEST
+        return {
+            "status": False,
+            "message": "Invalid format. Must be one of ['ndjson', 'csv']",
+        }
+
+    if rows not in ("articles", "insights"):
+        response.status_code = status.HTTP_400_BAD_REQUEST
+        return {
+            "status": False,
+            "message": "Invalid rows. Must be one of ['articles', 'insights']",
+        }
+
+    query = {}
+    if ticker:
+        query["tickers"] = ticker
+
+    try:
+        if from_date:
+            from_datetime = datetime.strptime(from_date, "%Y-%m-%d")
+            query.setdefault("publishedAt", {})["$gte"] = from_datetime
+
+        if to_date:
+            to_datetime = datetime.strptime(to_date, "%Y-%m-%d")
+            to_datetime = to_datetime.replace(hour=23, minute=59, second=59)
+            query.setdefault("publishedAt", {})["$lte"] = to_datetime
+    except ValueError:
+        response.status_code = status.HTTP_400_BAD_REQUEST
+        return {
+            "status": False,
+            "message": "Invalid date format. Use YYYY-MM-DD",
+        }
+
+    after = None
+    if cursor:
+        try:
+            after = parse_cursor(cursor)
+        except ValueError:
+            response.status_code = status.HTTP_400_BAD_REQUEST
+            return {
+                "status": False,
+                "message": "Invalid cursor. Use the id of the last article received",
+            }
+
+    # The generator is iterated on the thread pool, one Mongo batch at a time
+    return StreamingResponse(
+        export_news(query, rows=rows, format_=format_, ticker=ticker, after=after),
+        media_type="text/csv" if format_ == "csv" else "application/x-ndjson",
+        headers={
+            "Content-Disposition": f'attachment; filename="news_{rows}.{format_}"',
+        },
+    )
+
+
+# Seconds between keep-alive comments on idle feeds
+FEED_HEARTBEAT_INTERVAL = 15
+
+
+def feed_events(article: dict, tickers: set[str] | None) -> bytes:
+    """Encode an article, and its insights for the subscribed tickers, as SSE."""
+    event_id = article["id"]
+    events = [
+        f"id: {event_id}\nevent: article\ndata: ".encode()
+        + orjson.dumps(article, default=str)
+        + b"\n\n"
+    ]
+
+    for insight in article.get("insights") or []:
+        if tickers and insight.get("ticker") not in tickers:
+            continue
+
+        events.append(
+            f"id: {event_id}\nevent: insight\ndata: ".encode()
+            + orjson.dumps(
+                {
+                    "article_id": event_id,
+                    "published_at": article.get("published_at"),
+                    **insight,
+                },
+                default=str,
+            )
+            + b"\n\n"
+        )
+
+    return b"".join(events)
+
+
+async def news_feed_events(
+    tickers: set[str] | None, resume_from: ObjectId | None = None
+):
+    # Subscribed once the response starts streaming, so a client that is
+    # gone before then never leaves a subscription behind. Subscribing
+    # before the replay means nothing saved in between is missed.
+    subscription = news_feed.subscribe(tickers)
+    last_id = None
+    try:
+        more = resume_from is not None
+        while more:
+            # Backfills come in pages, carry on until caught up with the feed
+            backlog, more = await run_in_threadpool(
+                news_feed.replay,
+                resume_from if last_id is None else parse_cursor(last_id),
+                tickers,
+            )
+            for article in backlog:
+                last_id = article["id"]
+                yield feed_events(article, tickers)
+
+        while True:
+            if subscription.overflowed and subscription.queue.empty():
+                # Too slow to keep up, the client resumes from its last event id
+                yield b"event: overflow\ndata: {}\n\n"
+                return
+
+            try:
+                article = await asyncio.wait_for(
+                    subscription.queue.get(), timeout=FEED_HEARTBEAT_INTERVAL
+                )
+            except asyncio.TimeoutError:
+                yield b": keep-alive\n\n"
+                continue
+
+            # Skip articles already sent from the backlog
+            if last_id is not None and article["id"] <= last_id:
+                continue
+
+            yield feed_events(article, tickers)
+    finally:
+        news_feed.unsubscribe(subscription)
+
+
+@router.get("/feed")
+async def get_news_feed(
+    api_key: Annotated[str, Depends(verfiy_api_key)],
+    response: Response,
+    tickers: Optional[str] = Query(
+        None,
+        description="Comma-separated list of tickers to subscribe to. All news if omitted.",
+    ),
+    last_event_id: Optional[str] = Header(None, alias="Last-Event-ID"),
+    after: Optional[str] = Query(
+        None,
+        description="Resume after this event id. The `Last-Event-ID` header takes precedence.",
+    ),
+):
+
+    if not api_key["status"]:
+        return api_key
+
+    tickers = {ticker.strip().upper() for ticker in (tickers or "").split(",")}
+    tickers.discard("")
+
+    resume_from = None
+    if last_event_id or after:
+        try:
+            resume_from = parse_cursor(last_event_id or after)
+        except ValueError:
+            response.status_code = status.HTTP_400_BAD_REQUEST
+            return {
+                "status": False,
+                "message": "Invalid event id",
+            }
+
+    # Server-sent events: `article` and `insight` events, ids are article ids
+    return StreamingResponse(
+        news_feed_events(tickers or None, resume_from),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -1,12 +1,77 @@
+import asyncio
 from typing import Annotated
+from functools import partial
 
-import yfinance as yf
+import orjson
 from fastapi import APIRouter, Response, Depends, Path, status, Query
+from fastapi.responses import StreamingResponse
 
 from dependencies.user_dependency import verfiy_api_key
+from services.price_service import fetch_price, price_cache, price_hub
 
 router = APIRouter()
 
+# Upper bound on tickers per stream, and seconds between keep-alive comments
+MAX_STREAM_TICKERS = 50
+HEARTBEAT_INTERVAL = 15
+
+
+async def price_events(tickers: set[str]):
+    # Subscribed once the response starts streaming, so a client that is
+    # gone before then never leaves a subscription (and its pollers) behind
+    subscription = price_hub.subscribe(tickers)
+    event_id = 0
+    try:
+        while True:
+            updates = await subscription.next(timeout=HEARTBEAT_INTERVAL)
+            if not updates:
+                yield b": keep-alive\n\n"
+                continue
+
+            for update in updates.values():
+                event_id += 1
+                yield (
+                    f"id: {event_id}\nevent: price\ndata: ".encode()
+                    + orjson.dumps(update)
+                    + b"\n\n"
+                )
+    finally:
+        price_hub.unsubscribe(subscription)
+
+
+@router.get("/stream")
+async def stream_prices(
+    api_key: Annotated[str, Depends(verfiy_api_key)],
+    response: Response,
+    tickers: str | None = Query(
+        None,
+        description="Comma-separated list of tickers to subscribe to (e.g., AAPL,GOOGL,MSFT).",
+    ),
+):
+    if not api_key["status"]:
+        return api_key
+
+    tickers = {ticker.strip().upper() for ticker in (tickers or "").split(",")}
+    tickers.discard("")
+
+    if not tickers:
+        response.status_code = status.HTTP_400_BAD_REQUEST
+        return {"status": False, "message": "No tickers provided"}
+
+    if len(tickers) > MAX_STREAM_TICKERS:
+        response.status_code = status.HTTP_400_BAD_REQUEST
+        return {
+            "status": False,
+            "message": f"Too many tickers. At most {MAX_STREAM_TICKERS} per stream",
+        }
+
+    # Server-sent events, one `price` event per changed ticker
+    return StreamingResponse(
+        price_events(tickers),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
 
 @router.get("/{ticker}")
 async def get_prices(
@@ -19,15 +84,12 @@ async def get_prices(
     if not api_key["status"]:
         return api_key
 
+    ticker = ticker.strip().upper()
     try:
-        tkr = yf.Ticker(ticker)
-        prices = {
-            "price": tkr.info.get("currentPrice", tkr.info["regularMarketPrice"]),
-            "price_change": tkr.info["regularMarketChange"],
-            "price_change_percent": tkr.info["regularMarketChangePercent"],
-            "volume": tkr.info["volume"],
-            "avg_volume": tkr.info["averageVolume"],
-        }
+        # Keyed apart from the bulk snapshots, whose missing fields are zeroed
+        prices = await price_cache.get_or_set(
+            (ticker, True), partial(fetch_price, ticker, strict=True)
+        )
     except Exception as e:
         response.status_code = status.HTTP_400_BAD_REQUEST
         return {"status": False, "message": str(e)}
@@ -56,18 +118,16 @@ async def get_prices_bulk(
 
     try:
         tickers = tickers.split(",")
-        prices = {}
-        for ticker in tickers:
-            tkr = yf.Ticker(ticker)
-            prices[ticker] = {
-                "price": tkr.info.get(
-                    "currentPrice", tkr.info.get("regularMarketPrice", 0)
-                ),
-                "price_change": tkr.info.get("regularMarketChange", 0),
-                "price_change_percent": tkr.info.get("regularMarketChangePercent", 0),
-                "volume": tkr.info.get("volume", 0),
-                "avg_volume": tkr.info.get("averageVolume", 0),
-            }
+        # Only the cache key is normalised, the response keeps the client's
+        # tickers
+        symbols = [ticker.strip().upper() for ticker in tickers]
+        snapshots = await asyncio.gather(
+            *(
+                price_cache.get_or_set((symbol, False), partial(fetch_price, symbol))
+                for symbol in symbols
+            )
+        )
+        prices = dict(zip(tickers, snapshots))
     except Exception as e:
         response.status_code = status.HTTP_400_BAD_REQUEST
         return {"status": False, "message": str(e)}
@@ -1,9 +1,10 @@
 from typing import Annotated
+from functools import partial
 
-import yfinance as yf
 from fastapi import APIRouter, Depends, Path, status, Query, Response
 
 from dependencies.user_dependency import verfiy_api_key
+from services.quote_service import fetch_quotes, quote_cache
 
 router = APIRouter()
 
@@ -32,34 +33,14 @@ async def get_quotes(
         return api_key
 
     try:
-        tkr = yf.Ticker(ticker)
-        quotes = tkr.history(
-            period=period or "1mo", interval=interval or "1d", start=start, end=end
+        quotes_arr = await quote_cache.get_or_set(
+            (ticker, period, interval, start, end),
+            partial(fetch_quotes, ticker, period, interval, start, end),
         )
     except Exception as e:
         response.status_code = status.HTTP_400_BAD_REQUEST
         return {"status": False, "message": str(e)}
 
-    quotes_dict = (
-        quotes[["Open", "Close", "High", "Low", "Volume"]]
-        .round(2)
-        .to_dict(orient="index")
-    )
-
-    quotes_arr = []
-
-    for quote in quotes_dict.items():
-        quotes_arr.append(
-            {
-                "o": quote[1]["Open"],
-                "c": quote[1]["Close"],
-                "h": quote[1]["High"],
-                "l": quote[1]["Low"],
-                "v": quote[1]["Volume"],
-                "t": int(quote[0].timestamp() * 1000),
-            }
-        )
-
     return {
         "status": True,
         "data": quotes_arr,
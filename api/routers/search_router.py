@@ -1,27 +1,33 @@
 from typing import Annotated
 from datetime import datetime
+from functools import partial
 
 from fastapi import APIRouter, Depends, Query, status, Response
+from starlette.concurrency import run_in_threadpool
 
 from models.stock_model import Stock
 from models.newsArticle_model import NewsArticle
 from models.index_model import Index
 
 from dependencies.user_dependency import verfiy_api_key
-from utils import rename_keys
+from services.search_service import (
+    expire_stale_news,
+    fan_out,
+    news_search_cache,
+    search_cache,
+    search_cache_key,
+    search_indices,
+    search_news,
+    search_stocks,
+)
+from services.typeahead_service import SEARCH_BACKEND, typeahead_index
+from utils.serializer_util import FastJSONResponse, Serializer
 
 router = APIRouter()
 
-stock_key_map = {
-    "_id": "id",
-    "companyName": "company_name",
-}
-
-news_article_key_map = {
-    "_id": "id",
-    "articleUrl": "article_url",
-    "publishedAt": "published_at",
-}
+stock_serializer = Serializer(Stock)
+index_serializer = Serializer(Index)
+news_article_serializer = Serializer(NewsArticle)
 
 
 @router.get("")
@@ -62,155 +68,99 @@ async def search(
             "message": "Please provide a search query.",
         }
 
-        # Initialize empty results
-    stocks = []
-    indices = []
-    news_articles = []
+    # Parse the news filters up front so bad dates fail before any search runs
+    from_datetime = None
+    to_datetime = None
+    if from_date:
+        try:
+            from_datetime = datetime.strptime(from_date, "%Y-%m-%d")
+        except ValueError:
+            response.status_code = status.HTTP_400_BAD_REQUEST
+            return {
+                "status": False,
+                "message": "Invalid date format. Use YYYY-MM-DD",
+            }
+
+    if to_date:
+        try:
+            to_datetime = datetime.strptime(to_date, "%Y-%m-%d")
+            to_datetime = to_datetime.replace(hour=23, minute=59, second=59)
+        except ValueError:
+            response.status_code = status.HTTP_400_BAD_REQUEST
+            return {
+                "status": False,
+                "message": "Invalid date format. Use YYYY-MM-DD",
+            }
+
+    # Repeated queries are served from the cache without touching any source
+    include_news = not type_ or type_.lower() == "news"
+    cache = news_search_cache if include_news else search_cache
+    cache_key = search_cache_key(q, type_, from_date, to_date, source)
+    if include_news:
+        await expire_stale_news()
+    cached = await cache.aget(cache_key)
+    if cached is not None:
+        return Response(
+            content=cached, media_type="application/json", headers={"X-Cache": "HIT"}
+        )
+
+    sources = {}
+    local_results = {}
+
+    search_stocks_ = (not type_ or type_.lower() == "stocks") and len(q) < 15
+    search_indices_ = (not type_ or type_.lower() == "indices") and len(q) < 15
+
+    if (search_stocks_ or search_indices_) and SEARCH_BACKEND == "local":
+        # Only the very first search waits for the index to be built
+        if typeahead_index.is_built:
+            typeahead_index.ensure_fresh()
+        else:
+            await run_in_threadpool(typeahead_index.ensure_fresh)
 
     # Search for stocks if type is not specified or type is 'stocks'
-    if (not type_ or type_.lower() == "stocks") and len(q) < 15:
-        stocks: list[dict] = Stock.objects.aggregate(
-            [
-                {
-                    "$search": {
-                        "index": "stocks",
-                        "text": {
-                            "query": q,
-                            "path": [
-                                "ticker",
-                                "companyName",
-                            ],
-                        },
-                    }
-                },
-                {"$limit": 5},
-                {
-                    "$project": {
-                        "_id": 1,
-                        "ticker": 1,
-                        "companyName": 1,
-                        "market": 1,
-                    }
-                },
-            ]
-        ).to_list()
+    if search_stocks_:
+        if SEARCH_BACKEND == "local":
+            local_results["stocks"] = typeahead_index.search(q, market="stocks")
+        else:
+            sources["stocks"] = partial(search_stocks, q)
 
     # Search for indices if type is not specified or type is 'indices'
-    if (not type_ or type_.lower() == "indices") and len(q) < 15:
-        indices: list[dict] = Index.objects.aggregate(
-            [
-                {
-                    "$search": {
-                        "index": "indices",
-                        "text": {
-                            "query": q,
-                            "path": [
-                                "ticker",
-                                "name",
-                            ],
-                        },
-                    }
-                },
-                {"$limit": 5},
-                {
-                    "$project": {
-                        "_id": 1,
-                        "ticker": 1,
-                        "name": 1,
-                        "market": 1,
-                    }
-                },
-            ]
-        ).to_list()
+    if search_indices_:
+        if SEARCH_BACKEND == "local":
+            local_results["indices"] = typeahead_index.search(q, market="indices")
+        else:
+            sources["indices"] = partial(search_indices, q)
 
     # Search for news if type is not specified or type is 'news'
-    if not type_ or type_.lower() == "news":
-        # Prepare aggregation pipeline for news search
-        news_pipeline = [
-            {
-                "$search": {
-                    "index": "news_articles",
-                    "text": {
-                        "query": q,
-                        "path": "title",
-                    },
-                }
-            },
-            {"$limit": 5},
-            {
-                "$project": {
-                    "_id": 1,
-                    "title": 1,
-                    "articleUrl": 1,
-                    "publishedAt": 1,
-                    "publisher.name": 1,
-                }
+    if include_news:
+        sources["news"] = partial(
+            search_news,
+            q,
+            from_datetime=from_datetime,
+            to_datetime=to_datetime,
+            publisher=source,
+        )
+
+    # Run the searches concurrently, slow sources are dropped from the result
+    results, incomplete = await fan_out(sources)
+    results.update(local_results)
+
+    search_response = FastJSONResponse(
+        {
+            "status": True,
+            "data": {
+                "stocks": stock_serializer.many(results.get("stocks", [])),
+                "indices": index_serializer.many(results.get("indices", [])),
+                "news": news_article_serializer.many(results.get("news", [])),
             },
-        ]
-
-        # Add date filters for news articles if provided
-        date_match = {}
-        if from_date:
-            try:
-                from_datetime = datetime.strptime(from_date, "%Y-%m-%d")
-                date_match["publishedAt"] = {"$gte": from_datetime}
-            except ValueError:
-                response.status_code = status.HTTP_400_BAD_REQUEST
-                return {
-                    "status": False,
-                    "message": "Invalid date format. Use YYYY-MM-DD",
-                }
-
-        if to_date:
-            try:
-                to_datetime = datetime.strptime(to_date, "%Y-%m-%d")
-                to_datetime = to_datetime.replace(hour=23, minute=59, second=59)
-                if "publishedAt" in date_match:
-                    date_match["publishedAt"]["$lte"] = to_datetime
-                else:
-                    date_match["publishedAt"] = {"$lte": to_datetime}
-            except ValueError:
-                response.status_code = status.HTTP_400_BAD_REQUEST
-                return {
-                    "status": False,
-                    "message": "Invalid date format. Use YYYY-MM-DD",
-                }
-
-        # Add source filter for news articles if provided
-        if source:
-            if date_match:
-                date_match["publisher.name"] = source
-            else:
-                date_match = {"publisher.name": source}
-
-        # Add match stage to pipeline if we have date or source filters
-        if date_match:
-            news_pipeline.insert(1, {"$match": date_match})
-
-        # Execute the news search
-        news_articles: list[dict] = NewsArticle.objects.aggregate(
-            news_pipeline
-        ).to_list()
-
-    if stocks:
-        for stock in stocks:
-            stock["_id"] = str(stock["_id"])
-        stocks = rename_keys(stocks, stock_key_map)
-
-    if indices:
-        for index in indices:
-            index["_id"] = str(index["_id"])
-        indices = rename_keys(indices, {"_id": "id"})
-
-    for article in news_articles:
-        article["_id"] = str(article["_id"])
-    news_articles = rename_keys(news_articles, news_article_key_map)
-
-    return {
-        "status": True,
-        "data": {
-            "stocks": stocks,
-            "indices": indices,
-            "news": news_articles,
+            "partial": bool(incomplete),
+            "incomplete_sources": incomplete,
         },
-    }
+        headers={"X-Cache": "MISS"},
+    )
+
+    # Partial results are never cached so a slow source gets another chance
+    if not incomplete:
+        await cache.aset(cache_key, search_response.body)
+
+    return search_response
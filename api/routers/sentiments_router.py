@@ -1,9 +1,19 @@
 from typing import Annotated
 from datetime import datetime, timedelta
-from fastapi import APIRouter, Depends, Query, Path, Response, status
+from fastapi import APIRouter, Depends, Query, Path, Request, Response, status
 from models.stock_model import Stock
 from models.newsArticle_model import NewsArticle
 from dependencies.user_dependency import verfiy_api_key
+from services.read_service import count_raw, find_one_raw, find_raw
+from utils.http_cache_util import (
+    SENTIMENT_MAX_AGE,
+    cache_control,
+    cache_headers,
+    is_not_modified,
+    make_etag,
+    not_modified,
+)
+from utils.serializer_util import FastJSONResponse
 
 router = APIRouter()
 
@@ -11,6 +21,7 @@ router = APIRouter()
 @router.get("/trend/{ticker}")
 async def get_sentiment_trend(
     api_key: Annotated[str, Depends(verfiy_api_key)],
+    request: Request,
     response: Response,
     ticker: Annotated[
         str,
@@ -37,7 +48,7 @@ async def get_sentiment_trend(
         return api_key
 
     # Verify stock exists
-    if not Stock.objects(ticker=ticker).first():
+    if not find_one_raw(Stock, {"ticker": ticker}, {"_id": 1}):
         response.status_code = status.HTTP_404_NOT_FOUND
         return {
             "status": False,
@@ -69,42 +80,68 @@ async def get_sentiment_trend(
                 "message": "end_date must be after start_date",
             }
 
-        query = NewsArticle.objects(tickers=ticker)
+        query = {"tickers": ticker}
 
         if start_date:
-            query = query.filter(published_at__gte=start_date)
+            query.setdefault("publishedAt", {})["$gte"] = start_date
         if end_date:
-            query = query.filter(published_at__lte=end_date)
-
-        news_articles = query.order_by("published_at")
+            query.setdefault("publishedAt", {})["$lte"] = end_date
+
+        # The rollup changes when an article is added, removed or edited
+        # (e.g. its insights rescored), which moves the count, the newest
+        # `_id` or the latest `updatedAt`. Checking those is three lookups
+        # instead of a scan over every article.
+        latest = find_one_raw(NewsArticle, query, {"_id": 1}, sort=[("_id", -1)])
+        updated = find_one_raw(
+            NewsArticle, query, {"updatedAt": 1}, sort=[("updatedAt", -1)]
+        )
+        etag = make_etag(
+            interval,
+            count_raw(NewsArticle, query),
+            latest["_id"] if latest else None,
+            updated.get("updatedAt") if updated else None,
+        )
+        cache_control_ = cache_control(SENTIMENT_MAX_AGE)
+        if is_not_modified(request, etag):
+            return not_modified(etag, cache_control_)
+
+        news_articles = find_raw(
+            NewsArticle,
+            query,
+            projection={"_id": 0, "publishedAt": 1, "insights": 1},
+            sort=[("publishedAt", 1)],
+        )
 
         trend_data = {}
 
         for article in news_articles:
             relevant_insights = [
-                insight for insight in article.insights if insight.ticker == ticker
+                insight
+                for insight in article.get("insights", [])
+                if insight.get("ticker") == ticker
             ]
 
             if not relevant_insights:
                 continue
 
+            published_at = article["publishedAt"]
+
             date_key = None
             if interval == "1d":
-                date_key = article.published_at.strftime("%Y-%m-%d")
+                date_key = published_at.strftime("%Y-%m-%d")
             elif interval == "1wk":
                 date_key = (
-                    article.published_at
-                    - timedelta(days=article.published_at.weekday())
+                    published_at - timedelta(days=published_at.weekday())
                 ).strftime("%Y-%m-%d")
             else:  # 1mo
-                date_key = article.published_at.strftime("%Y-%m")
+                date_key = published_at.strftime("%Y-%m")
 
             if date_key not in trend_data:
                 trend_data[date_key] = {"count": 0, "sentiment_sum": 0.0}
 
             for insight in relevant_insights:
                 trend_data[date_key]["count"] += 1
-                trend_data[date_key]["sentiment_sum"] += insight.sentiment_score
+                trend_data[date_key]["sentiment_sum"] += insight["sentimentScore"]
 
         formatted_data = []
         for date, data in sorted(trend_data.items()):
@@ -113,7 +150,10 @@ async def get_sentiment_trend(
             )
             formatted_data.append({"s": round(avg_sentiment, 3), "t": date})
 
-        return {"status": True, "data": formatted_data}
+        return FastJSONResponse(
+            {"status": True, "data": formatted_data},
+            headers=cache_headers(etag, cache_control_),
+        )
 
     except ValueError as e:
         response.status_code = status.HTTP_400_BAD_REQUEST
@@ -1,31 +1,74 @@
+import os
 from typing import Annotated, Optional
+from functools import partial
 
-from fastapi import APIRouter, Depends, Response, status, Path, Query
+from fastapi import APIRouter, Depends, Request, Response, status, Path, Query
 
 from dependencies.user_dependency import verfiy_api_key
 from models.stock_model import Stock
 from models.index_model import Index
 
-from utils import rename_keys
+from services.cache_service import TieredCache
+from services.read_service import db_field_name, find_one_raw, find_raw
+from utils.http_cache_util import (
+    TICKER_MAX_AGE,
+    cache_control,
+    cache_headers,
+    is_not_modified,
+    make_etag,
+    not_modified,
+)
+from utils.serializer_util import FastJSONResponse, Serializer
 
 router = APIRouter()
 
-key_map = {
-    "_id": "id",
-    "companyName": "company_name",
-    "logoUrl": "logo_url",
-    "zipCode": "zip_code",
+# Company officer keys come straight from yfinance in camelCase
+officer_key_map = {
     "yearBorn": "year_born",
     "maxAge": "max_age",
     "exercisedValue": "exercised_value",
     "unexercisedValue": "unexercised_value",
-    "marketCap": "market_cap",
-    "companyOfficers": "company_officers",
-    "exchangeName": "exchange_name",
-    "createdAt": "created_at",
-    "updatedAt": "updated_at",
 }
 
+stock_serializer = Serializer(
+    Stock,
+    rename=officer_key_map,
+    exclude={"created_at", "updated_at"},
+)
+index_serializer = Serializer(
+    Index,
+    exclude={"created_at", "updated_at"},
+)
+ticker_projection = {"createdAt": 0, "updatedAt": 0}
+# Profiles keep `updatedAt` for the ETag, the serializers drop it
+ticker_profile_projection = {"createdAt": 0}
+
+# Serialised profiles with their ETag, shared by every worker
+profile_cache = TieredCache(
+    namespace="tickers",
+    ttl=float(os.getenv("TICKER_CACHE_TTL") or 300),
+)
+# Unknown tickers are remembered briefly, so a ticker that is added shows up
+TICKER_NOT_FOUND_TTL = float(os.getenv("TICKER_NOT_FOUND_TTL") or 10)
+
+
+def load_profile(tkr: str) -> dict | None:
+    serializer = stock_serializer
+    ticker = find_one_raw(Stock, {"ticker": tkr}, ticker_profile_projection)
+
+    if not ticker:
+        serializer = index_serializer
+        ticker = find_one_raw(Index, {"ticker": tkr}, ticker_profile_projection)
+
+    if not ticker:
+        return None
+
+    # Profiles change at most once per scraper run
+    return {
+        "etag": make_etag(ticker["_id"], ticker.get("updatedAt")),
+        "data": serializer(ticker),
+    }
+
 
 @router.get("")
 async def get_tickers(
@@ -43,15 +86,32 @@ async def get_tickers(
     if not api_key["status"]:
         return api_key
 
-    tickers = []
+    sources = []
+    if market != "indices":
+        sources.append((Stock, stock_serializer))
+    if market != "stocks":
+        sources.append((Index, index_serializer))
 
-    # Fetch all data based on market filter
-    if market == "stocks":
-        tickers = list(Stock.objects.all())
-    elif market == "indices":
-        tickers = list(Index.objects.all())
-    else:
-        tickers = list(Stock.objects.all()) + list(Index.objects.all())
+    # Tickers are sorted in memory, by a top level field of every market listed
+    sort_keys: dict[int, str] = {}
+    if sort_by:
+        try:
+            for source, (model, _) in enumerate(sources):
+                sort_keys[source] = db_field_name(model, sort_by)
+                if "." in sort_keys[source]:
+                    raise ValueError(f"Nested field: {sort_by}")
+        except ValueError:
+            response.status_code = status.HTTP_400_BAD_REQUEST
+            return {"status": False, "message": f"Cannot sort by {sort_by}"}
+
+    # Only load the ids (and sort key) of every ticker, full documents are
+    # fetched for the requested page only
+    tickers: list[tuple[int, dict]] = []
+    for source, (model, _) in enumerate(sources):
+        key_projection = {"_id": 1}
+        if sort_by:
+            key_projection[sort_keys[source]] = 1
+        tickers += [(source, doc) for doc in find_raw(model, projection=key_projection)]
 
     total_count = len(tickers)
 
@@ -60,7 +120,7 @@ async def get_tickers(
         reverse = order.lower() == "desc"
         tickers = sorted(
             tickers,
-            key=lambda x: x.to_mongo().to_dict().get(sort_by, 0),
+            key=lambda x: x[1].get(sort_keys[x[0]], 0),
             reverse=reverse,
         )
 
@@ -75,33 +135,45 @@ async def get_tickers(
         response.status_code = status.HTTP_400_BAD_REQUEST
         return {"status": False, "message": "Page number exceeds total pages"}
 
-    # Clean and transform
-    processed_tickers = []
-    for doc in paginated_tickers:
-        doc = doc.to_mongo().to_dict()
-        doc["_id"] = str(doc["_id"])
-        processed_doc = rename_keys(doc, key_map)
-        processed_doc.pop("created_at", None)
-        processed_doc.pop("updated_at", None)
-        processed_tickers.append(processed_doc)
+    # Load the page and keep the sorted order
+    docs = {}
+    for source, (model, _) in enumerate(sources):
+        ids = [
+            doc["_id"] for doc_source, doc in paginated_tickers if doc_source == source
+        ]
+        if ids:
+            for doc in find_raw(
+                model, {"_id": {"$in": ids}}, projection=ticker_projection
+            ):
+                docs[(source, doc["_id"])] = doc
 
-    return {
-        "status": True,
-        "data": processed_tickers,
-        "pagination": {
-            "count": len(processed_tickers),
-            "total": total_count,
-            "page": page,
-            "total_pages": total_pages,
-            "has_next": page < total_pages,
-            "has_prev": page > 1,
-        },
-    }
+    # Clean and transform
+    processed_tickers = [
+        sources[source][1](docs[(source, doc["_id"])])
+        for source, doc in paginated_tickers
+        if (source, doc["_id"]) in docs
+    ]
+
+    return FastJSONResponse(
+        {
+            "status": True,
+            "data": processed_tickers,
+            "pagination": {
+                "count": len(processed_tickers),
+                "total": total_count,
+                "page": page,
+                "total_pages": total_pages,
+                "has_next": page < total_pages,
+                "has_prev": page > 1,
+            },
+        }
+    )
 
 
 @router.get("/{ticker}")
 async def get_ticker(
     api_key: Annotated[dict, Depends(verfiy_api_key)],
+    request: Request,
     response: Response,
     tkr: Annotated[
         str, Path(alias="ticker", title="Ticker", description="Ticker of the stock")
@@ -111,25 +183,26 @@ async def get_ticker(
     if not api_key["status"]:
         return api_key
 
-    ticker = Stock.objects(ticker=tkr).first()
-
-    if not ticker:
-        ticker = Index.objects(ticker=tkr).first()
+    profile = await profile_cache.get_or_set(
+        tkr, partial(load_profile, tkr), none_ttl=TICKER_NOT_FOUND_TTL
+    )
 
-    if not ticker:
+    if not profile:
         response.status_code = status.HTTP_404_NOT_FOUND
         return {
             "status": False,
             "message": "Ticker not found",
         }
 
-    ticker: dict = ticker.to_mongo().to_dict()
-    ticker["_id"] = str(ticker["_id"])
-    ticker = rename_keys(ticker, key_map)
-    ticker.pop("created_at", None)
-    ticker.pop("updated_at", None)
+    etag = profile["etag"]
+    cache_control_ = cache_control(TICKER_MAX_AGE)
+    if is_not_modified(request, etag):
+        return not_modified(etag, cache_control_)
 
-    return {
-        "status": True,
-        "data": ticker,
-    }
+    return FastJSONResponse(
+        {
+            "status": True,
+            "data": profile["data"],
+        },
+        headers=cache_headers(etag, cache_control_),
+    )
@@ -7,6 +7,7 @@ from models.user_model import User
 from dependencies.auth_dependency import protect_route
 from dependencies.user_dependency import verfiy_api_key
 from services.user_service import get_api_key
+from services.token_cache_service import token_cache
 
 router = APIRouter()
 
@@ -29,6 +30,7 @@ async def generate_api_key(
     user = User.objects(email=email).first()
     user.api_key = api_key
     user.save()
+    token_cache.invalidate_user(email)
 
     response.status_code = status.HTTP_200_OK
 
@@ -48,6 +50,7 @@ async def delete_api_key(
     user = User.objects(email=email).first()
     user.api_key = ""
     user.save()
+    token_cache.invalidate_user(email)
 
     response.status_code = status.HTTP_200_OK
     return {
@@ -3,7 +3,7 @@ import os
 import sys
 import time
 import logging
-from typing import List, Dict
+from typing import List, Dict, Iterator
 
 # pip modules
 from selenium import webdriver
@@ -54,50 +54,79 @@ class GoogleNews:
         self._driver = setup_driver(headless=True)
 
     def topic(self, topic: str) -> List[Dict]:
+        return list(self.iter_topic(topic))
+
+    def iter_topic(self, topic: str, with_content: bool = True) -> Iterator[Dict]:
+        """Yield the articles of a topic one by one, as they are scraped.
+
+        Nothing is kept once an article is yielded, so memory doesn't grow
+        with the page and the consumer can work while the next article is
+        scraped. The driver quits once the generator is exhausted or closed.
+
+        Args:
+            topic (str): Topic name, e.g. "business"
+            with_content (bool, optional): Fetch each article's content
+                before yielding it. Without it, articles hold their metadata
+                only and the caller fetches with `fetch_content`, e.g. on
+                several threads. Defaults to True.
+
+        Yields:
+            Dict: Article metadata, with `content` and `image_url` when
+                `with_content` is set.
+        """
         topic_id = get_topic_id(topic=topic)
         url = topic_url(topic_id=topic_id, lang=self._lang, country=self._country)
         logger.info(f"Navigating to URL: {url}")
 
-        self._driver.get(url)
-        self._driver.implicitly_wait(10)
+        try:
+            self._driver.get(url)
+            self._driver.implicitly_wait(10)
 
-        article_elements = self._find_article_elements()
-        logger.info(f"Found {len(article_elements)} article elements")
+            article_elements = self._find_article_elements()
+            logger.info(f"Found {len(article_elements)} article elements")
 
-        articles = []
-        count = 0
+            for count, article_element in enumerate(article_elements):
+                try:
+                    logger.info(f"Processing article {count+1}/{len(article_elements)}")
+                    article_data = self._extract_article_metadata(
+                        article_element, type="topic"
+                    )
+                    logger.info(
+                        f"Extracted metadata for article: {article_data['title']}"
+                    )
+                except Exception as e:
+                    logger.error(f"Error processing article: {str(e)}")
+                    continue
 
-        for article_element in article_elements:
-            if count >= len(article_elements):
-                break
+                if not with_content:
+                    yield article_data
+                elif self.fetch_content(article_data):
+                    logger.info(f"Successfully added article: {article_data['title']}")
+                    yield article_data
+        finally:
+            self._driver.quit()
 
-            try:
-                logger.info(f"Processing article {count+1}/{len(article_elements)}")
-                article_data = self._extract_article_metadata(
-                    article_element, type="topic"
-                )
-                logger.info(f"Extracted metadata for article: {article_data['title']}")
+    def fetch_content(self, article_data: Dict) -> bool:
+        """Add the content and image of an article to its metadata.
 
-                logger.info(f"Fetching content from: {article_data['article_url']}")
-                article_content = self._extract_article_content(
-                    article_data["article_url"]
-                )
+        Only network and parsing are involved, not the driver, so several
+        articles can be fetched at once from different threads.
 
-                if article_content:
-                    article_data.update(article_content)
-                    articles.append(article_data)
-                    logger.info(f"Successfully added article: {article_data['title']}")
-                else:
-                    logger.warning(
-                        f"Failed to scrape article content: {article_data['title']}"
-                    )
-            except Exception as e:
-                logger.error(f"Error processing article: {str(e)}")
-            count += 1
+        Args:
+            article_data (Dict): Article metadata, updated in place
 
-        self._driver.quit()
+        Returns:
+            bool: Whether the content was fetched
+        """
+        logger.info(f"Fetching content from: {article_data['article_url']}")
+        article_content = self._extract_article_content(article_data["article_url"])
 
-        return articles
+        if not article_content:
+            logger.warning(f"Failed to scrape article content: {article_data['title']}")
+            return False
+
+        article_data.update(article_content)
+        return True
 
     def search(self, query: str) -> List[Dict]:
         """Search for articles based on a query string."""
@@ -68,7 +68,8 @@ indices_symbols = [
 
 
 def scrape_indices():
-    connect_db()
+    if not connect_db():
+        sys.exit(1)
 
     logger.info("=" * 50)
     logger.info("Starting Indices Scraper")
@@ -4,6 +4,12 @@ import sys
 import time
 import logging
 import schedule
+from datetime import datetime, timedelta
+
+# pip modules
+from bson import ObjectId
+from mongoengine import ValidationError
+from pymongo.errors import BulkWriteError
 
 
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
@@ -11,12 +17,30 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".
 # custom modules
 from google_news import GoogleNews
 from models.newsArticle_model import NewsArticle
+from models.newsFingerprint_model import NewsFingerprint
 from configs.db import connect_db
 from utils.logger_util import logger
+from services.news_search_service import get_news_search_backend
+from services.read_service import get_collection
+
+from pipelines.parallelism import split_cores, limit_blas_threads, configure_process
+
+# Thread pools read their size when numpy and torch load, so set it first
+NLP_BUDGET, INFERENCE_BUDGET = split_cores()
+limit_blas_threads(NLP_BUDGET.threads)
 
 from pipelines.summarization import Summarizer
 from pipelines.ticker_validation import TickerValidator
+from pipelines.inference_cache import InferenceCache
+from pipelines.near_duplicates import (
+    MinHasher,
+    NearDuplicateIndex,
+    signature_from_bytes,
+    signature_to_bytes,
+)
 from pipelines.prediction import Prediction
+from pipelines.runner import Stage, StagedRunner
+from pipelines.tracing import Tracer
 
 LOG_SCRAPER_FILE = os.path.join(os.getcwd(), r"api\logs\news_scraper.log")
 
@@ -26,9 +50,306 @@ file_handler.setFormatter(
 )
 logger.addHandler(file_handler)
 
+# Articles whose content is downloaded at once, while Selenium scrapes the next
+NEWS_FETCH_WORKERS = int(os.getenv("NEWS_FETCH_WORKERS") or 4)
+# Articles saved per bulk insert, and seconds a partial batch waits for more
+NEWS_WRITE_BATCH_SIZE = int(os.getenv("NEWS_WRITE_BATCH_SIZE") or 16)
+NEWS_WRITE_BATCH_WAIT = float(os.getenv("NEWS_WRITE_BATCH_WAIT") or 10)
+
+
+def load_near_duplicate_index():
+    """Index the fingerprints of the articles saved within the dedup window."""
+    index = NearDuplicateIndex()
+    since = datetime.now() - timedelta(seconds=index.window)
+    for fingerprint in NewsFingerprint.objects(created_at__gte=since):
+        index.add(
+            fingerprint.article_url,
+            signature_from_bytes(fingerprint.minhash),
+            fingerprint.created_at.timestamp(),
+        )
+    return index
+
+
+def fetch_article(article, gn, tracer):
+    """Download the content of an article that isn't saved yet."""
+    trace = tracer.begin(article["article_url"])
+    with tracer.resume(trace):
+        with tracer.span("dedup_check"):
+            if NewsArticle.objects(article_url=article["article_url"]).first():
+                tracer.count("skipped_existing")
+                tracer.end(trace)
+                return None
+
+        with tracer.span("fetch"):
+            fetched = gn.fetch_content(article)
+
+    if not fetched:
+        tracer.count("fetch_failed")
+        tracer.end(trace)
+        return None
+    return {"article": article, "trace": trace}
+
+
+def find_near_duplicate(item, hasher, duplicates, tracer):
+    """Mark near-duplicates of a recent article, which reuse its enrichment."""
+    article = item["article"]
+    with tracer.resume(item["trace"]):
+        with tracer.span("fingerprint"):
+            signature = hasher.signature(article["content"])
+            match = duplicates.query(signature) if signature is not None else None
+            if signature is not None and match is None:
+                # Copies later in the run match it before it is even saved
+                duplicates.add(article["article_url"], signature)
+
+    if match:
+        tracer.count("near_duplicates")
+        canonical_url, similarity = match
+        logger.info(
+            f"{article['title']} is a near-duplicate ({similarity:.0%}) "
+            f"of {canonical_url}"
+        )
+        item["canonical_url"] = canonical_url
+    else:
+        item["signature"] = signature
+    return item
+
+
+def summarize_article(item, summarizer, tracer):
+    if "canonical_url" in item:
+        return item
+
+    with tracer.resume(item["trace"]):
+        with tracer.span("summarize"):
+            item["summary_sentences"] = summarizer.summarize(item["article"]["content"])
+    tracer.count("sentences", len(item["summary_sentences"]))
+    return item
+
+
+def find_tickers(item, validator, tracer):
+    """Find the tickers the summary sentences of an article name."""
+    if "canonical_url" in item:
+        return item
+
+    # Spans for the parse and matching stages are recorded by the validator
+    with tracer.resume(item["trace"]):
+        ticker_infos = validator.validate_many(
+            item["summary_sentences"], n_process=NLP_BUDGET.spacy_processes
+        )
+
+    ticker_sentences = []
+    for sentence, ticker_info in zip(item["summary_sentences"], ticker_infos):
+        if ticker_info.get("validated_companies"):
+            if len(ticker_info["validated_companies"]):
+                ticker_sentences.append(
+                    {
+                        "sentence": sentence,
+                        "ticker": ticker_info["validated_companies"][0]["ticker"],
+                    }
+                )
+
+    item["ticker_sentences"] = ticker_sentences
+    return item
+
+
+def score_sentences(ticker_sentences, prediction, tracer):
+    tickers = []
+    insights = []
+
+    for ticker_sentence in ticker_sentences:
+        tickers.append(ticker_sentence["ticker"])
+        with tracer.span("inference"):
+            sentiment_info = prediction.predict(ticker_sentence["sentence"])
+        sentiment = sentiment_info["sentiment"]
+        sentiment_reasoning = ticker_sentence["sentence"]
+        sentiment_score = sentiment_info["score"]
+        insights.append(
+            {
+                "ticker": ticker_sentence["ticker"],
+                "sentiment": sentiment,
+                "sentiment_reasoning": sentiment_reasoning,
+                "sentiment_score": sentiment_score,
+            }
+        )
+
+    return tickers, insights
+
+
+def reuse_enrichment(canonical_url, enriched):
+    """Tickers and insights of an article, for its near-duplicates.
+
+    Articles enriched in this run may still be waiting for their batch to
+    be written, so they are looked up in `enriched` before the database.
+    """
+    canonical = enriched.get(canonical_url) or NewsArticle.objects(
+        article_url=canonical_url
+    ).first()
+    if canonical is None:
+        # Its enrichment failed, so the copy is retried on the next run
+        raise LookupError(f"Canonical article {canonical_url} was not saved")
+
+    insights = [
+        {
+            "ticker": insight.ticker,
+            "sentiment": insight.sentiment,
+            "sentiment_reasoning": insight.sentiment_reasoning,
+            "sentiment_score": insight.sentiment_score,
+        }
+        for insight in canonical.insights
+    ]
+    return canonical, list(canonical.tickers), insights
+
+
+def score_article(item, prediction, enriched, tracer):
+    """Score the ticker sentences of an article and build its document."""
+    article = item["article"]
+    duplicate_of = None
+
+    with tracer.resume(item["trace"]):
+        if "canonical_url" in item:
+            with tracer.span("reuse"):
+                canonical, tickers, insights = reuse_enrichment(
+                    item["canonical_url"], enriched
+                )
+            duplicate_of = str(canonical.id)
+            item["summary_sentences"] = [
+                insight["sentiment_reasoning"] for insight in insights
+            ]
+        else:
+            tickers, insights = score_sentences(
+                item["ticker_sentences"], prediction, tracer
+            )
+    tracer.count("insights", len(insights))
+
+    item["news_article"] = NewsArticle(
+        # Set now so near-duplicates can link to it before it is written
+        id=ObjectId(),
+        title=article["title"],
+        description="",
+        article_url=article["article_url"],
+        image_url=article["image_url"],
+        authors=article["authors"],
+        published_at=article["published_at"],
+        publisher={
+            "name": article["publisher"]["name"],
+            "homepage_url": article["publisher"]["homepage_url"],
+            "logo_url": article["publisher"]["logo_url"],
+        },
+        tickers=tickers,
+        insights=insights,
+        duplicate_of=duplicate_of,
+    )
+    if duplicate_of is None:
+        enriched[article["article_url"]] = item["news_article"]
+    return item
+
+
+def insert_documents(documents: list) -> set[int]:
+    """Insert documents of one model unordered, so a failed one doesn't stop
+    the rest of the batch.
+
+    Returns:
+        set: Positions of the documents that were not saved
+    """
+    failed = set()
+    raws, positions = [], []
+    for position, document in enumerate(documents):
+        try:
+            document.validate()
+        except ValidationError as e:
+            logger.error(f"Invalid {type(document).__name__}: {e}")
+            failed.add(position)
+            continue
+        raws.append(document.to_mongo())
+        positions.append(position)
+
+    if raws:
+        try:
+            get_collection(type(documents[0])).insert_many(raws, ordered=False)
+        except BulkWriteError as e:
+            for error in e.details["writeErrors"]:
+                logger.error(f"Failed to save {type(documents[0]).__name__}: {error}")
+                failed.add(positions[error["index"]])
+    return failed
+
+
+def write_articles(items, news_search, duplicates, enriched, tracer):
+    """Save a batch of articles with their fingerprints and index them."""
+    originals = [item for item in items if item["news_article"].duplicate_of is None]
+
+    with tracer.span("save"):
+        failed = insert_documents([item["news_article"] for item in originals])
+        failed_ids = set()
+        for position in failed:
+            article_url = originals[position]["article"]["article_url"]
+            failed_ids.add(str(originals[position]["news_article"].id))
+            # Copies still to come are enriched on their own instead
+            duplicates.remove(article_url)
+            enriched.pop(article_url, None)
+
+        # Copies of an original that failed would link to nothing, they are
+        # retried on the next run
+        copies = [
+            item
+            for item in items
+            if item["news_article"].duplicate_of is not None
+            and item["news_article"].duplicate_of not in failed_ids
+        ]
+        failed_copies = insert_documents([item["news_article"] for item in copies])
+
+        saved_ids = {
+            item["news_article"].id
+            for position, item in enumerate(originals)
+            if position not in failed
+        } | {
+            item["news_article"].id
+            for position, item in enumerate(copies)
+            if position not in failed_copies
+        }
+
+        # Only originals are fingerprinted, so copies link to the original
+        insert_documents(
+            [
+                NewsFingerprint(
+                    article_url=item["article"]["article_url"],
+                    minhash=signature_to_bytes(item["signature"]),
+                )
+                for item in originals
+                if item.get("signature") is not None
+                and item["news_article"].id in saved_ids
+            ]
+        )
+
+    saved = [item for item in items if item["news_article"].id in saved_ids]
+    tracer.count("saved", len(saved))
+    tracer.count("save_failed", len(items) - len(saved))
+
+    for item in items:
+        news_article = item["news_article"]
+        if news_article.id not in saved_ids:
+            logger.error(f"Failed to save {news_article.title} news article")
+            tracer.end(item["trace"])
+            continue
+
+        # Near-duplicates find it in the database from now on
+        enriched.pop(news_article.article_url, None)
+        logger.info(f"Saved {news_article.title} news article")
+
+        with tracer.resume(item["trace"]):
+            try:
+                with tracer.span("index"):
+                    news_search.add(
+                        news_article.to_mongo().to_dict(), item["summary_sentences"]
+                    )
+            except Exception as e:
+                logger.error(f"Failed to index {news_article.title} for search: {e}")
+        tracer.end(item["trace"])
+
+    return saved
+
 
 def scrape_news():
-    connect_db()
+    if not connect_db():
+        sys.exit(1)
 
     logger.info("=" * 50)
     logger.info("Starting Google News Scraper")
@@ -37,77 +358,92 @@ def scrape_news():
     topic = "business"
     logger.info("Running example search for topic: '%s'", topic)
 
-    start_time = time.time()
-    gn = GoogleNews()
-    results = gn.topic(topic=topic)
+    model_path = "abdallahjoudeh/finoxa-model"
 
-    elapsed_time = time.time() - start_time
+    configure_process(NLP_BUDGET, INFERENCE_BUDGET)
+    logger.info("Core budgets: %s; %s", NLP_BUDGET, INFERENCE_BUDGET)
 
-    logger.info("Scrape completed in %.2f seconds", elapsed_time)
+    summarizer = Summarizer()
+    validator = TickerValidator()
+    prediction = Prediction(model_path, cache=InferenceCache())
+    logger.info("Sentiment model backend: %s", prediction.backend)
+    news_search = get_news_search_backend()
 
-    logger.info("Found %d articles about '%s':", len(results), topic)
+    hasher = MinHasher()
+    duplicates = load_near_duplicate_index()
+    logger.info("Near-duplicate index: %d recent articles", len(duplicates))
 
-    model_path = "abdallahjoudeh/finoxa-model"
+    # Documents built this run, by url, until their batch is written
+    enriched = {}
 
-    summarizer = Summarizer()
-    validator = TickerValidator()
-    prediction = Prediction(model_path)
+    start_time = time.time()
+    gn = GoogleNews()
+    tracer = Tracer()
 
-    for article in results:
-        if NewsArticle.objects(article_url=article["article_url"]).first():
-            continue
+    # Selenium scrapes the topic page while articles are downloaded and go
+    # through the NLP stages, so the network and the CPU work at once. The
+    # runner's bounded queues pause scraping when the NLP stages fall behind.
+    runner = StagedRunner(
+        [
+            Stage(
+                "fetch",
+                lambda article: fetch_article(article, gn, tracer),
+                workers=NEWS_FETCH_WORKERS,
+            ),
+            Stage(
+                "dedup",
+                lambda item: find_near_duplicate(item, hasher, duplicates, tracer),
+                budget=NLP_BUDGET,
+            ),
+            Stage(
+                "summarize",
+                lambda item: summarize_article(item, summarizer, tracer),
+                budget=NLP_BUDGET,
+            ),
+            Stage(
+                "ner",
+                lambda item: find_tickers(item, validator, tracer),
+                budget=NLP_BUDGET,
+            ),
+            Stage(
+                "infer",
+                lambda item: score_article(item, prediction, enriched, tracer),
+                budget=INFERENCE_BUDGET,
+                setup=INFERENCE_BUDGET.apply_torch_threads,
+            ),
+            Stage(
+                "write",
+                lambda items: write_articles(
+                    items, news_search, duplicates, enriched, tracer
+                ),
+                batch_size=NEWS_WRITE_BATCH_SIZE,
+                batch_wait=NEWS_WRITE_BATCH_WAIT,
+            ),
+        ]
+    )
+    with tracer.activate():
+        runner.run(gn.iter_topic(topic=topic, with_content=False))
 
-        summary_sentences = summarizer.summarize(article["content"])
-        ticker_sentences = []
-
-        tickers = []
-        insights = []
-
-        for sentence in summary_sentences:
-            ticker_info = validator.validate(sentence)
-            if ticker_info.get("validated_companies"):
-                if len(ticker_info["validated_companies"]):
-                    ticker_sentences.append(
-                        {
-                            "sentence": sentence,
-                            "ticker": ticker_info["validated_companies"][0]["ticker"],
-                        }
-                    )
+    logger.info("Scrape completed in %.2f seconds", time.time() - start_time)
 
-        for ticker_sentence in ticker_sentences:
-            tickers.append(ticker_sentence["ticker"])
-            sentiment_info = prediction.predict(ticker_sentence["sentence"])
-            sentiment = sentiment_info["sentiment"]
-            sentiment_reasoning = ticker_sentence["sentence"]
-            sentiment_score = sentiment_info["score"]
-            insights.append(
-                {
-                    "ticker": ticker_sentence["ticker"],
-                    "sentiment": sentiment,
-                    "sentiment_reasoning": sentiment_reasoning,
-                    "sentiment_score": sentiment_score,
-                }
+    for stage, item, error in runner.errors:
+        # The write stage receives batches, the others single articles
+        for failed in item if isinstance(item, list) else [item]:
+            article = failed.get("article", failed) if isinstance(failed, dict) else {}
+            logger.error(
+                f"Pipeline stage {stage} failed for {article.get('title')}: {error}"
             )
 
-        news_article = NewsArticle(
-            title=article["title"],
-            description="",
-            article_url=article["article_url"],
-            image_url=article["image_url"],
-            authors=article["authors"],
-            published_at=article["published_at"],
-            publisher={
-                "name": article["publisher"]["name"],
-                "homepage_url": article["publisher"]["homepage_url"],
-                "logo_url": article["publisher"]["logo_url"],
-            },
-            tickers=tickers,
-            insights=insights,
-        )
-
-        news_article.save()
+    tracer.log_summary(logger)
 
-        logger.info(f"Saved {news_article.title} news article")
+    cache_stats = prediction.cache.stats()
+    logger.info(
+        "Inference cache: %d hits, %d misses (%.1f%% hit rate), %d entries",
+        cache_stats["hits"],
+        cache_stats["misses"],
+        cache_stats["hit_ratio"] * 100,
+        cache_stats["size"],
+    )
 
     logger.info("=" * 50)
     logger.info("Google News Scraper Finished")
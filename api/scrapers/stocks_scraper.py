@@ -2,6 +2,7 @@ import os
 import sys
 import time
 import logging
+from datetime import datetime
 
 import schedule
 import requests
@@ -27,7 +28,8 @@ logger.addHandler(file_handler)
 
 def scrape_stocks():
 
-    connect_db()
+    if not connect_db():
+        sys.exit(1)
 
     logger.info("=" * 50)
     logger.info("Starting Stocks Scraper")
@@ -58,6 +60,7 @@ def scrape_stocks():
                 employees=stock_info.get("fullTimeEmployees"),
                 company_officers=stock_info.get("companyOfficers"),
                 market_cap=stock_info.get("marketCap"),
+                updated_at=datetime.now(),
             )
             logger.info(f"Updated {stock['s']} stock.")
 
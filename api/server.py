@@ -1,14 +1,23 @@
 # built-in modules
 import os
+import asyncio
+from contextlib import asynccontextmanager
 
 # pip modules
-import uvicorn
 from fastapi import FastAPI
+from starlette.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 from dotenv import load_dotenv
 
+load_dotenv()
+
 # local modules
 from configs.db import connect_db
+from middlewares.metrics_middleware import MetricsMiddleware
+from middlewares.rate_limit_middleware import RateLimitMiddleware
+from services.warmup_service import preload, warm_up
+from utils.logger_util import logger
 
 
 # Routes
@@ -20,15 +29,64 @@ from routers.quotes_router import router as quotes_router
 from routers.prices_router import router as prices_router
 from routers.sentiments_router import router as sentiments_router
 from routers.search_router import router as search_router
+from routers.health_router import router as health_router
+from routers.metrics_router import router as metrics_router
 
+PORT = int(os.getenv("PORT") or 8000)
+WORKERS = int(os.getenv("WORKERS") or 1)
+# Seconds startup waits for MongoDB before serving as not ready
+DB_STARTUP_TIMEOUT = float(os.getenv("DB_STARTUP_TIMEOUT") or 10)
 
-load_dotenv()
-connect_db()
 
-PORT = int(os.getenv("PORT") or 8000)
+async def start_up(app: FastAPI) -> bool:
+    """Connect to MongoDB and warm up, marking the worker ready on success."""
+    if not await run_in_threadpool(connect_db, DB_STARTUP_TIMEOUT):
+        return False
+
+    await run_in_threadpool(warm_up)
+    app.state.ready = True
+    return True
+
+
+async def keep_starting_up(app: FastAPI):
+    while not await start_up(app):
+        pass
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # uvicorn only starts accepting connections on a worker once startup
+    # returns. If MongoDB is still unreachable the worker serves anyway,
+    # reports not ready, and keeps retrying instead of exiting.
+    app.state.ready = False
+    retry = None
+    if not await start_up(app):
+        logger.error(
+            f"MongoDB unreachable after {DB_STARTUP_TIMEOUT}s, retrying in the background"
+        )
+        retry = asyncio.create_task(keep_starting_up(app))
 
+    yield
 
-app = FastAPI()
+    if retry is not None:
+        retry.cancel()
+
+
+app = FastAPI(lifespan=lifespan)
+
+# Compress responses above GZIP_MINIMUM_SIZE bytes (event streams are skipped)
+app.add_middleware(
+    GZipMiddleware,
+    minimum_size=int(os.getenv("GZIP_MINIMUM_SIZE") or 1000),
+    compresslevel=int(os.getenv("GZIP_LEVEL") or 6),
+)
+
+# Per API key rate limiting (added first so CORS wraps its 429 responses)
+app.add_middleware(RateLimitMiddleware)
+
+# Request metrics, outside compression and rate limiting so 429s are counted
+# and sizes are the bytes actually sent
+app.add_middleware(MetricsMiddleware)
 
 # CORS middleware
 app.add_middleware(
@@ -51,6 +109,15 @@ app.include_router(
     router=sentiments_router, prefix="/api/v1/sentiments", tags=["Sentiments"]
 )
 app.include_router(router=search_router, prefix="/api/v1/search", tags=["Search"])
+app.include_router(router=health_router, tags=["Health"])
+app.include_router(router=metrics_router, tags=["Metrics"])
 
 if __name__ == "__main__":
-    uvicorn.run(app="server:app", host="0.0.0.0", port=PORT, reload=False)
+    import uvicorn
+
+    if WORKERS > 1 and connect_db(DB_STARTUP_TIMEOUT):
+        preload()
+
+    uvicorn.run(
+        app="server:app", host="0.0.0.0", port=PORT, reload=False, workers=WORKERS
+    )
@@ -1,5 +1,8 @@
 # built-in modules
 import os
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
 
 # pip modules
@@ -9,12 +12,70 @@ import jwt
 from jwt.exceptions import ExpiredSignatureError, InvalidTokenError
 
 
-def hash_password(password: str) -> str:
-    return bcrypt.hash(password)
+class PasswordHasherBusy(Exception):
+    pass
 
 
-def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return bcrypt.verify(plain_password, hashed_password)
+class PasswordHasher:
+    """Runs bcrypt on a bounded worker pool so it never blocks the event loop.
+
+    bcrypt releases the GIL while hashing, so a thread pool gives real
+    parallelism. At most `max_pending` calls may be queued or running at
+    once; beyond that `PasswordHasherBusy` is raised instead of queueing.
+    """
+
+    def __init__(self, rounds: int = 12, max_workers: int = 2, max_pending: int = 64):
+        self.rounds = rounds
+        self.max_pending = max_pending
+        self._handler = bcrypt.using(rounds=rounds)
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="bcrypt"
+        )
+        self._pending = 0
+        self._lock = threading.Lock()
+
+    @property
+    def pending(self) -> int:
+        """Number of hash/verify calls queued or running (queue depth)."""
+        return self._pending
+
+    async def _run(self, fn, *args):
+        with self._lock:
+            if self._pending >= self.max_pending:
+                raise PasswordHasherBusy("Server busy - Please try again later")
+            self._pending += 1
+
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, fn, *args)
+        finally:
+            with self._lock:
+                self._pending -= 1
+
+    async def hash(self, password: str) -> str:
+        return await self._run(self._handler.hash, password)
+
+    async def verify(self, password: str, hashed_password: str) -> bool:
+        return await self._run(self._handler.verify, password, hashed_password)
+
+    def needs_rehash(self, hashed_password: str) -> bool:
+        """True if the hash was made with a different work factor."""
+        return self._handler.needs_update(hashed_password)
+
+
+password_hasher = PasswordHasher(
+    rounds=int(os.getenv("BCRYPT_ROUNDS") or 12),
+    max_workers=int(os.getenv("BCRYPT_WORKERS") or 2),
+    max_pending=int(os.getenv("BCRYPT_MAX_PENDING") or 64),
+)
+
+
+async def hash_password(password: str) -> str:
+    return await password_hasher.hash(password)
+
+
+async def verify_password(plain_password: str, hashed_password: str) -> bool:
+    return await password_hasher.verify(plain_password, hashed_password)
 
 
 def generate_jwt_token(data: dict) -> str:
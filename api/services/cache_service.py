@@ -0,0 +1,672 @@
+# built-in modules
+import os
+import time
+import asyncio
+import hashlib
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+
+# pip modules
+import orjson
+from starlette.concurrency import run_in_threadpool
+
+# custom modules
+from utils.logger_util import logger
+
+
+# Shared (L2) cache: "sqlite" (a file shared by the workers of one host),
+# "redis" or "memory" (per process, for tests)
+CACHE_BACKEND = (os.getenv("CACHE_BACKEND") or "sqlite").lower()
+CACHE_PATH = os.getenv("CACHE_PATH") or os.path.join(
+    os.getcwd(), ".cache", "api_cache.sqlite3"
+)
+CACHE_URL = os.getenv("CACHE_URL") or "redis://localhost:6379/0"
+# Seconds between checks of a namespace's generation in the shared cache
+CACHE_GENERATION_CHECK_INTERVAL = float(
+    os.getenv("CACHE_GENERATION_CHECK_INTERVAL") or 1
+)
+# Seconds a worker waits for another worker that is already loading a key
+CACHE_LOCK_TIMEOUT = float(os.getenv("CACHE_LOCK_TIMEOUT") or 5)
+
+_MASK_64 = (1 << 64) - 1
+
+
+class FrequencySketch:
+    """Count-min sketch of recent key frequencies (the TinyLFU filter).
+
+    Counters saturate at 15 and are all halved once `sample_size` increments
+    have been recorded, so old popularity fades out.
+    """
+
+    depth = 4
+
+    def __init__(self, width: int, sample_size: int):
+        self.width = max(16, width)
+        self.sample_size = sample_size
+        self._tables = [[0] * self.width for _ in range(self.depth)]
+        self._additions = 0
+
+    def _indexes(self, key) -> list[int]:
+        # One 32 bit word of the digest per row, so keys that collide in
+        # one row are no more likely to collide in the others
+        digest = hashlib.blake2b(
+            (hash(key) & _MASK_64).to_bytes(8, "little"), digest_size=4 * self.depth
+        ).digest()
+        return [
+            int.from_bytes(digest[4 * row : 4 * row + 4], "little") % self.width
+            for row in range(self.depth)
+        ]
+
+    def increment(self, key):
+        for table, i in zip(self._tables, self._indexes(key)):
+            if table[i] < 15:
+                table[i] += 1
+
+        self._additions += 1
+        if self._additions >= self.sample_size:
+            self._reset()
+
+    def estimate(self, key) -> int:
+        return min(table[i] for table, i in zip(self._tables, self._indexes(key)))
+
+    def _reset(self):
+        for table in self._tables:
+            for i, count in enumerate(table):
+                table[i] = count >> 1
+        self._additions //= 2
+
+
+class LFUCache:
+    """Bounded in-process cache with TinyLFU admission.
+
+    Entries are kept in LRU order, but when the cache is full a new key is
+    only admitted if the frequency sketch has seen it more often than the
+    LRU victim. One-off keys therefore cannot push out hot ones.
+
+    Entries can carry tags so that related entries are dropped together
+    with `invalidate_tag`.
+
+    Args:
+        name (str): Name used in logs
+        capacity (int): Maximum number of entries
+        ttl (float): Default seconds an entry stays valid
+        log_every (int): Log the hit ratio every N lookups (0 disables)
+    """
+
+    def __init__(self, name: str, capacity: int = 1024, ttl: float = 60, log_every: int = 0):
+        self.name = name
+        self.capacity = capacity
+        self.ttl = ttl
+        self.log_every = log_every
+
+        self._data: OrderedDict = OrderedDict()
+        self._tags: dict[str, set] = {}
+        self._sketch = FrequencySketch(width=capacity * 4, sample_size=capacity * 10)
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.rejections = 0
+
+    @property
+    def hit_ratio(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def stats(self) -> dict:
+        return {
+            "size": len(self._data),
+            "capacity": self.capacity,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hit_ratio, 4),
+            "evictions": self.evictions,
+            "rejections": self.rejections,
+        }
+
+    def get(self, key, default=None):
+        with self._lock:
+            self._sketch.increment(key)
+            entry = self._data.get(key)
+
+            if entry is not None and entry[1] <= time.time():
+                self._remove(key)
+                entry = None
+
+            if entry is None:
+                self.misses += 1
+                value = default
+            else:
+                self.hits += 1
+                self._data.move_to_end(key)
+                value = entry[0]
+
+            lookups = self.hits + self.misses
+            if self.log_every and lookups % self.log_every == 0:
+                logger.info(f"{self.name} cache stats: {self.stats()}")
+
+            return value
+
+    def set(self, key, value, ttl: float | None = None, tags: tuple = ()) -> bool:
+        """Store `value` under `key`. Returns False if admission rejected it."""
+        expires_at = time.time() + (self.ttl if ttl is None else ttl)
+
+        with self._lock:
+            if key in self._data:
+                self._remove(key)
+            elif len(self._data) >= self.capacity:
+                victim = next(iter(self._data))
+                if self._sketch.estimate(key) <= self._sketch.estimate(victim):
+                    self.rejections += 1
+                    return False
+                self._remove(victim)
+                self.evictions += 1
+
+            self._data[key] = (value, expires_at, tags)
+            for tag in tags:
+                self._tags.setdefault(tag, set()).add(key)
+
+            return True
+
+    def delete(self, key):
+        with self._lock:
+            self._remove(key)
+
+    def invalidate_tag(self, tag: str) -> int:
+        """Drop every entry stored with `tag`. Returns the number dropped."""
+        with self._lock:
+            keys = self._tags.pop(tag, set())
+            for key in keys:
+                self._remove(key)
+            return len(keys)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self._tags.clear()
+
+    def _remove(self, key):
+        entry = self._data.pop(key, None)
+        if entry is None:
+            return
+
+        for tag in entry[2]:
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
+
+
+class CacheBackend(ABC):
+    """Shared (L2) cache storage, visible to every worker.
+
+    Values are bytes. `add` only stores a value if the key is absent (or
+    expired) and is used as a lock. Counters never expire.
+    """
+
+    name = ""
+
+    @abstractmethod
+    def get(self, key: str) -> bytes | None: ...
+
+    @abstractmethod
+    def set(self, key: str, value: bytes, ttl: float): ...
+
+    @abstractmethod
+    def add(self, key: str, value: bytes, ttl: float) -> bool: ...
+
+    @abstractmethod
+    def delete(self, key: str): ...
+
+    @abstractmethod
+    def get_counter(self, key: str) -> int: ...
+
+    @abstractmethod
+    def incr(self, key: str) -> int: ...
+
+
+class MemoryCacheBackend(CacheBackend):
+    """Process-local stand-in for tests and single worker setups."""
+
+    name = "memory"
+
+    def __init__(self):
+        self._data: dict[str, tuple[bytes, float]] = {}
+        self._counters: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> bytes | None:
+        entry = self._data.get(key)
+        if entry is None or entry[1] <= time.time():
+            return None
+        return entry[0]
+
+    def set(self, key: str, value: bytes, ttl: float):
+        self._data[key] = (value, time.time() + ttl)
+
+    def add(self, key: str, value: bytes, ttl: float) -> bool:
+        with self._lock:
+            if self.get(key) is not None:
+                return False
+            self.set(key, value, ttl)
+            return True
+
+    def delete(self, key: str):
+        self._data.pop(key, None)
+
+    def get_counter(self, key: str) -> int:
+        return self._counters.get(key, 0)
+
+    def incr(self, key: str) -> int:
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + 1
+            return self._counters[key]
+
+
+class SQLiteCacheBackend(CacheBackend):
+    """Cache shared by the workers of one host through a SQLite file.
+
+    WAL mode lets readers proceed while another worker writes. Expired rows
+    are purged every `purge_every` writes.
+
+    Args:
+        path (str): SQLite file to store the cache in
+        purge_every (int): Writes between purges of expired rows
+    """
+
+    name = "sqlite"
+
+    def __init__(self, path: str = CACHE_PATH, purge_every: int = 1000):
+        self.path = path
+        self.purge_every = purge_every
+        self._local = threading.local()
+        self._writes = 0
+
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._create_schema()
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=OFF")
+            self._local.conn = conn
+        return conn
+
+    def _create_schema(self):
+        self._connection().executescript(
+            """
+            CREATE TABLE IF NOT EXISTS entries (
+                key TEXT PRIMARY KEY,
+                value BLOB NOT NULL,
+                expires_at REAL NOT NULL
+            ) WITHOUT ROWID;
+            CREATE INDEX IF NOT EXISTS entries_expires_at ON entries (expires_at);
+            CREATE TABLE IF NOT EXISTS counters (
+                key TEXT PRIMARY KEY,
+                value INTEGER NOT NULL
+            ) WITHOUT ROWID;
+            """
+        )
+
+    def _written(self):
+        self._writes += 1
+        if self._writes % self.purge_every == 0:
+            self._connection().execute(
+                "DELETE FROM entries WHERE expires_at <= ?", (time.time(),)
+            )
+
+    def get(self, key: str) -> bytes | None:
+        row = (
+            self._connection()
+            .execute(
+                "SELECT value FROM entries WHERE key = ? AND expires_at > ?",
+                (key, time.time()),
+            )
+            .fetchone()
+        )
+        return row[0] if row else None
+
+    def set(self, key: str, value: bytes, ttl: float):
+        self._connection().execute(
+            "INSERT OR REPLACE INTO entries VALUES (?, ?, ?)",
+            (key, value, time.time() + ttl),
+        )
+        self._written()
+
+    def add(self, key: str, value: bytes, ttl: float) -> bool:
+        now = time.time()
+        cursor = self._connection().execute(
+            """
+            INSERT INTO entries VALUES (?, ?, ?)
+            ON CONFLICT (key) DO UPDATE
+            SET value = excluded.value, expires_at = excluded.expires_at
+            WHERE entries.expires_at <= ?
+            """,
+            (key, value, now + ttl, now),
+        )
+        self._written()
+        return cursor.rowcount == 1
+
+    def delete(self, key: str):
+        self._connection().execute("DELETE FROM entries WHERE key = ?", (key,))
+
+    def get_counter(self, key: str) -> int:
+        row = (
+            self._connection()
+            .execute("SELECT value FROM counters WHERE key = ?", (key,))
+            .fetchone()
+        )
+        return row[0] if row else 0
+
+    def incr(self, key: str) -> int:
+        return (
+            self._connection()
+            .execute(
+                """
+                INSERT INTO counters VALUES (?, 1)
+                ON CONFLICT (key) DO UPDATE SET value = value + 1
+                RETURNING value
+                """,
+                (key,),
+            )
+            .fetchone()[0]
+        )
+
+
+class RedisCacheBackend(CacheBackend):
+    """Cache shared through a Redis-protocol server (Redis, Valkey, KeyDB...).
+
+    Requires the optional `redis` package.
+    """
+
+    name = "redis"
+
+    def __init__(self, url: str = CACHE_URL):
+        try:
+            import redis
+        except ImportError as e:
+            raise ImportError(
+                "CACHE_BACKEND=redis requires the `redis` package (pip install redis)"
+            ) from e
+
+        self._client = redis.Redis.from_url(url)
+
+    def get(self, key: str) -> bytes | None:
+        return self._client.get(key)
+
+    def set(self, key: str, value: bytes, ttl: float):
+        self._client.set(key, value, px=int(ttl * 1000))
+
+    def add(self, key: str, value: bytes, ttl: float) -> bool:
+        return bool(self._client.set(key, value, px=int(ttl * 1000), nx=True))
+
+    def delete(self, key: str):
+        self._client.delete(key)
+
+    def get_counter(self, key: str) -> int:
+        return int(self._client.get(key) or 0)
+
+    def incr(self, key: str) -> int:
+        return self._client.incr(key)
+
+
+_backends = {
+    MemoryCacheBackend.name: MemoryCacheBackend,
+    SQLiteCacheBackend.name: SQLiteCacheBackend,
+    RedisCacheBackend.name: RedisCacheBackend,
+}
+_backend = None
+_backend_lock = threading.Lock()
+
+
+def get_cache_backend() -> CacheBackend:
+    """Backend selected by CACHE_BACKEND (`sqlite`, `redis` or `memory`)."""
+    global _backend
+
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                if CACHE_BACKEND not in _backends:
+                    raise ValueError(f"Invalid CACHE_BACKEND: {CACHE_BACKEND}")
+                _backend = _backends[CACHE_BACKEND]()
+
+    return _backend
+
+
+def _encode(value) -> bytes:
+    if isinstance(value, bytes):
+        return b"b" + value
+    return b"j" + orjson.dumps(value, default=str, option=orjson.OPT_NON_STR_KEYS)
+
+
+def _decode(raw: bytes):
+    if raw[:1] == b"b":
+        return raw[1:]
+    return orjson.loads(raw[1:])
+
+
+_MISSING = object()
+
+# Every TieredCache of the process, for metrics
+caches: list["TieredCache"] = []
+
+
+class TieredCache:
+    """Namespaced two-tier cache: an in-process LFUCache (L1) in front of a
+    backend shared by all workers (L2).
+
+    Values must be bytes or JSON serialisable; they come back from L2 as
+    bytes or plain JSON types.
+
+    `invalidate` bumps the namespace's generation counter in L2. Entries of
+    older generations are no longer addressed and simply expire, and other
+    workers drop their L1 once they notice the new generation (checked at
+    most every CACHE_GENERATION_CHECK_INTERVAL seconds).
+
+    `get_or_set` protects against stampedes: concurrent misses in a worker
+    share one load, and across workers a short lock in L2 lets a single
+    worker load while the others wait for its result.
+
+    Args:
+        namespace (str): Key prefix, also the unit of invalidation
+        ttl (float): Default seconds an entry lives in L2
+        l1_capacity (int): Maximum entries kept in process
+        l1_ttl (float, optional): Seconds an entry lives in L1. Defaults to `ttl`.
+        log_every (int): Log L1 stats every N lookups (0 disables)
+        backend (CacheBackend, optional): Defaults to `get_cache_backend()`
+    """
+
+    def __init__(
+        self,
+        namespace: str,
+        ttl: float = 60,
+        l1_capacity: int = 1024,
+        l1_ttl: float | None = None,
+        log_every: int = 0,
+        backend: CacheBackend | None = None,
+    ):
+        self.namespace = namespace
+        self.ttl = ttl
+        self.l1 = LFUCache(
+            namespace, capacity=l1_capacity, ttl=l1_ttl or ttl, log_every=log_every
+        )
+        self._backend = backend
+
+        self._generation = 0
+        self._generation_checked_at = 0.0
+        self._inflight: dict = {}
+
+        self.l2_hits = 0
+        self.l2_misses = 0
+        self.loads = 0
+
+        caches.append(self)
+
+    @property
+    def backend(self) -> CacheBackend:
+        if self._backend is None:
+            self._backend = get_cache_backend()
+        return self._backend
+
+    def stats(self) -> dict:
+        return {
+            "l1": self.l1.stats(),
+            "l2_hits": self.l2_hits,
+            "l2_misses": self.l2_misses,
+            "loads": self.loads,
+            "generation": self._generation,
+        }
+
+    def _generation_key(self) -> str:
+        return f"{self.namespace}:generation"
+
+    def _current_generation(self) -> int:
+        now = time.monotonic()
+        if now - self._generation_checked_at >= CACHE_GENERATION_CHECK_INTERVAL:
+            self._generation_checked_at = now
+            generation = self.backend.get_counter(self._generation_key())
+            if generation != self._generation:
+                self._generation = generation
+                self.l1.clear()
+        return self._generation
+
+    async def _refresh_generation(self):
+        """`_current_generation` for async code, the L2 read runs on the
+        thread pool."""
+        now = time.monotonic()
+        if now - self._generation_checked_at >= CACHE_GENERATION_CHECK_INTERVAL:
+            await run_in_threadpool(self._current_generation)
+
+    def _l2_key(self, key) -> str:
+        return f"{self.namespace}:{self._current_generation()}:{key}"
+
+    def get(self, key, default=None):
+        self._current_generation()
+        value = self.l1.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+        return self._get_from_l2(key, default)
+
+    def _get_from_l2(self, key, default=None):
+        raw = self.backend.get(self._l2_key(key))
+        if raw is None:
+            self.l2_misses += 1
+            return default
+
+        self.l2_hits += 1
+        value = _decode(raw)
+        self.l1.set(key, value)
+        return value
+
+    def set(self, key, value, ttl: float | None = None):
+        ttl = self.ttl if ttl is None else ttl
+        self.backend.set(self._l2_key(key), _encode(value), ttl)
+        self.l1.set(key, value, ttl=min(ttl, self.l1.ttl))
+
+    def delete(self, key):
+        self.l1.delete(key)
+        self.backend.delete(self._l2_key(key))
+
+    async def aget(self, key, default=None):
+        """`get` for async code: L1 hits return at once, L2 lookups run on
+        the thread pool."""
+        await self._refresh_generation()
+        value = self.l1.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+        return await run_in_threadpool(self._get_from_l2, key, default)
+
+    async def aset(self, key, value, ttl: float | None = None):
+        """`set` for async code, the L2 write runs on the thread pool."""
+        await run_in_threadpool(self.set, key, value, ttl)
+
+    def invalidate(self):
+        """Drop every entry of the namespace, in every worker."""
+        self._generation = self.backend.incr(self._generation_key())
+        self._generation_checked_at = time.monotonic()
+        self.l1.clear()
+
+    def _load(self, key, loader, ttl: float, none_ttl: float | None):
+        l2_key = self._l2_key(key)
+        lock_key = f"{l2_key}:lock"
+
+        acquired = self.backend.add(lock_key, b"1", CACHE_LOCK_TIMEOUT)
+        if not acquired:
+            # Another worker is loading this key, wait for its result
+            deadline = time.monotonic() + CACHE_LOCK_TIMEOUT
+            while time.monotonic() < deadline:
+                time.sleep(0.05)
+                raw = self.backend.get(l2_key)
+                if raw is not None:
+                    self.l2_hits += 1
+                    return _decode(raw)
+
+        try:
+            self.loads += 1
+            value = loader()
+            if value is None and none_ttl is not None:
+                ttl = none_ttl
+            if ttl > 0:
+                self.backend.set(l2_key, _encode(value), ttl)
+            return value
+        finally:
+            # After a timed out wait the lock is still the other worker's
+            if acquired:
+                self.backend.delete(lock_key)
+
+    def _get_or_load(self, key, loader, ttl: float, none_ttl: float | None):
+        raw = self.backend.get(self._l2_key(key))
+        if raw is not None:
+            self.l2_hits += 1
+            value = _decode(raw)
+        else:
+            self.l2_misses += 1
+            value = self._load(key, loader, ttl, none_ttl)
+
+        if value is None and none_ttl is not None:
+            ttl = none_ttl
+        if ttl > 0:
+            self.l1.set(key, value, ttl=min(ttl, self.l1.ttl))
+        return value
+
+    def _load_done(self, key, task: asyncio.Task):
+        self._inflight.pop(key, None)
+        # Retrieve the exception so an abandoned load is not logged as unhandled
+        if not task.cancelled():
+            task.exception()
+
+    async def get_or_set(
+        self, key, loader, ttl: float | None = None, none_ttl: float | None = None
+    ):
+        """Return the cached value of `key`, calling `loader` on a miss.
+
+        `loader` is a blocking callable; it runs on the thread pool, as do L2
+        lookups. Exceptions from `loader` are raised and nothing is cached.
+        A None result is cached for `none_ttl` seconds instead of `ttl` when
+        given, and not at all when it is 0.
+        """
+        ttl = self.ttl if ttl is None else ttl
+
+        await self._refresh_generation()
+        value = self.l1.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+
+        # The load is not tied to the request that started it, so a client
+        # disconnecting does not fail the others waiting on the same key
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(
+                run_in_threadpool(self._get_or_load, key, loader, ttl, none_ttl)
+            )
+            self._inflight[key] = task
+            task.add_done_callback(lambda task: self._load_done(key, task))
+
+        return await asyncio.shield(task)
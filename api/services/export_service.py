@@ -0,0 +1,175 @@
+# built-in modules
+import io
+import os
+import csv
+from typing import Iterator
+
+# pip modules
+import orjson
+from bson import ObjectId
+
+# custom modules
+from models.newsArticle_model import NewsArticle
+from services.read_service import find_raw
+from utils.serializer_util import Serializer
+
+
+# Bytes buffered before a chunk is handed to the response
+CHUNK_SIZE = int(os.getenv("EXPORT_CHUNK_SIZE") or 64 * 1024)
+
+news_article_serializer = Serializer(
+    NewsArticle,
+    exclude={"created_at", "updated_at"},
+)
+news_article_projection = {"createdAt": 0, "updatedAt": 0}
+
+article_columns = [
+    "id",
+    "title",
+    "description",
+    "article_url",
+    "image_url",
+    "authors",
+    "published_at",
+    "publisher",
+    "tickers",
+]
+insight_columns = [
+    "article_id",
+    "published_at",
+    "ticker",
+    "sentiment",
+    "sentiment_score",
+    "sentiment_reasoning",
+    "title",
+    "article_url",
+    "publisher",
+]
+
+
+def parse_cursor(cursor: str) -> ObjectId:
+    """Return the article id an export should resume after.
+
+    Raises:
+        ValueError: If the cursor is not an article id
+    """
+    if not ObjectId.is_valid(cursor):
+        raise ValueError("Invalid cursor")
+    return ObjectId(cursor)
+
+
+def iter_articles(query: dict, after: ObjectId | None = None) -> Iterator[dict]:
+    """Yield serialised articles matching `query` in `_id` order.
+
+    Exports are ordered by `_id` so that any article id is a stable resume
+    point, and the range scan on `_id` replaces `skip`.
+    """
+    if after is not None:
+        query = {**query, "_id": {"$gt": after}}
+
+    for raw in find_raw(
+        NewsArticle,
+        query,
+        projection=news_article_projection,
+        sort=[("_id", 1)],
+    ):
+        yield news_article_serializer(raw)
+
+
+def article_rows(articles: Iterator[dict]) -> Iterator[dict]:
+    """Flatten articles for CSV, keeping only the publisher name."""
+    for article in articles:
+        yield {**article, "publisher": (article.get("publisher") or {}).get("name")}
+
+
+def insight_rows(articles: Iterator[dict], ticker: str | None = None) -> Iterator[dict]:
+    """Flatten articles into one row per insight."""
+    for article in articles:
+        for insight in article.get("insights") or []:
+            if ticker and insight.get("ticker") != ticker:
+                continue
+
+            yield {
+                "article_id": article["id"],
+                "published_at": article.get("published_at"),
+                "ticker": insight.get("ticker"),
+                "sentiment": insight.get("sentiment"),
+                "sentiment_score": insight.get("sentiment_score"),
+                "sentiment_reasoning": insight.get("sentiment_reasoning"),
+                "title": article.get("title"),
+                "article_url": article.get("article_url"),
+                "publisher": (article.get("publisher") or {}).get("name"),
+            }
+
+
+def _csv_value(value):
+    if isinstance(value, list):
+        return ";".join(str(item) for item in value)
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    return value
+
+
+def to_ndjson(rows: Iterator[dict], chunk_size: int = CHUNK_SIZE) -> Iterator[bytes]:
+    buffer = bytearray()
+    for row in rows:
+        buffer += orjson.dumps(row, default=str)
+        buffer += b"\n"
+        if len(buffer) >= chunk_size:
+            yield bytes(buffer)
+            buffer.clear()
+
+    if buffer:
+        yield bytes(buffer)
+
+
+def to_csv(
+    rows: Iterator[dict], columns: list[str], chunk_size: int = CHUNK_SIZE
+) -> Iterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=columns, extrasaction="ignore")
+    writer.writeheader()
+
+    for row in rows:
+        writer.writerow({column: _csv_value(row.get(column)) for column in columns})
+        if buffer.tell() >= chunk_size:
+            yield buffer.getvalue().encode()
+            buffer.seek(0)
+            buffer.truncate()
+
+    if buffer.tell():
+        yield buffer.getvalue().encode()
+
+
+def export_news(
+    query: dict,
+    rows: str = "articles",
+    format_: str = "ndjson",
+    ticker: str | None = None,
+    after: ObjectId | None = None,
+) -> Iterator[bytes]:
+    """Stream matching news as NDJSON or CSV chunks.
+
+    The Mongo cursor is consumed lazily, so memory stays constant no matter
+    how many articles match.
+
+    Args:
+        query (dict): Raw filter on the news collection
+        rows (str): `articles` for one row per article, `insights` for one row
+            per (article, ticker) insight
+        format_ (str): `ndjson` or `csv`
+        ticker (str, optional): Only keep insights for this ticker
+        after (ObjectId, optional): Resume after this article id
+    """
+    articles = iter_articles(query, after)
+
+    if rows == "insights":
+        records, columns = insight_rows(articles, ticker), insight_columns
+    elif format_ == "csv":
+        records, columns = article_rows(articles), article_columns
+    else:
+        records, columns = articles, article_columns
+
+    if format_ == "csv":
+        return to_csv(records, columns)
+    return to_ndjson(records)
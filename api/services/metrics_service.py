@@ -0,0 +1,264 @@
+# built-in modules
+import time
+import bisect
+import threading
+from contextlib import contextmanager
+
+# pip modules
+from pymongo import monitoring
+
+
+# Latency buckets in seconds, and payload size buckets in bytes
+LATENCY_BUCKETS = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10,
+)  # fmt: skip
+SIZE_BUCKETS = (100, 1_000, 10_000, 100_000, 1_000_000, 10_000_000)
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names: tuple, values: tuple, extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    """Monotonically increasing value per label set."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, description: str, labels: tuple = ()):
+        self.name = name
+        self.description = description
+        self.labels = labels
+        self._values: dict[tuple, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *label_values, amount: float = 1):
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    def samples(self):
+        with self._lock:
+            values = list(self._values.items())
+        for label_values, value in values:
+            yield self.name, _format_labels(self.labels, label_values), value
+
+
+class Histogram:
+    """Cumulative bucket counts, sum and count per label set.
+
+    Observing is a binary search plus three additions under a lock, cheap
+    enough to run on every request.
+    """
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        description: str,
+        labels: tuple = (),
+        buckets: tuple = LATENCY_BUCKETS,
+    ):
+        self.name = name
+        self.description = description
+        self.labels = labels
+        self.buckets = tuple(buckets)
+        self._values: dict[tuple, list] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *label_values):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(label_values)
+            if state is None:
+                # Per-bucket (non cumulative) counts, then sum
+                state = [[0] * (len(self.buckets) + 1), 0.0]
+                self._values[label_values] = state
+            state[0][index] += 1
+            state[1] += value
+
+    @contextmanager
+    def time(self, *label_values):
+        started_at = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started_at, *label_values)
+
+    def samples(self):
+        with self._lock:
+            values = [
+                (labels, list(counts), total)
+                for labels, (counts, total) in self._values.items()
+            ]
+
+        for label_values, counts, total in values:
+            cumulative = 0
+            for bound, count in zip((*self.buckets, float("inf")), counts):
+                cumulative += count
+                yield (
+                    f"{self.name}_bucket",
+                    _format_labels(
+                        self.labels, label_values, f'le="{_format_value(bound)}"'
+                    ),
+                    cumulative,
+                )
+            labels = _format_labels(self.labels, label_values)
+            yield f"{self.name}_sum", labels, total
+            yield f"{self.name}_count", labels, cumulative
+
+
+class Gauge:
+    """Value read from a callback at scrape time.
+
+    The callback returns a number, or a dict of label values tuple -> number.
+    `kind` may be set to "counter" for totals kept elsewhere (e.g. cache hits).
+    """
+
+    kind = "gauge"
+
+    def __init__(
+        self,
+        name: str,
+        description: str,
+        callback,
+        labels: tuple = (),
+        kind: str = "gauge",
+    ):
+        self.name = name
+        self.description = description
+        self.callback = callback
+        self.labels = labels
+        self.kind = kind
+
+    def samples(self):
+        value = self.callback()
+        if not isinstance(value, dict):
+            value = {(): value}
+        for label_values, sample in value.items():
+            yield self.name, _format_labels(self.labels, label_values), sample
+
+
+class Registry:
+    def __init__(self):
+        self._metrics = []
+
+    def register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def counter(self, name: str, description: str, labels: tuple = ()) -> Counter:
+        return self.register(Counter(name, description, labels))
+
+    def histogram(
+        self,
+        name: str,
+        description: str,
+        labels: tuple = (),
+        buckets: tuple = LATENCY_BUCKETS,
+    ) -> Histogram:
+        return self.register(Histogram(name, description, labels, buckets))
+
+    def gauge(
+        self,
+        name: str,
+        description: str,
+        callback,
+        labels: tuple = (),
+        kind: str = "gauge",
+    ) -> Gauge:
+        return self.register(Gauge(name, description, callback, labels, kind))
+
+    def render(self) -> str:
+        """Render every metric in the Prometheus text exposition format."""
+        lines = []
+        for metric in self._metrics:
+            lines.append(f"# HELP {metric.name} {metric.description}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            try:
+                for name, labels, value in metric.samples():
+                    lines.append(f"{name}{labels} {_format_value(value)}")
+            except Exception:
+                # A failing callback must not break the whole scrape
+                continue
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+http_requests = registry.counter(
+    "http_requests_total",
+    "HTTP requests by route template, method and status",
+    ("route", "method", "status"),
+)
+http_request_duration = registry.histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency, until the last body chunk is sent",
+    ("route", "method"),
+)
+http_response_size = registry.histogram(
+    "http_response_size_bytes",
+    "HTTP response body size",
+    ("route", "method"),
+    buckets=SIZE_BUCKETS,
+)
+mongo_command_duration = registry.histogram(
+    "mongo_command_duration_seconds",
+    "MongoDB command latency by collection and command",
+    ("collection", "command", "outcome"),
+)
+yfinance_call_duration = registry.histogram(
+    "yfinance_call_duration_seconds",
+    "Yahoo Finance call latency",
+    ("call", "outcome"),
+)
+auth_lookup_duration = registry.histogram(
+    "auth_lookup_duration_seconds",
+    "API key and token lookup latency",
+    ("kind", "source"),
+)
+
+
+class MongoCommandListener(monitoring.CommandListener):
+    """Times every MongoDB command of the process's clients."""
+
+    def __init__(self):
+        self._collections: dict[tuple, str] = {}
+
+    def started(self, event):
+        command = event.command
+        if event.command_name == "getMore":
+            collection = command.get("collection")
+        else:
+            collection = command.get(event.command_name)
+        self._collections[(event.connection_id, event.request_id)] = (
+            collection if isinstance(collection, str) else ""
+        )
+
+    def _finished(self, event, outcome: str):
+        collection = self._collections.pop((event.connection_id, event.request_id), "")
+        mongo_command_duration.observe(
+            event.duration_micros / 1_000_000, collection, event.command_name, outcome
+        )
+
+    def succeeded(self, event):
+        self._finished(event, "ok")
+
+    def failed(self, event):
+        self._finished(event, "error")
+
+
+# Listeners apply to clients created afterwards, i.e. in the lifespan handler
+monitoring.register(MongoCommandListener())
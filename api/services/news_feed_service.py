@@ -0,0 +1,254 @@
+# built-in modules
+import os
+import time
+import asyncio
+import threading
+from collections import deque
+from datetime import datetime, timezone
+
+# pip modules
+from bson import ObjectId
+from pymongo.errors import OperationFailure
+
+# custom modules
+from models.newsArticle_model import NewsArticle
+from services.read_service import find_one_raw, find_raw, get_collection
+from utils.logger_util import logger
+from utils.serializer_util import Serializer
+
+
+# How new articles are detected: "change_stream", "poll" or "auto" (change
+# stream when the deployment supports it, polling otherwise)
+NEWS_FEED_MODE = (os.getenv("NEWS_FEED_MODE") or "auto").lower()
+NEWS_FEED_POLL_INTERVAL = float(os.getenv("NEWS_FEED_POLL_INTERVAL") or 2)
+# Recent articles kept in memory for resuming clients
+NEWS_FEED_BUFFER_SIZE = int(os.getenv("NEWS_FEED_BUFFER_SIZE") or 1000)
+# Articles queued per connection before it is closed as too slow
+NEWS_FEED_QUEUE_SIZE = int(os.getenv("NEWS_FEED_QUEUE_SIZE") or 100)
+# Articles per page replayed from MongoDB on resume
+NEWS_FEED_BACKFILL_LIMIT = int(os.getenv("NEWS_FEED_BACKFILL_LIMIT") or 500)
+
+news_article_serializer = Serializer(
+    NewsArticle,
+    exclude={"created_at", "updated_at"},
+)
+news_article_projection = {"createdAt": 0, "updatedAt": 0}
+
+# Raised when a change stream's resume token has left the oplog
+CHANGE_STREAM_HISTORY_LOST = 286
+
+
+class NewsFeedSubscription:
+    """Bounded queue of articles for one connection.
+
+    When the queue is full the subscription is marked as overflowed instead
+    of blocking the feed. The connection then ends once the queue is
+    drained, and the client reconnects with its last event id to backfill
+    what it missed.
+    """
+
+    def __init__(self, tickers: set[str] | None, max_queued: int = NEWS_FEED_QUEUE_SIZE):
+        self.tickers = tickers
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=max_queued)
+        self.overflowed = False
+
+    def wants(self, article: dict) -> bool:
+        return not self.tickers or not self.tickers.isdisjoint(article.get("tickers") or ())
+
+    def push(self, article: dict):
+        if self.overflowed:
+            return
+
+        try:
+            self.queue.put_nowait(article)
+        except asyncio.QueueFull:
+            self.overflowed = True
+
+
+class NewsFeed:
+    """Pushes newly saved articles to subscribed clients.
+
+    The scrapers run in their own processes, so new articles are picked up
+    from MongoDB: through a change stream on replica sets (Atlas), or by
+    polling for `_id`s newer than the last one seen. A single watcher thread
+    serves every connection of the process.
+
+    Recent articles are kept in a ring buffer, keyed by their ObjectId, so
+    reconnecting clients can resume after their last event id; older gaps
+    are backfilled from MongoDB a page at a time.
+    """
+
+    def __init__(
+        self,
+        mode: str = NEWS_FEED_MODE,
+        poll_interval: float = NEWS_FEED_POLL_INTERVAL,
+        buffer_size: int = NEWS_FEED_BUFFER_SIZE,
+        backfill_limit: int = NEWS_FEED_BACKFILL_LIMIT,
+    ):
+        self.mode = mode
+        self.poll_interval = poll_interval
+        self.backfill_limit = backfill_limit
+
+        self._buffer: deque[tuple[ObjectId, dict]] = deque(maxlen=buffer_size)
+        self._subscriptions: set[NewsFeedSubscription] = set()
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+        self._last_id: ObjectId | None = None
+        self._resume_token: dict | None = None
+
+    @property
+    def subscriptions(self) -> int:
+        return len(self._subscriptions)
+
+    def subscribe(self, tickers: set[str] | None = None) -> NewsFeedSubscription:
+        self._start()
+        subscription = NewsFeedSubscription(tickers)
+        self._subscriptions.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: NewsFeedSubscription):
+        self._subscriptions.discard(subscription)
+
+    def replay(
+        self, after: ObjectId, tickers: set[str] | None = None
+    ) -> tuple[list[dict], bool]:
+        """Return a page of the articles newer than `after`, oldest first.
+
+        Gaps older than the buffer are read from MongoDB up to
+        `backfill_limit` articles at a time; replay again after the last
+        article of the page while there are more.
+
+        Returns:
+            tuple: The articles, and whether more follow them
+        """
+        buffer = list(self._buffer)
+        if buffer and buffer[0][0] <= after:
+            articles = [
+                article
+                for article_id, article in buffer
+                if article_id > after
+                and (not tickers or not tickers.isdisjoint(article.get("tickers") or ()))
+            ]
+            return articles, False
+
+        query = {"_id": {"$gt": after}}
+        if tickers:
+            query["tickers"] = {"$in": list(tickers)}
+
+        articles = news_article_serializer.many(
+            find_raw(
+                NewsArticle,
+                query,
+                projection=news_article_projection,
+                sort=[("_id", 1)],
+                limit=self.backfill_limit,
+            )
+        )
+        return articles, len(articles) == self.backfill_limit
+
+    def _start(self):
+        if self._thread is not None:
+            return
+
+        with self._lock:
+            if self._thread is None:
+                self._loop = asyncio.get_running_loop()
+                self._thread = threading.Thread(target=self._watch, daemon=True)
+                self._thread.start()
+
+    def _dispatch(self, raw: dict):
+        self._last_id = raw["_id"]
+        article = news_article_serializer(raw)
+        self._loop.call_soon_threadsafe(self._publish, raw["_id"], article)
+
+    def _publish(self, article_id: ObjectId, article: dict):
+        self._buffer.append((article_id, article))
+        for subscription in list(self._subscriptions):
+            if subscription.wants(article):
+                subscription.push(article)
+
+    def _watch(self):
+        mode = self.mode
+        while True:
+            try:
+                if mode == "poll":
+                    self._watch_polling()
+                else:
+                    self._watch_change_stream()
+            except Exception as e:
+                if mode == "auto":
+                    logger.warning(f"News change stream unavailable, polling instead: {e}")
+                    mode = "poll"
+                    continue
+
+                logger.error(f"News feed watcher failed: {e}")
+                time.sleep(self.poll_interval)
+
+    def _watch_change_stream(self):
+        pipeline = [{"$match": {"operationType": "insert"}}]
+        collection = get_collection(NewsArticle)
+        try:
+            # Reopened streams carry on after the last change seen
+            stream = collection.watch(pipeline, resume_after=self._resume_token)
+        except OperationFailure as e:
+            if self._resume_token is None or e.code != CHANGE_STREAM_HISTORY_LOST:
+                raise
+
+            logger.warning("News change stream fell too far behind, catching up")
+            self._resume_token = None
+            stream = collection.watch(pipeline)
+            self._catch_up()
+
+        with stream:
+            logger.info("Watching news articles through a change stream")
+            for change in stream:
+                raw = change["fullDocument"]
+                for key in news_article_projection:
+                    raw.pop(key, None)
+                self._dispatch(raw)
+                self._resume_token = change["_id"]
+
+    def _catch_up(self):
+        """Dispatch the articles saved after the last one seen."""
+        if self._last_id is None:
+            return
+
+        while True:
+            page = list(
+                find_raw(
+                    NewsArticle,
+                    {"_id": {"$gt": self._last_id}},
+                    projection=news_article_projection,
+                    sort=[("_id", 1)],
+                    limit=self.backfill_limit,
+                )
+            )
+            for raw in page:
+                self._dispatch(raw)
+            if len(page) < self.backfill_limit:
+                return
+
+    def _watch_polling(self):
+        if self._last_id is None:
+            latest = find_one_raw(NewsArticle, {}, {"_id": 1}, sort=[("_id", -1)])
+            if latest:
+                self._last_id = latest["_id"]
+            else:
+                self._last_id = ObjectId.from_datetime(datetime.now(timezone.utc))
+
+        logger.info("Watching news articles by polling")
+        while True:
+            for raw in find_raw(
+                NewsArticle,
+                {"_id": {"$gt": self._last_id}},
+                projection=news_article_projection,
+                sort=[("_id", 1)],
+                limit=self.backfill_limit,
+            ):
+                self._dispatch(raw)
+
+            time.sleep(self.poll_interval)
+
+
+news_feed = NewsFeed()
@@ -0,0 +1,443 @@
+# built-in modules
+import os
+import re
+import math
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from collections import Counter
+from datetime import datetime
+
+# pip modules
+from bson import ObjectId
+
+# custom modules
+from models.newsArticle_model import NewsArticle
+from services.read_service import find_raw, get_collection
+from utils.logger_util import logger
+
+
+NEWS_SEARCH_BACKEND = (os.getenv("NEWS_SEARCH_BACKEND") or "atlas").lower()
+NEWS_INDEX_PATH = os.getenv("NEWS_INDEX_PATH") or os.path.join(
+    os.path.dirname(__file__), "..", ".cache", "news_index.sqlite3"
+)
+
+_TOKEN = re.compile(r"[a-z0-9]+(?:['.&][a-z0-9]+)*")
+
+_STOP_WORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "has",
+    "in", "is", "it", "its", "of", "on", "or", "that", "the", "to", "was",
+    "were", "will", "with",
+}  # fmt: skip
+
+_PROJECTION = {
+    "_id": 1,
+    "title": 1,
+    "articleUrl": 1,
+    "publishedAt": 1,
+    "publisher.name": 1,
+}
+
+
+def tokenize(text: str) -> list[str]:
+    return [
+        token for token in _TOKEN.findall(text.lower()) if token not in _STOP_WORDS
+    ]
+
+
+class NewsSearchBackend(ABC):
+    """Full-text search over news articles.
+
+    `search` returns raw documents projected like `_PROJECTION`, best match
+    first. `max_time_ms` is a hint for backends that can abandon slow
+    queries.
+    """
+
+    name = ""
+
+    @abstractmethod
+    def search(
+        self,
+        q: str,
+        from_datetime: datetime | None = None,
+        to_datetime: datetime | None = None,
+        publisher: str | None = None,
+        limit: int = 5,
+        max_time_ms: int | None = None,
+    ) -> list[dict]: ...
+
+    def add(self, article: dict, summary_sentences: list[str] | None = None):
+        """Index a newly saved article. Backends backed by MongoDB indexes
+        pick up new articles on their own."""
+        pass
+
+
+def _date_filter(
+    from_datetime: datetime | None, to_datetime: datetime | None
+) -> dict | None:
+    date_filter = {}
+    if from_datetime:
+        date_filter["$gte"] = from_datetime
+    if to_datetime:
+        date_filter["$lte"] = to_datetime
+    return date_filter or None
+
+
+class AtlasNewsSearch(NewsSearchBackend):
+    """Atlas Search `$search` on the `news_articles` search index."""
+
+    name = "atlas"
+
+    def search(
+        self,
+        q,
+        from_datetime=None,
+        to_datetime=None,
+        publisher=None,
+        limit=5,
+        max_time_ms=None,
+    ):
+        match = {}
+        if date_filter := _date_filter(from_datetime, to_datetime):
+            match["publishedAt"] = date_filter
+        if publisher:
+            match["publisher.name"] = publisher
+
+        pipeline = [
+            {
+                "$search": {
+                    "index": "news_articles",
+                    "text": {
+                        "query": q,
+                        "path": "title",
+                    },
+                }
+            },
+            {"$limit": limit},
+            {"$project": _PROJECTION},
+        ]
+
+        if match:
+            pipeline.insert(1, {"$match": match})
+
+        kwargs = {"maxTimeMS": max_time_ms} if max_time_ms else {}
+        return list(get_collection(NewsArticle).aggregate(pipeline, **kwargs))
+
+
+class MongoTextNewsSearch(NewsSearchBackend):
+    """`$text` query on the model's `title` text index. Works on any MongoDB."""
+
+    name = "text"
+
+    def search(
+        self,
+        q,
+        from_datetime=None,
+        to_datetime=None,
+        publisher=None,
+        limit=5,
+        max_time_ms=None,
+    ):
+        query = {"$text": {"$search": q}}
+        if date_filter := _date_filter(from_datetime, to_datetime):
+            query["publishedAt"] = date_filter
+        if publisher:
+            query["publisher.name"] = publisher
+
+        cursor = find_raw(
+            NewsArticle,
+            query,
+            projection={**_PROJECTION, "score": {"$meta": "textScore"}},
+            sort=[("score", {"$meta": "textScore"})],
+            limit=limit,
+        )
+        if max_time_ms:
+            cursor = cursor.max_time_ms(max_time_ms)
+
+        articles = list(cursor)
+        for article in articles:
+            article.pop("score", None)
+        return articles
+
+
+class BM25NewsSearch(NewsSearchBackend):
+    """On-disk inverted index with Okapi BM25 ranking.
+
+    The index lives in a SQLite file (WAL mode, so the scraper can append
+    while the API reads) and covers each article's title and summary
+    sentences. Title terms are counted `title_weight` times. The last query
+    term is also matched as a prefix so partially typed words still hit.
+
+    Args:
+        path (str): SQLite file to store the index in
+        k1 (float): BM25 term frequency saturation
+        b (float): BM25 length normalisation
+    """
+
+    name = "bm25"
+
+    def __init__(
+        self,
+        path: str = NEWS_INDEX_PATH,
+        k1: float = 1.2,
+        b: float = 0.75,
+        title_weight: int = 2,
+        max_prefix_terms: int = 20,
+    ):
+        self.path = path
+        self.k1 = k1
+        self.b = b
+        self.title_weight = title_weight
+        self.max_prefix_terms = max_prefix_terms
+        self._local = threading.local()
+        self._write_lock = threading.Lock()
+
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._create_schema()
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _create_schema(self):
+        conn = self._connection()
+        with conn:
+            conn.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS docs (
+                    id TEXT PRIMARY KEY,
+                    title TEXT NOT NULL,
+                    article_url TEXT,
+                    published_at REAL,
+                    publisher TEXT,
+                    length INTEGER NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS docs_published_at ON docs (published_at);
+                CREATE TABLE IF NOT EXISTS postings (
+                    term TEXT NOT NULL,
+                    doc_id TEXT NOT NULL,
+                    tf INTEGER NOT NULL,
+                    PRIMARY KEY (term, doc_id)
+                ) WITHOUT ROWID;
+                CREATE INDEX IF NOT EXISTS postings_doc_id ON postings (doc_id);
+                CREATE TABLE IF NOT EXISTS stats (
+                    id INTEGER PRIMARY KEY CHECK (id = 0),
+                    doc_count INTEGER NOT NULL,
+                    total_length INTEGER NOT NULL
+                );
+                INSERT OR IGNORE INTO stats VALUES (0, 0, 0);
+                """
+            )
+
+    def add(self, article: dict, summary_sentences: list[str] | None = None):
+        """Add or replace one article.
+
+        Args:
+            article (dict): Raw article with `_id`, `title`, `articleUrl`,
+                `publishedAt` and `publisher.name`
+            summary_sentences (list, optional): Summary sentences to index
+                alongside the title
+        """
+        self.add_many([(article, summary_sentences)])
+
+    def add_many(self, items: list[tuple[dict, list[str] | None]]):
+        conn = self._connection()
+
+        with self._write_lock, conn:
+            for article, summary_sentences in items:
+                doc_id = str(article["_id"])
+                terms = Counter()
+                for token in tokenize(article.get("title") or ""):
+                    terms[token] += self.title_weight
+                for sentence in summary_sentences or []:
+                    terms.update(tokenize(sentence))
+
+                self._delete(conn, doc_id)
+
+                published_at = article.get("publishedAt")
+                length = sum(terms.values())
+                conn.execute(
+                    "INSERT INTO docs VALUES (?, ?, ?, ?, ?, ?)",
+                    (
+                        doc_id,
+                        article.get("title") or "",
+                        article.get("articleUrl"),
+                        published_at.timestamp() if published_at else None,
+                        (article.get("publisher") or {}).get("name"),
+                        length,
+                    ),
+                )
+                conn.executemany(
+                    "INSERT INTO postings VALUES (?, ?, ?)",
+                    [(term, doc_id, tf) for term, tf in terms.items()],
+                )
+                conn.execute(
+                    "UPDATE stats SET doc_count = doc_count + 1, total_length = total_length + ?",
+                    (length,),
+                )
+
+    def _delete(self, conn: sqlite3.Connection, doc_id: str):
+        row = conn.execute("SELECT length FROM docs WHERE id = ?", (doc_id,)).fetchone()
+        if row is None:
+            return
+
+        conn.execute("DELETE FROM postings WHERE doc_id = ?", (doc_id,))
+        conn.execute("DELETE FROM docs WHERE id = ?", (doc_id,))
+        conn.execute(
+            "UPDATE stats SET doc_count = doc_count - 1, total_length = total_length - ?",
+            (row[0],),
+        )
+
+    def rebuild(self, batch_size: int = 500):
+        """Index every stored article from MongoDB.
+
+        Summaries are not stored on the article, so the insight reasoning
+        sentences (which are summary sentences) stand in for them.
+        """
+        conn = self._connection()
+        with self._write_lock, conn:
+            conn.execute("DELETE FROM postings")
+            conn.execute("DELETE FROM docs")
+            conn.execute("UPDATE stats SET doc_count = 0, total_length = 0")
+
+        batch = []
+        count = 0
+        for article in find_raw(
+            NewsArticle,
+            projection={**_PROJECTION, "insights.sentimentReasoning": 1},
+        ):
+            sentences = [
+                insight.get("sentimentReasoning", "")
+                for insight in article.get("insights", [])
+            ]
+            batch.append((article, sentences))
+            if len(batch) >= batch_size:
+                self.add_many(batch)
+                count += len(batch)
+                batch = []
+
+        if batch:
+            self.add_many(batch)
+            count += len(batch)
+
+        logger.info(f"Rebuilt news search index with {count} articles")
+
+    def _expand_terms(self, conn: sqlite3.Connection, terms: list[str]) -> list[str]:
+        if not terms:
+            return terms
+
+        prefix = terms[-1]
+        expanded = conn.execute(
+            "SELECT DISTINCT term FROM postings WHERE term >= ? AND term < ? LIMIT ?",
+            (prefix, prefix + "\uffff", self.max_prefix_terms),
+        ).fetchall()
+        return list(dict.fromkeys(terms + [term for (term,) in expanded]))
+
+    def search(
+        self,
+        q,
+        from_datetime=None,
+        to_datetime=None,
+        publisher=None,
+        limit=5,
+        max_time_ms=None,
+    ):
+        conn = self._connection()
+        terms = self._expand_terms(conn, tokenize(q))
+        if not terms:
+            return []
+
+        doc_count, total_length = conn.execute(
+            "SELECT doc_count, total_length FROM stats"
+        ).fetchone()
+        if not doc_count:
+            return []
+        avg_length = total_length / doc_count
+
+        filters = ""
+        params = []
+        if from_datetime:
+            filters += " AND d.published_at >= ?"
+            params.append(from_datetime.timestamp())
+        if to_datetime:
+            filters += " AND d.published_at <= ?"
+            params.append(to_datetime.timestamp())
+        if publisher:
+            filters += " AND d.publisher = ?"
+            params.append(publisher)
+
+        scores = Counter()
+        for term in terms:
+            (df,) = conn.execute(
+                "SELECT COUNT(*) FROM postings WHERE term = ?", (term,)
+            ).fetchone()
+            if not df:
+                continue
+
+            idf = math.log(1 + (doc_count - df + 0.5) / (df + 0.5))
+            for doc_id, tf, length in conn.execute(
+                "SELECT p.doc_id, p.tf, d.length FROM postings p "
+                "JOIN docs d ON d.id = p.doc_id "
+                f"WHERE p.term = ?{filters}",
+                (term, *params),
+            ):
+                norm = self.k1 * (1 - self.b + self.b * length / avg_length)
+                scores[doc_id] += idf * tf * (self.k1 + 1) / (tf + norm)
+
+        top = [doc_id for doc_id, _ in scores.most_common(limit)]
+        if not top:
+            return []
+
+        rows = conn.execute(
+            "SELECT id, title, article_url, published_at, publisher FROM docs "
+            f"WHERE id IN ({','.join('?' * len(top))})",
+            top,
+        ).fetchall()
+        by_id = {row[0]: row for row in rows}
+
+        articles = []
+        for doc_id in top:
+            _, title, article_url, published_at, publisher_name = by_id[doc_id]
+            articles.append(
+                {
+                    "_id": ObjectId(doc_id),
+                    "title": title,
+                    "articleUrl": article_url,
+                    "publishedAt": (
+                        datetime.fromtimestamp(published_at) if published_at else None
+                    ),
+                    "publisher": {"name": publisher_name},
+                }
+            )
+        return articles
+
+
+_backends = {
+    AtlasNewsSearch.name: AtlasNewsSearch,
+    MongoTextNewsSearch.name: MongoTextNewsSearch,
+    BM25NewsSearch.name: BM25NewsSearch,
+}
+_backend = None
+_backend_lock = threading.Lock()
+
+
+def get_news_search_backend() -> NewsSearchBackend:
+    """Backend selected by NEWS_SEARCH_BACKEND (`atlas`, `text` or `bm25`)."""
+    global _backend
+
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                if NEWS_SEARCH_BACKEND not in _backends:
+                    raise ValueError(
+                        f"Invalid NEWS_SEARCH_BACKEND: {NEWS_SEARCH_BACKEND}"
+                    )
+                _backend = _backends[NEWS_SEARCH_BACKEND]()
+
+    return _backend
@@ -0,0 +1,174 @@
+# built-in modules
+import os
+import time
+import asyncio
+
+# pip modules
+from starlette.concurrency import run_in_threadpool
+
+# custom modules
+from services.cache_service import TieredCache
+from services.metrics_service import yfinance_call_duration
+from utils.logger_util import logger
+
+
+# Seconds between upstream polls of a streamed ticker
+POLL_INTERVAL = float(os.getenv("PRICE_POLL_INTERVAL") or 15)
+
+# Price snapshots shared by the REST endpoints of every worker
+price_cache = TieredCache(
+    namespace="prices",
+    ttl=float(os.getenv("PRICE_CACHE_TTL") or 15),
+)
+
+
+def fetch_price(ticker: str, strict: bool = False) -> dict:
+    """Fetch the current price snapshot of a ticker from Yahoo Finance.
+
+    Args:
+        ticker (str): The ticker symbol
+        strict (bool): Raise `KeyError` when a field is missing (e.g. unknown
+            tickers) instead of defaulting it to 0
+    """
+    # yfinance pulls in pandas, so it is imported on first use, not at startup
+    import yfinance as yf
+
+    started_at = time.perf_counter()
+    outcome = "error"
+    try:
+        info = yf.Ticker(ticker).info
+        outcome = "ok"
+    finally:
+        yfinance_call_duration.observe(
+            time.perf_counter() - started_at, "info", outcome
+        )
+
+    if strict:
+        return {
+            "price": info.get("currentPrice", info["regularMarketPrice"]),
+            "price_change": info["regularMarketChange"],
+            "price_change_percent": info["regularMarketChangePercent"],
+            "volume": info["volume"],
+            "avg_volume": info["averageVolume"],
+        }
+
+    return {
+        "price": info.get("currentPrice", info.get("regularMarketPrice", 0)),
+        "price_change": info.get("regularMarketChange", 0),
+        "price_change_percent": info.get("regularMarketChangePercent", 0),
+        "volume": info.get("volume", 0),
+        "avg_volume": info.get("averageVolume", 0),
+    }
+
+
+class PriceSubscription:
+    """A client's view of the hub: only the latest update per ticker is kept.
+
+    Updates that arrive while the client is still sending the previous ones
+    overwrite each other (conflation), so a slow consumer never builds up a
+    backlog and always receives the most recent price.
+    """
+
+    def __init__(self, tickers: set[str]):
+        self.tickers = tickers
+        self._latest: dict[str, dict] = {}
+        self._event = asyncio.Event()
+
+    def push(self, ticker: str, update: dict):
+        self._latest[ticker] = update
+        self._event.set()
+
+    async def next(self, timeout: float) -> dict[str, dict]:
+        """Wait for updates. Returns an empty dict if `timeout` passes first."""
+        try:
+            await asyncio.wait_for(self._event.wait(), timeout=timeout)
+        except asyncio.TimeoutError:
+            return {}
+
+        self._event.clear()
+        latest, self._latest = self._latest, {}
+        return latest
+
+
+class PriceHub:
+    """Fans price updates out to subscribers with one poller per ticker.
+
+    A poller task is started when the first client subscribes to a ticker and
+    stopped when the last one leaves, so upstream calls scale with the number
+    of distinct tickers rather than the number of clients. Subscribers only
+    get updates when the price snapshot changes.
+
+    Args:
+        poll_interval (float): Seconds between polls of a ticker
+        fetch: Callable returning the price snapshot of a ticker
+    """
+
+    def __init__(self, poll_interval: float = POLL_INTERVAL, fetch=fetch_price):
+        self.poll_interval = poll_interval
+        self.fetch = fetch
+
+        self._subscribers: dict[str, set[PriceSubscription]] = {}
+        self._pollers: dict[str, asyncio.Task] = {}
+        self._latest: dict[str, dict] = {}
+
+        self.upstream_calls = 0
+
+    def stats(self) -> dict:
+        return {
+            "tickers": len(self._pollers),
+            "subscriptions": sum(len(subs) for subs in self._subscribers.values()),
+            "upstream_calls": self.upstream_calls,
+        }
+
+    def subscribe(self, tickers: set[str]) -> PriceSubscription:
+        subscription = PriceSubscription(tickers)
+
+        for ticker in tickers:
+            self._subscribers.setdefault(ticker, set()).add(subscription)
+
+            # Late joiners start from the last known price
+            if ticker in self._latest:
+                subscription.push(ticker, self._latest[ticker])
+
+            if ticker not in self._pollers:
+                self._pollers[ticker] = asyncio.create_task(self._poll(ticker))
+
+        return subscription
+
+    def unsubscribe(self, subscription: PriceSubscription):
+        for ticker in subscription.tickers:
+            subscribers = self._subscribers.get(ticker)
+            if subscribers is None:
+                continue
+
+            subscribers.discard(subscription)
+            if not subscribers:
+                del self._subscribers[ticker]
+                self._latest.pop(ticker, None)
+                poller = self._pollers.pop(ticker, None)
+                if poller is not None:
+                    poller.cancel()
+
+    async def _poll(self, ticker: str):
+        while ticker in self._subscribers:
+            try:
+                self.upstream_calls += 1
+                price = await run_in_threadpool(self.fetch, ticker)
+            except Exception as e:
+                logger.warning(f"Failed to fetch price for {ticker}: {e}")
+                price = None
+
+            if price is not None and price != (self._latest.get(ticker) or {}).get("data"):
+                update = {
+                    "ticker": ticker,
+                    "data": price,
+                    "t": int(time.time() * 1000),
+                }
+                self._latest[ticker] = update
+                for subscription in list(self._subscribers.get(ticker, ())):
+                    subscription.push(ticker, update)
+
+            await asyncio.sleep(self.poll_interval)
+
+
+price_hub = PriceHub()
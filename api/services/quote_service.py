@@ -0,0 +1,64 @@
+# built-in modules
+import os
+import time
+
+# custom modules
+from services.cache_service import TieredCache
+from services.metrics_service import yfinance_call_duration
+
+
+# Historical bars shared by every worker
+quote_cache = TieredCache(
+    namespace="quotes",
+    ttl=float(os.getenv("QUOTES_CACHE_TTL") or 60),
+)
+
+
+def fetch_quotes(
+    ticker: str,
+    period: str | None = None,
+    interval: str | None = None,
+    start: str | None = None,
+    end: str | None = None,
+) -> list[dict]:
+    """Fetch OHLCV bars of a ticker from Yahoo Finance.
+
+    Returns:
+        list: Bars as `{"o", "c", "h", "l", "v", "t"}` dicts, `t` in epoch ms
+    """
+    # yfinance pulls in pandas, so it is imported on first use, not at startup
+    import yfinance as yf
+
+    started_at = time.perf_counter()
+    outcome = "error"
+    try:
+        quotes = yf.Ticker(ticker).history(
+            period=period or "1mo", interval=interval or "1d", start=start, end=end
+        )
+        outcome = "ok"
+    finally:
+        yfinance_call_duration.observe(
+            time.perf_counter() - started_at, "history", outcome
+        )
+
+    quotes_dict = (
+        quotes[["Open", "Close", "High", "Low", "Volume"]]
+        .round(2)
+        .to_dict(orient="index")
+    )
+
+    quotes_arr = []
+
+    for quote in quotes_dict.items():
+        quotes_arr.append(
+            {
+                "o": quote[1]["Open"],
+                "c": quote[1]["Close"],
+                "h": quote[1]["High"],
+                "l": quote[1]["Low"],
+                "v": quote[1]["Volume"],
+                "t": int(quote[0].timestamp() * 1000),
+            }
+        )
+
+    return quotes_arr
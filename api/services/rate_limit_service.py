@@ -0,0 +1,213 @@
+# built-in modules
+import os
+import time
+import threading
+from collections import OrderedDict
+from datetime import datetime
+
+# custom modules
+from models.apiUsage_model import ApiQuota, ApiUsage
+from models.user_model import User
+from utils.logger_util import logger
+
+
+class TokenBucket:
+    def __init__(
+        self,
+        capacity: float,
+        refill_rate: float,
+        tokens: float | None = None,
+        refilled_at: float | None = None,
+    ):
+        self.capacity = capacity
+        self.refill_rate = refill_rate
+        self.tokens = capacity if tokens is None else min(tokens, capacity)
+        self.refilled_at = time.time() if refilled_at is None else refilled_at
+
+    def _refill(self, now: float):
+        elapsed = max(0.0, now - self.refilled_at)
+        self.tokens = min(self.capacity, self.tokens + elapsed * self.refill_rate)
+        self.refilled_at = now
+
+    def consume(self, cost: float, now: float) -> float:
+        """Take `cost` tokens from the bucket.
+
+        Returns:
+            float: 0 if the tokens were taken, otherwise the number of seconds
+            until enough tokens will be available.
+        """
+        self._refill(now)
+
+        if self.tokens >= cost:
+            self.tokens -= cost
+            return 0.0
+
+        if cost > self.capacity:
+            return float("inf")
+
+        return (cost - self.tokens) / self.refill_rate
+
+
+class RateLimiter:
+    """Per API key token buckets with usage accounting.
+
+    Buckets live in process memory. When `persist` is enabled the bucket
+    state is loaded from and flushed to the `api_quotas` collection so that
+    restarts do not hand every key a full bucket. Usage is always aggregated
+    per key, day and route and flushed to `api_usage` for billing.
+    """
+
+    def __init__(
+        self,
+        capacity: float = 60,
+        refill_rate: float = 1,
+        persist: bool = False,
+        flush_interval: float = 30,
+        max_keys: int = 10000,
+    ):
+        self.capacity = capacity
+        self.refill_rate = refill_rate
+        self.persist = persist
+        self.flush_interval = flush_interval
+        self.max_keys = max_keys
+
+        self._buckets: OrderedDict[str, TokenBucket] = OrderedDict()
+        self._usage: dict[tuple[str, str, str], list[int]] = {}
+        self._dirty: set[str] = set()
+        self._lock = threading.Lock()
+        self._flushed_at = time.time()
+        self._flushing = False
+
+    @classmethod
+    def from_env(cls) -> "RateLimiter":
+        return cls(
+            capacity=float(os.getenv("RATE_LIMIT_CAPACITY") or 60),
+            refill_rate=float(os.getenv("RATE_LIMIT_REFILL_RATE") or 1),
+            persist=(os.getenv("RATE_LIMIT_PERSIST") or "").lower() == "true",
+            flush_interval=float(os.getenv("RATE_LIMIT_FLUSH_INTERVAL") or 30),
+        )
+
+    def is_loaded(self, api_key: str) -> bool:
+        return api_key in self._buckets
+
+    def load(self, api_key: str) -> bool:
+        """Create the bucket of `api_key`, restoring its persisted state if any.
+
+        Returns:
+            bool: False, without creating a bucket, when no user has the key
+        """
+        quota = None
+        try:
+            if not User.objects(api_key=api_key).only("id").first():
+                return False
+            if self.persist:
+                quota = ApiQuota.objects(api_key=api_key).first()
+        except Exception as e:
+            logger.error(f"Failed to load quota for API key: {e}")
+            return False
+
+        with self._lock:
+            if api_key in self._buckets:
+                return True
+
+            self._buckets[api_key] = TokenBucket(
+                self.capacity,
+                self.refill_rate,
+                tokens=quota.tokens if quota else None,
+                refilled_at=quota.refilled_at if quota else None,
+            )
+            while len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+        return True
+
+    def acquire(
+        self, api_key: str, route: str, cost: int, record: bool = True
+    ) -> tuple[bool, float, float]:
+        """Charge `cost` tokens to `api_key` for a request to `route`.
+
+        Without `record` the request is limited but not counted as usage,
+        for buckets that are not an API key's.
+
+        Returns:
+            tuple: (allowed, retry_after, remaining)
+        """
+        now = time.time()
+
+        with self._lock:
+            bucket = self._buckets.get(api_key)
+            if bucket is None:
+                bucket = TokenBucket(self.capacity, self.refill_rate)
+                self._buckets[api_key] = bucket
+            self._buckets.move_to_end(api_key)
+
+            retry_after = bucket.consume(cost, now)
+            if retry_after:
+                return False, retry_after, bucket.tokens
+            if not record:
+                return True, 0.0, bucket.tokens
+
+            usage_key = (api_key, datetime.now().strftime("%Y-%m-%d"), route)
+            usage = self._usage.setdefault(usage_key, [0, 0])
+            usage[0] += 1
+            usage[1] += cost
+            self._dirty.add(api_key)
+
+            return True, 0.0, bucket.tokens
+
+    def should_flush(self) -> bool:
+        return (
+            not self._flushing
+            and (self._usage or self._dirty)
+            and time.time() - self._flushed_at >= self.flush_interval
+        )
+
+    def flush(self):
+        """Write aggregated usage (and bucket state when persisting) to MongoDB."""
+        with self._lock:
+            if self._flushing:
+                return
+            self._flushing = True
+            usage, self._usage = self._usage, {}
+            dirty, self._dirty = self._dirty, set()
+            buckets = {
+                key: (self._buckets[key].tokens, self._buckets[key].refilled_at)
+                for key in dirty
+                if key in self._buckets
+            }
+
+        # Rows leave the snapshot once written, so a failure part way through
+        # only carries the unwritten ones over and nothing is counted twice
+        try:
+            while usage:
+                (api_key, day, route), (requests, cost) = next(iter(usage.items()))
+                ApiUsage.objects(api_key=api_key, day=day, route=route).update_one(
+                    inc__requests=requests,
+                    inc__cost=cost,
+                    set__updated_at=datetime.now(),
+                    upsert=True,
+                )
+                del usage[(api_key, day, route)]
+
+            if self.persist:
+                while buckets:
+                    api_key, (tokens, refilled_at) = next(iter(buckets.items()))
+                    ApiQuota.objects(api_key=api_key).update_one(
+                        set__tokens=tokens,
+                        set__refilled_at=refilled_at,
+                        set__updated_at=datetime.now(),
+                        upsert=True,
+                    )
+                    del buckets[api_key]
+        except Exception as e:
+            logger.error(f"Failed to flush API usage: {e}")
+            # Keep the unwritten counts so they are written on the next flush
+            with self._lock:
+                for key, (requests, cost) in usage.items():
+                    pending = self._usage.setdefault(key, [0, 0])
+                    pending[0] += requests
+                    pending[1] += cost
+                self._dirty.update(buckets)
+        finally:
+            with self._lock:
+                self._flushed_at = time.time()
+                self._flushing = False
@@ -0,0 +1,83 @@
+# built-in modules
+import os
+
+# pip modules
+import pymongo
+from mongoengine.errors import LookUpError
+from pymongo.cursor import Cursor
+
+
+# Documents per round trip for list endpoints. The driver default (101 docs
+# in the first batch) means several round trips for a 1000 item page.
+BATCH_SIZE = int(os.getenv("READ_BATCH_SIZE") or 500)
+
+
+def get_collection(document_cls):
+    return document_cls._get_collection()
+
+
+def db_field_name(document_cls, name: str) -> str:
+    """Translate a model or db field name (dotted for embedded fields) to the
+    db field name, raising ValueError when the model has no such field.
+
+    Field names taken from requests go through here, so they never reach
+    Mongo as operators (`$...`) or arbitrary paths.
+    """
+    parts = name.replace("__", ".").split(".")
+    model_names = {field.db_field: key for key, field in document_cls._fields.items()}
+    parts[0] = model_names.get(parts[0], parts[0])
+    try:
+        return document_cls._translate_field_name(".".join(parts))
+    except LookUpError:
+        raise ValueError(f"Unknown field: {name}")
+
+
+def sort_spec(document_cls, sort_by: str, descending: bool = False) -> list[tuple]:
+    """Build a pymongo sort spec, accepting model or db field names.
+
+    Raises:
+        ValueError: `sort_by` is not a field of the model
+    """
+    key = db_field_name(document_cls, sort_by)
+    return [(key, pymongo.DESCENDING if descending else pymongo.ASCENDING)]
+
+
+def find_raw(
+    document_cls,
+    filter: dict | None = None,
+    projection: dict | None = None,
+    sort: list[tuple] | None = None,
+    skip: int = 0,
+    limit: int = 0,
+    batch_size: int = BATCH_SIZE,
+) -> Cursor:
+    """Query a model's collection directly and return a raw pymongo cursor.
+
+    Filters, projections and sort keys use db field names (e.g. `publishedAt`).
+    No MongoEngine documents are built; callers get plain dicts.
+    """
+    cursor = get_collection(document_cls).find(
+        filter or {},
+        projection,
+        skip=skip,
+        limit=limit,
+        batch_size=batch_size,
+    )
+
+    if sort:
+        cursor = cursor.sort(sort)
+
+    return cursor
+
+
+def find_one_raw(
+    document_cls,
+    filter: dict,
+    projection: dict | None = None,
+    sort: list[tuple] | None = None,
+) -> dict | None:
+    return get_collection(document_cls).find_one(filter, projection, sort=sort)
+
+
+def count_raw(document_cls, filter: dict | None = None) -> int:
+    return get_collection(document_cls).count_documents(filter or {})
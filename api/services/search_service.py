@@ -0,0 +1,244 @@
+# built-in modules
+import os
+import asyncio
+import time
+from datetime import datetime
+
+# pip modules
+from starlette.concurrency import run_in_threadpool
+
+# custom modules
+from models.stock_model import Stock
+from models.index_model import Index
+from models.newsArticle_model import NewsArticle
+from services.cache_service import TieredCache
+from services.news_search_service import get_news_search_backend
+from services.read_service import find_one_raw
+from utils.logger_util import logger
+
+
+# Seconds a single source may take, and seconds for the whole search
+SOURCE_TIMEOUT = float(os.getenv("SEARCH_SOURCE_TIMEOUT") or 1.5)
+DEADLINE = float(os.getenv("SEARCH_DEADLINE") or 2.0)
+
+# Cached search responses, keyed by the normalised query parameters.
+# Responses that include news live in their own namespace so they can be
+# dropped when new articles arrive.
+search_cache = TieredCache(
+    namespace="search",
+    ttl=float(os.getenv("SEARCH_CACHE_TTL") or 300),
+    l1_capacity=int(os.getenv("SEARCH_CACHE_SIZE") or 2048),
+    log_every=int(os.getenv("SEARCH_CACHE_LOG_EVERY") or 1000),
+)
+news_search_cache = TieredCache(
+    namespace="search-news",
+    ttl=float(os.getenv("SEARCH_CACHE_TTL") or 300),
+    l1_capacity=int(os.getenv("SEARCH_CACHE_SIZE") or 2048),
+    log_every=int(os.getenv("SEARCH_CACHE_LOG_EVERY") or 1000),
+)
+
+
+def search_cache_key(
+    q: str,
+    type_: str | None,
+    from_date: str | None,
+    to_date: str | None,
+    source: str | None,
+) -> tuple:
+    return (
+        " ".join(q.lower().split()),
+        (type_ or "").lower(),
+        from_date or "",
+        to_date or "",
+        source or "",
+    )
+
+
+class NewsIngestWatcher:
+    """Notices newly ingested articles by polling the newest `_id`.
+
+    The scrapers run in their own processes, so the API cannot be told
+    directly. Polling the `_id` index is cheap and is done at most once
+    every `interval` seconds.
+    """
+
+    def __init__(self, interval: float = 15):
+        self.interval = interval
+        self._latest_id = None
+        self._checked_at = 0.0
+
+    def is_due(self) -> bool:
+        return time.time() - self._checked_at >= self.interval
+
+    def check(self) -> bool:
+        """Return True if an article newer than the last seen one exists."""
+        self._checked_at = time.time()
+        latest = find_one_raw(NewsArticle, {}, {"_id": 1}, sort=[("_id", -1)])
+        latest_id = latest["_id"] if latest else None
+
+        changed = self._latest_id is not None and latest_id != self._latest_id
+        self._latest_id = latest_id
+        return changed
+
+
+news_ingest_watcher = NewsIngestWatcher(
+    interval=float(os.getenv("NEWS_CHECK_INTERVAL") or 15),
+)
+
+
+async def expire_stale_news():
+    """Drop cached news results once new articles have been ingested."""
+    if not news_ingest_watcher.is_due():
+        return
+
+    try:
+        if await run_in_threadpool(news_ingest_watcher.check):
+            await run_in_threadpool(news_search_cache.invalidate)
+    except Exception as e:
+        logger.error(f"Failed to check for new articles: {e}")
+
+
+def _aggregate(document_cls, pipeline: list, max_time_ms: int | None) -> list[dict]:
+    kwargs = {"maxTimeMS": max_time_ms} if max_time_ms else {}
+    return document_cls.objects.aggregate(pipeline, **kwargs).to_list()
+
+
+def search_stocks(q: str, limit: int = 5, max_time_ms: int | None = None) -> list[dict]:
+    return _aggregate(
+        Stock,
+        [
+            {
+                "$search": {
+                    "index": "stocks",
+                    "text": {
+                        "query": q,
+                        "path": [
+                            "ticker",
+                            "companyName",
+                        ],
+                    },
+                }
+            },
+            {"$limit": limit},
+            {
+                "$project": {
+                    "_id": 1,
+                    "ticker": 1,
+                    "companyName": 1,
+                    "market": 1,
+                }
+            },
+        ],
+        max_time_ms,
+    )
+
+
+def search_indices(q: str, limit: int = 5, max_time_ms: int | None = None) -> list[dict]:
+    return _aggregate(
+        Index,
+        [
+            {
+                "$search": {
+                    "index": "indices",
+                    "text": {
+                        "query": q,
+                        "path": [
+                            "ticker",
+                            "name",
+                        ],
+                    },
+                }
+            },
+            {"$limit": limit},
+            {
+                "$project": {
+                    "_id": 1,
+                    "ticker": 1,
+                    "name": 1,
+                    "market": 1,
+                }
+            },
+        ],
+        max_time_ms,
+    )
+
+
+def search_news(
+    q: str,
+    from_datetime: datetime | None = None,
+    to_datetime: datetime | None = None,
+    publisher: str | None = None,
+    limit: int = 5,
+    max_time_ms: int | None = None,
+) -> list[dict]:
+    """Full-text search over news articles using the configured backend.
+
+    Args:
+        q (str): Search query
+        from_datetime (datetime, optional): Only articles published after this
+        to_datetime (datetime, optional): Only articles published before this
+        publisher (str, optional): Only articles from this publisher
+        limit (int, optional): Maximum number of articles. Defaults to 5.
+    """
+    return get_news_search_backend().search(
+        q,
+        from_datetime=from_datetime,
+        to_datetime=to_datetime,
+        publisher=publisher,
+        limit=limit,
+        max_time_ms=max_time_ms,
+    )
+
+
+async def fan_out(
+    sources: dict,
+    source_timeout: float = SOURCE_TIMEOUT,
+    deadline: float = DEADLINE,
+) -> tuple[dict[str, list], list[str]]:
+    """Run blocking search callables concurrently on the thread pool.
+
+    Each callable receives `max_time_ms` so MongoDB abandons the query
+    server side once the source timeout has passed.
+
+    Args:
+        sources (dict): Source name -> callable accepting `max_time_ms`
+        source_timeout (float): Seconds allowed per source
+        deadline (float): Seconds allowed for all sources together
+
+    Returns:
+        tuple: (results by source name, names of sources that timed out or failed)
+    """
+    max_time_ms = int(source_timeout * 1000)
+    started_at = time.perf_counter()
+
+    async def run(fn):
+        return await asyncio.wait_for(
+            run_in_threadpool(fn, max_time_ms=max_time_ms), timeout=source_timeout
+        )
+
+    tasks = {name: asyncio.create_task(run(fn)) for name, fn in sources.items()}
+    if tasks:
+        await asyncio.wait(tasks.values(), timeout=deadline)
+
+    results = {}
+    incomplete = []
+    for name, task in tasks.items():
+        if not task.done():
+            task.cancel()
+            incomplete.append(name)
+        elif task.cancelled() or task.exception() is not None:
+            if not task.cancelled() and not isinstance(
+                task.exception(), asyncio.TimeoutError
+            ):
+                logger.error(f"Search source '{name}' failed: {task.exception()}")
+            incomplete.append(name)
+        else:
+            results[name] = task.result()
+
+    if incomplete:
+        logger.warning(
+            f"Search returned partial results after {time.perf_counter() - started_at:.2f}s, "
+            f"missing: {', '.join(incomplete)}"
+        )
+
+    return results, incomplete
@@ -0,0 +1,132 @@
+# built-in modules
+import os
+import time
+import hashlib
+import threading
+from collections import OrderedDict
+
+# custom modules
+from services.cache_service import (
+    CACHE_GENERATION_CHECK_INTERVAL,
+    CacheBackend,
+    get_cache_backend,
+)
+
+
+class TokenCache:
+    """Short-lived cache of decoded JWTs and the user payload they resolve to.
+
+    Entries are keyed by the SHA-256 of the token and never outlive the
+    token's own `exp` claim. Entries can be dropped per user (by email) when
+    the user document changes.
+
+    Other workers hold their own entries, so `invalidate_user` also bumps a
+    generation counter in the shared cache backend, as
+    `TieredCache.invalidate` does; a worker that notices a new generation
+    (checked at most every CACHE_GENERATION_CHECK_INTERVAL seconds) drops
+    all of its entries.
+    """
+
+    _GENERATION_KEY = "auth-tokens:generation"
+
+    def __init__(
+        self,
+        ttl: float = 60,
+        max_size: int = 10000,
+        backend: CacheBackend | None = None,
+    ):
+        self.ttl = ttl
+        self.max_size = max_size
+        self._entries: OrderedDict[str, tuple[float, str, dict]] = OrderedDict()
+        self._by_email: dict[str, set[str]] = {}
+        self._lock = threading.Lock()
+        self._backend = backend
+
+        self._generation = 0
+        self._generation_checked_at = 0.0
+
+    @property
+    def backend(self) -> CacheBackend:
+        if self._backend is None:
+            self._backend = get_cache_backend()
+        return self._backend
+
+    def _check_generation(self):
+        now = time.monotonic()
+        if now - self._generation_checked_at < CACHE_GENERATION_CHECK_INTERVAL:
+            return
+
+        self._generation_checked_at = now
+        generation = self.backend.get_counter(self._GENERATION_KEY)
+        if generation != self._generation:
+            self._generation = generation
+            self.clear()
+
+    @staticmethod
+    def _hash(token: str) -> str:
+        return hashlib.sha256(token.encode()).hexdigest()
+
+    def get(self, token: str) -> dict | None:
+        self._check_generation()
+        key = self._hash(token)
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+
+            expires_at, email, user = entry
+            if expires_at <= time.time():
+                self._remove(key, email)
+                return None
+
+            self._entries.move_to_end(key)
+            return dict(user)
+
+    def set(self, token: str, payload: dict, user: dict):
+        if self.ttl <= 0:
+            return
+
+        key = self._hash(token)
+        email = payload["sub"]
+        expires_at = min(float(payload["exp"]), time.time() + self.ttl)
+
+        with self._lock:
+            self._entries[key] = (expires_at, email, dict(user))
+            self._entries.move_to_end(key)
+            self._by_email.setdefault(email, set()).add(key)
+
+            while len(self._entries) > self.max_size:
+                old_key, (_, old_email, _) = self._entries.popitem(last=False)
+                self._discard_email_key(old_key, old_email)
+
+    def invalidate_user(self, email: str):
+        with self._lock:
+            for key in self._by_email.pop(email, set()):
+                self._entries.pop(key, None)
+
+        # Other workers can't drop a single user's entries, they drop all
+        self._generation = self.backend.incr(self._GENERATION_KEY)
+        self._generation_checked_at = time.monotonic()
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._by_email.clear()
+
+    def _remove(self, key: str, email: str):
+        self._entries.pop(key, None)
+        self._discard_email_key(key, email)
+
+    def _discard_email_key(self, key: str, email: str):
+        keys = self._by_email.get(email)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._by_email[email]
+
+
+token_cache = TokenCache(
+    ttl=float(os.getenv("AUTH_CACHE_TTL") or 60),
+    max_size=int(os.getenv("AUTH_CACHE_MAX_SIZE") or 10000),
+)
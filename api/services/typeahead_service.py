@@ -0,0 +1,290 @@
+# built-in modules
+import os
+import re
+import time
+import threading
+
+# pip modules
+import orjson
+import marisa_trie
+from bson import ObjectId
+from rapidfuzz import fuzz, process
+
+# custom modules
+from models.stock_model import Stock
+from models.index_model import Index
+from services.read_service import find_raw, get_collection
+from utils.logger_util import logger
+
+
+# Local in-process index ("local") or Atlas Search ("atlas")
+SEARCH_BACKEND = (os.getenv("SEARCH_BACKEND") or "local").lower()
+# Snapshot written by the serving process and memory-mapped by the workers
+TYPEAHEAD_SNAPSHOT_PATH = os.getenv("TYPEAHEAD_SNAPSHOT_PATH") or os.path.join(
+    os.getcwd(), ".cache", "typeahead.marisa"
+)
+
+_WORD_START = re.compile(r"(?<![\w])\w")
+
+
+def _normalize(text: str) -> str:
+    return " ".join(text.lower().split())
+
+
+def _freeze(value):
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+class TypeaheadIndex:
+    """In-memory prefix and fuzzy index over stock and index tickers/names.
+
+    Every ticker, every name and every word-suffix of a name ("apple inc",
+    "inc") is stored in a marisa-trie that maps to the entry it came from,
+    so prefix lookups are a single trie walk. When prefixes come up short
+    RapidFuzz compares the query with the same-length prefix of every name
+    for typo tolerance.
+
+    The index is rebuilt in the background when the stocks or indices
+    collections change (count or latest `updatedAt`), checked at most every
+    `refresh_interval` seconds.
+    """
+
+    def __init__(
+        self,
+        refresh_interval: float = 60,
+        fuzzy_cutoff: float = 80,
+        max_candidates: int = 1000,
+    ):
+        self.refresh_interval = refresh_interval
+        self.fuzzy_cutoff = fuzzy_cutoff
+        # Upper bound on trie keys scanned for very common prefixes ("inc")
+        self.max_candidates = max_candidates
+
+        self._entries: list[tuple[dict, int]] = []
+        self._trie = marisa_trie.RecordTrie("<I")
+        self._names: list[str] = []
+        self._name_prefixes: dict[int, list[str]] = {}
+        self._version = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+        self._refreshing = False
+
+    @property
+    def is_built(self) -> bool:
+        return self._version is not None
+
+    def build(self, stocks: list[dict], indices: list[dict], version=None):
+        """Build the index from raw stock and index documents."""
+        entries = []
+        records = []
+
+        for doc, name_key, market in (
+            *((doc, "companyName", "stocks") for doc in stocks),
+            *((doc, "name", "indices") for doc in indices),
+        ):
+            ticker = doc.get("ticker")
+            if not ticker:
+                continue
+
+            name = doc.get(name_key) or ""
+            entry = {
+                "_id": doc["_id"],
+                "ticker": ticker,
+                name_key: name,
+                "market": doc.get("market") or market,
+            }
+            entry_id = len(entries)
+            entries.append((entry, doc.get("marketCap") or 0))
+
+            keys = {_normalize(ticker)}
+            normalized_name = _normalize(name)
+            for match in _WORD_START.finditer(normalized_name):
+                keys.add(normalized_name[match.start() :])
+
+            records.extend((key, (entry_id,)) for key in keys if key)
+
+        trie = marisa_trie.RecordTrie("<I", records)
+        names = [
+            _normalize(entry.get("companyName") or entry.get("name") or "")
+            for entry, _ in entries
+        ]
+
+        # Swap everything in at once so readers never see a half-built index
+        self._entries, self._trie, self._names = entries, trie, names
+        self._name_prefixes = {}
+        self._version = version if version is not None else time.time()
+
+        logger.info(f"Built typeahead index with {len(entries)} tickers")
+
+    def search(self, q: str, market: str | None = None, limit: int = 5) -> list[dict]:
+        """Return up to `limit` entries matching `q`.
+
+        Exact ticker matches rank first, then ticker prefixes, then name
+        prefixes; ties are broken by market cap. Fuzzy name matches fill in
+        when there are not enough prefix matches.
+        """
+        query = _normalize(q)
+        if not query:
+            return []
+
+        entries, trie = self._entries, self._trie
+
+        scored = {}
+        for i, (key, (entry_id,)) in enumerate(trie.iteritems(query)):
+            if i >= self.max_candidates:
+                break
+
+            entry, market_cap = entries[entry_id]
+            if market and entry["market"] != market:
+                continue
+
+            ticker = entry["ticker"].lower()
+            if ticker == query:
+                rank = 0
+            elif key == ticker:
+                rank = 1
+            else:
+                rank = 2
+
+            best = scored.get(entry_id)
+            if best is None or rank < best[0]:
+                scored[entry_id] = (rank, -market_cap)
+
+        if len(scored) < limit and len(query) >= 3:
+            for _, score, entry_id in process.extract(
+                query,
+                self._get_name_prefixes(len(query)),
+                scorer=fuzz.ratio,
+                limit=limit * 2,
+                score_cutoff=self.fuzzy_cutoff,
+            ):
+                entry, market_cap = entries[entry_id]
+                if entry_id in scored or (market and entry["market"] != market):
+                    continue
+                scored[entry_id] = (3, -score, -market_cap)
+
+        ranked = sorted(scored, key=scored.get)[:limit]
+        return [dict(entries[entry_id][0]) for entry_id in ranked]
+
+    def _get_name_prefixes(self, length: int) -> list[str]:
+        names = self._names
+        prefixes = self._name_prefixes.get(length)
+        if prefixes is None or len(prefixes) != len(names):
+            prefixes = [name[:length] for name in names]
+            self._name_prefixes[length] = prefixes
+        return prefixes
+
+    def save(self, path: str = TYPEAHEAD_SNAPSHOT_PATH):
+        """Write the index to `path` (the trie) and `path`.json (the entries)."""
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        # Write to temporary files first so readers never see a partial snapshot
+        self._trie.save(path + ".tmp")
+        with open(path + ".json.tmp", "wb") as f:
+            f.write(
+                orjson.dumps(
+                    {
+                        "version": self._version,
+                        "entries": [
+                            [{**entry, "_id": str(entry["_id"])}, market_cap]
+                            for entry, market_cap in self._entries
+                        ],
+                        "names": self._names,
+                    },
+                    default=str,
+                )
+            )
+        os.replace(path + ".json.tmp", path + ".json")
+        os.replace(path + ".tmp", path)
+
+    def load(self, path: str = TYPEAHEAD_SNAPSHOT_PATH):
+        """Load a snapshot written by `save`.
+
+        The trie is memory-mapped, so every worker on the host shares the
+        same physical pages instead of holding its own copy.
+        """
+        trie = marisa_trie.RecordTrie("<I")
+        trie.mmap(path)
+        with open(path + ".json", "rb") as f:
+            snapshot = orjson.loads(f.read())
+
+        entries = [
+            ({**entry, "_id": ObjectId(entry["_id"])}, market_cap)
+            for entry, market_cap in snapshot["entries"]
+        ]
+
+        self._entries, self._trie, self._names = entries, trie, snapshot["names"]
+        self._name_prefixes = {}
+        # The snapshot's version is a JSON copy, so the first refresh check
+        # compares against the collections and rebuilds only if they changed
+        self._version = _freeze(snapshot["version"])
+        self._checked_at = time.time()
+
+        logger.info(f"Loaded typeahead index with {len(entries)} tickers from {path}")
+
+    def _collection_version(self) -> tuple:
+        version = []
+        for model in (Stock, Index):
+            latest = get_collection(model).find_one(
+                {}, {"updatedAt": 1}, sort=[("updatedAt", -1)]
+            )
+            updated_at = latest.get("updatedAt") if latest else None
+            version.append(
+                (
+                    get_collection(model).estimated_document_count(),
+                    updated_at.isoformat() if updated_at else None,
+                )
+            )
+        return tuple(version)
+
+    def refresh(self, force: bool = False):
+        """Rebuild the index if the underlying collections changed."""
+        version = self._collection_version()
+        self._checked_at = time.time()
+        if not force and version == self._version:
+            return
+
+        stocks = list(
+            find_raw(
+                Stock,
+                projection={"ticker": 1, "companyName": 1, "market": 1, "marketCap": 1},
+            )
+        )
+        indices = list(find_raw(Index, projection={"ticker": 1, "name": 1, "market": 1}))
+        self.build(stocks, indices, version)
+
+    def _refresh_in_background(self):
+        try:
+            self.refresh()
+        except Exception as e:
+            logger.error(f"Failed to refresh typeahead index: {e}")
+        finally:
+            self._refreshing = False
+
+    def ensure_fresh(self):
+        """Build the index on first use, then refresh it in the background
+        once `refresh_interval` has passed."""
+        if not self.is_built:
+            with self._lock:
+                if not self.is_built:
+                    self.refresh(force=True)
+            return
+
+        if time.time() - self._checked_at < self.refresh_interval:
+            return
+
+        with self._lock:
+            if self._refreshing:
+                return
+            self._refreshing = True
+            self._checked_at = time.time()
+
+        threading.Thread(target=self._refresh_in_background, daemon=True).start()
+
+
+typeahead_index = TypeaheadIndex(
+    refresh_interval=float(os.getenv("TYPEAHEAD_REFRESH_INTERVAL") or 60),
+)
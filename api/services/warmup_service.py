@@ -0,0 +1,62 @@
+# built-in modules
+import os
+import time
+
+# custom modules
+from services.cache_service import get_cache_backend
+from services.news_search_service import get_news_search_backend
+from services.typeahead_service import (
+    SEARCH_BACKEND,
+    TYPEAHEAD_SNAPSHOT_PATH,
+    typeahead_index,
+)
+from utils.logger_util import logger
+
+
+def preload():
+    """Build shared read-only state once, in the serving process.
+
+    uvicorn starts its workers with `spawn`, so nothing built here is
+    inherited copy-on-write. Instead the ticker universe is written to a
+    memory-mapped snapshot that every worker maps, sharing one copy through
+    the page cache, and workers skip the Mongo scan on startup.
+    """
+    if SEARCH_BACKEND != "local":
+        return
+
+    started_at = time.perf_counter()
+    typeahead_index.refresh(force=True)
+    typeahead_index.save(TYPEAHEAD_SNAPSHOT_PATH)
+    os.environ["TYPEAHEAD_PRELOADED"] = "1"
+
+    logger.info(
+        f"Preloaded typeahead snapshot in {time.perf_counter() - started_at:.2f}s"
+    )
+
+
+def warm_up():
+    """Fill this worker's in-process state before it takes traffic."""
+    started_at = time.perf_counter()
+
+    if SEARCH_BACKEND == "local":
+        try:
+            if os.getenv("TYPEAHEAD_PRELOADED") and os.path.exists(
+                TYPEAHEAD_SNAPSHOT_PATH
+            ):
+                typeahead_index.load(TYPEAHEAD_SNAPSHOT_PATH)
+            else:
+                typeahead_index.refresh(force=True)
+        except Exception as e:
+            # Search builds the index lazily on first use instead
+            logger.error(f"Failed to warm up typeahead index: {e}")
+
+    for name, init in (
+        ("news search backend", get_news_search_backend),
+        ("cache backend", get_cache_backend),
+    ):
+        try:
+            init()
+        except Exception as e:
+            logger.error(f"Failed to initialise {name}: {e}")
+
+    logger.info(f"Worker warmed up in {time.perf_counter() - started_at:.2f}s")
@@ -0,0 +1,50 @@
+# built-in modules
+import os
+import sys
+
+# Defaults for a self-contained run, set before the app modules are imported
+os.environ.setdefault("CACHE_BACKEND", "memory")
+os.environ.setdefault("NEWS_SEARCH_BACKEND", "text")
+os.environ.setdefault("JWT_SECRET_KEY", "tests")
+os.environ.setdefault("JWT_ALGORITHM", "HS256")
+os.environ.setdefault("JWT_EXPIRATION_TIME", "60")
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+# pip modules
+import mongomock
+import pytest
+from fastapi import APIRouter, FastAPI
+from fastapi.testclient import TestClient
+from mongoengine import connect, disconnect, connection
+
+# custom modules
+from dependencies.user_dependency import verfiy_api_key
+from middlewares.rate_limit_middleware import RateLimitMiddleware
+
+
+@pytest.fixture
+def db():
+    """A fresh mongomock database registered as the default connection."""
+    connect(db="finoxa_test", alias="default", mongo_client_class=mongomock.MongoClient)
+    yield connection.get_db()
+    disconnect(alias="default")
+
+
+@pytest.fixture
+def make_client():
+    """Builds a client for an app serving `router` under `prefix`.
+
+    API keys are accepted as is, unless a `limiter` is given: the rate limit
+    middleware then checks them against the database.
+    """
+
+    def make(router: APIRouter, prefix: str, limiter=None) -> TestClient:
+        app = FastAPI()
+        if limiter is not None:
+            app.add_middleware(RateLimitMiddleware, limiter=limiter)
+        app.include_router(router, prefix=prefix)
+        app.dependency_overrides[verfiy_api_key] = lambda: {"status": True}
+        return TestClient(app)
+
+    return make
@@ -0,0 +1,150 @@
+# built-in modules
+import asyncio
+import threading
+
+# custom modules
+from services import cache_service
+from services.cache_service import MemoryCacheBackend, TieredCache, _encode
+
+
+def make_cache() -> tuple[TieredCache, MemoryCacheBackend]:
+    backend = MemoryCacheBackend()
+    return TieredCache("tests", ttl=60, backend=backend), backend
+
+
+def test_waiter_takes_the_value_loaded_by_the_lock_holder():
+    cache, backend = make_cache()
+    l2_key = cache._l2_key("key")
+    backend.add(f"{l2_key}:lock", b"1", 60)
+
+    # The other worker finishes its load while this one waits
+    timer = threading.Timer(0.1, backend.set, (l2_key, _encode("theirs"), 60))
+    timer.start()
+    value = cache._load("key", lambda: "ours", 60, None)
+    timer.join()
+
+    assert value == "theirs"
+    assert cache.loads == 0
+
+
+def test_timed_out_waiter_leaves_the_other_workers_lock(monkeypatch):
+    monkeypatch.setattr(cache_service, "CACHE_LOCK_TIMEOUT", 0.1)
+    cache, backend = make_cache()
+    lock_key = f"{cache._l2_key('key')}:lock"
+    backend.add(lock_key, b"1", 60)
+
+    assert cache._load("key", lambda: "ours", 60, None) == "ours"
+    assert backend.get(lock_key) == b"1"
+
+
+def test_lock_holder_releases_its_lock():
+    cache, backend = make_cache()
+
+    assert cache._load("key", lambda: "ours", 60, None) == "ours"
+    assert backend.get(f"{cache._l2_key('key')}:lock") is None
+
+
+def test_concurrent_misses_share_one_load():
+    cache, _ = make_cache()
+    calls = []
+
+    def loader():
+        calls.append(1)
+        return {"value": 1}
+
+    async def load_many():
+        return await asyncio.gather(
+            *(cache.get_or_set("key", loader) for _ in range(10))
+        )
+
+    assert asyncio.run(load_many()) == [{"value": 1}] * 10
+    assert len(calls) == 1
+
+
+def test_sketch_rows_index_independently():
+    sketch = cache_service.FrequencySketch(width=64, sample_size=10000)
+    indexes = [sketch._indexes(key) for key in range(20000)]
+    colliding = [rows for rows in indexes if rows[0] == indexes[0][0]]
+
+    # Keys sharing a slot in the first row are spread over the others
+    for row in range(1, sketch.depth):
+        assert len({rows[row] for rows in colliding}) > 48
+
+
+def test_sketch_estimates_frequencies():
+    sketch = cache_service.FrequencySketch(width=256, sample_size=10000)
+    for _ in range(5):
+        sketch.increment("hot")
+    sketch.increment("cold")
+
+    assert sketch.estimate("hot") == 5
+    assert sketch.estimate("cold") == 1
+    assert sketch.estimate("unseen") == 0
+
+
+def test_async_get_and_set():
+    cache, backend = make_cache()
+
+    async def round_trip():
+        assert await cache.aget("key") is None
+        await cache.aset("key", b"value")
+        cache.l1.clear()
+        return await cache.aget("key")
+
+    assert asyncio.run(round_trip()) == b"value"
+    assert backend.get(cache._l2_key("key")) is not None
+
+
+def test_none_results_use_their_own_ttl():
+    cache, backend = make_cache()
+    calls = []
+
+    def loader():
+        calls.append(1)
+        return None
+
+    async def load_twice(none_ttl):
+        await cache.get_or_set("missing", loader, none_ttl=none_ttl)
+        return await cache.get_or_set("missing", loader, none_ttl=none_ttl)
+
+    assert asyncio.run(load_twice(0)) is None
+    assert len(calls) == 2
+    assert backend.get(cache._l2_key("missing")) is None
+
+    assert asyncio.run(load_twice(10)) is None
+    assert len(calls) == 3
+    assert cache.l1.get("missing", "absent") is None
+
+
+def test_generation_is_refreshed_off_the_event_loop(monkeypatch):
+    cache, backend = make_cache()
+    loop_thread = threading.current_thread()
+    reads = []
+
+    def get_counter(key):
+        reads.append(threading.current_thread())
+        return 0
+
+    monkeypatch.setattr(backend, "get_counter", get_counter)
+
+    async def lookups():
+        await cache.aget("key")
+        await cache.get_or_set("other", lambda: 1)
+
+    asyncio.run(lookups())
+    assert reads and loop_thread not in reads
+
+
+def test_async_lookups_count_each_miss_once():
+    cache, _ = make_cache()
+
+    async def miss_then_hit():
+        assert await cache.aget("key") is None
+        await cache.aset("key", b"value")
+        return await cache.aget("key")
+
+    assert asyncio.run(miss_then_hit()) == b"value"
+    stats = cache.stats()
+    assert (stats["l1"]["hits"], stats["l1"]["misses"]) == (1, 1)
+    assert stats["l1"]["hit_ratio"] == 0.5
+    assert stats["l2_misses"] == 1
@@ -0,0 +1,46 @@
+# built-in modules
+import threading
+
+# custom modules
+from pipelines.inference_cache import InferenceCache
+
+
+def test_cached_predictions_survive_whitespace_differences(tmp_path):
+    cache = InferenceCache(path=str(tmp_path / "predictions.sqlite3"))
+    cache.set("v1", "Apple  beats\u00a0estimates", {"sentiment": "positive"})
+
+    assert cache.get("v1", "Apple beats estimates") == {"sentiment": "positive"}
+    assert cache.get("v2", "Apple beats estimates") is None
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_counters_are_exact_across_threads(tmp_path):
+    cache = InferenceCache(path=str(tmp_path / "predictions.sqlite3"))
+    cache.set("v1", "cached", {"sentiment": "neutral"})
+
+    def lookup():
+        for _ in range(200):
+            cache.get("v1", "cached")
+            cache.get("v1", "missing")
+
+    threads = [threading.Thread(target=lookup) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"]) == (1600, 1600)
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    cache = InferenceCache(path=str(tmp_path / "predictions.sqlite3"), max_entries=10)
+    for i in range(12):
+        cache.set("v1", f"sentence {i}", {"score": i})
+
+    stats = cache.stats()
+    assert stats["size"] == 10
+    assert stats["evictions"] == 2
+    assert cache.get("v1", "sentence 0") is None
+    assert cache.get("v1", "sentence 11") == {"score": 11}
@@ -0,0 +1,62 @@
+# custom modules
+from pipelines.near_duplicates import MinHasher, NearDuplicateIndex, similarity
+
+ARTICLE = (
+    "Apple reported quarterly revenue of 124 billion dollars on Thursday, "
+    "beating analyst estimates as iPhone sales in China recovered and the "
+    "services business set another record, while the company announced a "
+    "new 110 billion dollar share buyback program and raised its dividend. "
+    "Chief executive Tim Cook said demand for the latest models was strong "
+    "across every region, and the finance chief guided for revenue growth in "
+    "the low single digits for the June quarter despite currency headwinds"
+)
+SYNDICATED = "By Reuters staff. " + ARTICLE + ". Reporting by Jane Doe"
+UNRELATED = (
+    "Oil prices fell for a third straight session as OPEC members signalled "
+    "they would raise output next month, and US crude inventories rose more "
+    "than expected according to the Energy Information Administration"
+)
+
+
+def test_signatures_estimate_similarity():
+    hasher = MinHasher()
+    article = hasher.signature(ARTICLE)
+
+    assert similarity(article, hasher.signature(ARTICLE)) == 1.0
+    assert similarity(article, hasher.signature(SYNDICATED)) >= 0.8
+    assert similarity(article, hasher.signature(UNRELATED)) < 0.2
+    assert hasher.signature("") is None
+
+
+def test_index_finds_near_duplicates_only():
+    hasher = MinHasher()
+    index = NearDuplicateIndex(threshold=0.8)
+    index.add("https://example.com/apple", hasher.signature(ARTICLE))
+
+    match = index.query(hasher.signature(SYNDICATED))
+    assert match is not None and match[0] == "https://example.com/apple"
+    assert index.query(hasher.signature(UNRELATED)) is None
+
+
+def test_removed_articles_are_no_longer_matched():
+    hasher = MinHasher()
+    index = NearDuplicateIndex(threshold=0.8)
+    index.add("https://example.com/apple", hasher.signature(ARTICLE))
+
+    # An original that failed to save must not absorb its copies
+    index.remove("https://example.com/apple")
+    index.remove("https://example.com/never-added")
+
+    assert len(index) == 0
+    assert index.query(hasher.signature(SYNDICATED)) is None
+    assert not any(index._buckets)
+
+
+def test_articles_expire_after_the_window():
+    hasher = MinHasher()
+    index = NearDuplicateIndex(threshold=0.8, window_hours=1)
+    index.add("https://example.com/old", hasher.signature(ARTICLE), added_at=0)
+    index.add("https://example.com/oil", hasher.signature(UNRELATED))
+
+    assert len(index) == 1
+    assert index.query(hasher.signature(SYNDICATED)) is None
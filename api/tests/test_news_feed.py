@@ -0,0 +1,102 @@
+# built-in modules
+import re
+import asyncio
+from datetime import datetime
+
+# pip modules
+from fastapi import Response
+
+# custom modules
+from models.newsArticle_model import NewsArticle
+from routers import news_router
+from services.news_feed_service import NewsFeed
+
+
+def save_articles(count: int) -> list[str]:
+    return [
+        str(
+            NewsArticle(
+                title=f"Article {i}",
+                description="",
+                article_url=f"https://example.com/{i}",
+                image_url="",
+                published_at=datetime(2026, 1, 1),
+                tickers=["AAPL"],
+            )
+            .save()
+            .id
+        )
+        for i in range(count)
+    ]
+
+
+def make_feed(monkeypatch, **kwargs) -> NewsFeed:
+    feed = NewsFeed(**kwargs)
+    # No watcher thread, articles are published by the tests
+    monkeypatch.setattr(feed, "_start", lambda: None)
+    monkeypatch.setattr(news_router, "news_feed", feed)
+    monkeypatch.setattr(news_router, "FEED_HEARTBEAT_INTERVAL", 0.01)
+    return feed
+
+
+async def read_until_idle(events) -> str:
+    """Read a feed stream up to its first keep-alive."""
+    body = b""
+    async for chunk in events:
+        if chunk == b": keep-alive\n\n":
+            break
+        body += chunk
+    await events.aclose()
+    return body.decode()
+
+
+def replayed_ids(after: str) -> list[str]:
+    events = news_router.news_feed_events(None, news_router.parse_cursor(after))
+    body = asyncio.run(read_until_idle(events))
+    return re.findall(r"id: (\w+)\nevent: article", body)
+
+
+def test_replay_pages_through_the_whole_gap(db, monkeypatch):
+    ids = save_articles(7)
+    feed = make_feed(monkeypatch, backfill_limit=2)
+
+    articles, more = feed.replay(news_router.parse_cursor(ids[0]))
+    assert [article["id"] for article in articles] == ids[1:3]
+    assert more
+
+    assert replayed_ids(ids[0]) == ids[1:]
+    assert feed.subscriptions == 0
+
+
+def test_replay_from_the_buffer(db, monkeypatch):
+    ids = save_articles(4)
+    feed = make_feed(monkeypatch, backfill_limit=2)
+    for raw in NewsArticle.objects.order_by("id").as_pymongo():
+        feed._publish(raw["_id"], {"id": str(raw["_id"]), "tickers": raw["tickers"]})
+
+    articles, more = feed.replay(news_router.parse_cursor(ids[0]))
+    assert [article["id"] for article in articles] == ids[1:]
+    assert not more
+
+    assert replayed_ids(ids[1]) == ids[2:]
+
+
+def test_feed_subscribes_only_once_it_starts(db, monkeypatch):
+    ids = save_articles(2)
+    feed = make_feed(monkeypatch)
+
+    async def stream():
+        response = await news_router.get_news_feed(
+            {"status": True}, Response(), tickers="aapl", last_event_id=ids[0]
+        )
+        # A client gone before the body starts leaves nothing behind
+        assert feed.subscriptions == 0
+
+        first = await response.body_iterator.__anext__()
+        assert feed.subscriptions == 1
+
+        await response.body_iterator.aclose()
+        assert feed.subscriptions == 0
+        return first.decode()
+
+    assert f"id: {ids[1]}" in asyncio.run(stream())
@@ -0,0 +1,72 @@
+# built-in modules
+import asyncio
+
+# pip modules
+from fastapi import Response
+
+# custom modules
+from routers import prices_router
+from services.price_service import PriceHub, price_cache
+
+API_KEY = {"status": True}
+
+
+def fake_fetch_price(ticker: str, strict: bool = False) -> dict:
+    if ticker != "AAPL":
+        if strict:
+            raise KeyError("regularMarketPrice")
+        return {"price": 0}
+    return {"price": 190.5}
+
+
+def setup_function():
+    price_cache.invalidate()
+
+
+def test_bulk_placeholder_is_not_served_as_a_price(monkeypatch):
+    monkeypatch.setattr(prices_router, "fetch_price", fake_fetch_price)
+
+    bulk = asyncio.run(
+        prices_router.get_prices_bulk(API_KEY, Response(), tickers="XXXX,aapl")
+    )
+    assert bulk["data"] == {"XXXX": {"price": 0}, "aapl": {"price": 190.5}}
+
+    response = Response()
+    single = asyncio.run(prices_router.get_prices(API_KEY, response, ticker="xxxx"))
+    assert response.status_code == 400
+    assert single["status"] is False
+
+
+def test_tickers_are_cached_case_insensitively(monkeypatch):
+    calls = []
+
+    def fetch(ticker, strict=False):
+        calls.append(ticker)
+        return fake_fetch_price(ticker, strict)
+
+    monkeypatch.setattr(prices_router, "fetch_price", fetch)
+
+    asyncio.run(prices_router.get_prices(API_KEY, Response(), ticker="aapl"))
+    asyncio.run(prices_router.get_prices(API_KEY, Response(), ticker="AAPL"))
+    assert calls == ["AAPL"]
+
+
+def test_stream_subscribes_only_once_it_starts(monkeypatch):
+    hub = PriceHub(poll_interval=60, fetch=lambda ticker: fake_fetch_price(ticker))
+    monkeypatch.setattr(prices_router, "price_hub", hub)
+
+    async def stream():
+        response = await prices_router.stream_prices(
+            API_KEY, Response(), tickers="aapl"
+        )
+        # A client gone before the body starts leaves nothing behind
+        assert hub.stats()["subscriptions"] == 0
+
+        first = await response.body_iterator.__anext__()
+        assert hub.stats()["subscriptions"] == 1
+
+        await response.body_iterator.aclose()
+        assert hub.stats()["subscriptions"] == 0
+        return first
+
+    assert b'"price":190.5' in asyncio.run(stream())
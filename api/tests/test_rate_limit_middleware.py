@@ -0,0 +1,49 @@
+# pip modules
+from fastapi import APIRouter
+
+# custom modules
+from models.apiUsage_model import ApiUsage
+from models.user_model import User
+from services.rate_limit_service import RateLimiter
+
+
+router = APIRouter()
+
+
+@router.get("/news")
+def news():
+    return {"status": True}
+
+
+def test_unknown_keys_share_the_address_bucket(db, make_client):
+    limiter = RateLimiter(capacity=3, refill_rate=0.001)
+    client = make_client(router, "/api/v1", limiter)
+
+    statuses = [
+        client.get("/api/v1/news", params={"api_key": f"made-up-{i}"}).status_code
+        for i in range(5)
+    ]
+
+    assert statuses == [200, 200, 200, 429, 429]
+    assert list(limiter._buckets) == ["ip:testclient"]
+
+    limiter.flush()
+    assert ApiUsage.objects.count() == 0
+
+
+def test_known_key_gets_its_own_bucket(db, make_client):
+    User(
+        name="Ada", email="ada@example.com", password="password", api_key="real-key"
+    ).save()
+    limiter = RateLimiter(capacity=3, refill_rate=0.001)
+    client = make_client(router, "/api/v1", limiter)
+
+    response = client.get("/api/v1/news", headers={"Authorization": "Bearer real-key"})
+
+    assert response.status_code == 200
+    assert response.headers["X-RateLimit-Remaining"] == "2"
+    assert limiter.is_loaded("real-key")
+
+    limiter.flush()
+    usage = ApiUsage.objects.get(api_key="real-key")
+    assert (usage.requests, usage.cost) == (1, 1)
@@ -0,0 +1,55 @@
+# custom modules
+from models.apiUsage_model import ApiQuota, ApiUsage
+from services.rate_limit_service import RateLimiter
+
+
+def usage_rows() -> dict:
+    return {
+        (row.api_key, row.route): (row.requests, row.cost)
+        for row in ApiUsage.objects
+    }
+
+
+def test_flush_writes_usage_and_bucket_state(db):
+    limiter = RateLimiter(capacity=10, refill_rate=1, persist=True)
+    limiter.acquire("key-a", "/api/v1/news", 1)
+    limiter.acquire("key-a", "/api/v1/news", 1)
+    limiter.acquire("key-b", "/api/v1/quotes", 2)
+
+    limiter.flush()
+
+    assert usage_rows() == {
+        ("key-a", "/api/v1/news"): (2, 2),
+        ("key-b", "/api/v1/quotes"): (1, 2),
+    }
+    assert ApiQuota.objects.count() == 2
+
+
+def test_failed_flush_does_not_bill_written_rows_twice(db, monkeypatch):
+    limiter = RateLimiter(capacity=10, refill_rate=1, persist=True)
+    for api_key in ("key-a", "key-b", "key-c"):
+        limiter.acquire(api_key, "/api/v1/news", 1)
+
+    # The second usage write fails, after the first one went through
+    update_one = type(ApiUsage.objects).update_one
+    writes = []
+
+    def flaky_update_one(queryset, *args, **kwargs):
+        writes.append(kwargs)
+        if len(writes) == 2:
+            raise ConnectionError("primary stepped down")
+        return update_one(queryset, *args, **kwargs)
+
+    monkeypatch.setattr(type(ApiUsage.objects), "update_one", flaky_update_one)
+    limiter.flush()
+    monkeypatch.undo()
+
+    limiter._flushed_at = 0
+    limiter.flush()
+
+    assert usage_rows() == {
+        ("key-a", "/api/v1/news"): (1, 1),
+        ("key-b", "/api/v1/news"): (1, 1),
+        ("key-c", "/api/v1/news"): (1, 1),
+    }
+    assert ApiQuota.objects.count() == 3
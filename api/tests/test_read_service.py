@@ -0,0 +1,27 @@
+# pip modules
+import pymongo
+import pytest
+
+# custom modules
+from models.newsArticle_model import NewsArticle
+from models.stock_model import Stock
+from services.read_service import db_field_name, sort_spec
+
+
+def test_field_names_are_translated_to_db_names():
+    assert db_field_name(NewsArticle, "published_at") == "publishedAt"
+    assert db_field_name(NewsArticle, "publishedAt") == "publishedAt"
+    assert db_field_name(Stock, "address__zip_code") == "address.zipCode"
+    assert db_field_name(Stock, "_id") == "_id"
+
+
+@pytest.mark.parametrize("name", ["$where", "publishedAt.$", "nope", "", "a.b"])
+def test_unknown_fields_are_rejected(name):
+    with pytest.raises(ValueError):
+        sort_spec(NewsArticle, name)
+
+
+def test_sort_spec_direction():
+    assert sort_spec(NewsArticle, "published_at", descending=True) == [
+        ("publishedAt", pymongo.DESCENDING)
+    ]
@@ -0,0 +1,107 @@
+# built-in modules
+import time
+import threading
+
+# pip modules
+import pytest
+
+# custom modules
+from pipelines.runner import Stage, StagedRunner
+
+
+def test_single_worker_stages_keep_the_order():
+    seen = []
+    runner = StagedRunner(
+        [
+            Stage("double", lambda item: item * 2),
+            Stage("increment", lambda item: item + 1),
+            Stage("collect", seen.append),
+        ],
+        queue_size=2,
+    )
+
+    # The last stage returns None, so nothing counts as completed
+    assert runner.run(range(50)) == 0
+    assert seen == [item * 2 + 1 for item in range(50)]
+    assert runner.errors == []
+
+
+def test_failed_items_are_recorded_and_the_rest_carry_on():
+    def check(item):
+        if item % 3 == 0:
+            raise ValueError(f"bad {item}")
+        return item
+
+    runner = StagedRunner([Stage("check", check), Stage("keep", lambda item: item)])
+
+    assert runner.run(range(10)) == 6
+    assert [(stage, item) for stage, item, _ in runner.errors] == [
+        ("check", 0),
+        ("check", 3),
+        ("check", 6),
+        ("check", 9),
+    ]
+    assert all(isinstance(error, ValueError) for _, _, error in runner.errors)
+
+
+def test_batches_keep_the_order_and_flush_at_the_end():
+    batches = []
+
+    def write(batch):
+        batches.append(batch)
+        return batch
+
+    runner = StagedRunner(
+        [
+            Stage("parse", int),
+            Stage("write", write, batch_size=4, batch_wait=5),
+        ]
+    )
+
+    assert runner.run(str(item) for item in range(10)) == 3
+    assert batches == [[0, 1, 2, 3], [4, 5, 6, 7], [8, 9]]
+
+
+def test_every_item_goes_through_parallel_workers():
+    threads = set()
+    lock = threading.Lock()
+
+    def fetch(item):
+        with lock:
+            threads.add(threading.current_thread().name)
+        return item
+
+    runner = StagedRunner(
+        [Stage("fetch", fetch, workers=4), Stage("keep", lambda item: item)]
+    )
+
+    assert runner.run(range(200)) == 200
+    assert threads <= {f"pipeline-fetch-{worker}" for worker in range(4)}
+
+
+def test_failed_setup_is_recorded_but_the_stage_still_runs():
+    def setup():
+        raise RuntimeError("no torch")
+
+    runner = StagedRunner([Stage("infer", lambda item: item, setup=setup)])
+
+    assert runner.run(range(3)) == 3
+    assert [(stage, item) for stage, item, _ in runner.errors] == [("infer", None)]
+
+
+def test_items_in_flight_finish_when_the_source_fails():
+    saved = []
+
+    def source():
+        yield from range(5)
+        raise ConnectionError("driver crashed")
+
+    def save(item):
+        time.sleep(0.01)
+        saved.append(item)
+
+    runner = StagedRunner([Stage("fetch", lambda item: item), Stage("save", save)])
+
+    with pytest.raises(ConnectionError):
+        runner.run(source())
+    assert saved == [0, 1, 2, 3, 4]
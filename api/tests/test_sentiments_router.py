@@ -0,0 +1,60 @@
+# built-in modules
+from datetime import datetime
+
+# custom modules
+from models.newsArticle_model import Insight, NewsArticle
+from models.stock_model import Stock
+from routers import sentiments_router
+
+
+def save_article(score: float) -> NewsArticle:
+    return NewsArticle(
+        title="Apple beats estimates",
+        description="",
+        article_url="https://example.com/apple",
+        image_url="",
+        published_at=datetime(2026, 1, 2),
+        tickers=["AAPL"],
+        insights=[
+            Insight(
+                ticker="AAPL",
+                sentiment="positive",
+                sentiment_reasoning="",
+                sentiment_score=score,
+            )
+        ],
+    ).save()
+
+
+def test_trend_is_revalidated_with_its_etag(db, make_client):
+    Stock.objects.insert(Stock(ticker="AAPL", company_name="Apple Inc."))
+    save_article(0.5)
+    client = make_client(sentiments_router.router, "/api/v1/sentiments")
+
+    response = client.get("/api/v1/sentiments/trend/AAPL")
+    assert response.status_code == 200
+    assert response.json()["data"] == [{"s": 0.5, "t": "2026-01-02"}]
+    etag = response.headers["ETag"]
+
+    response = client.get(
+        "/api/v1/sentiments/trend/AAPL", headers={"If-None-Match": etag}
+    )
+    assert response.status_code == 304
+
+
+def test_trend_etag_changes_when_an_article_is_edited(db, make_client):
+    Stock.objects.insert(Stock(ticker="AAPL", company_name="Apple Inc."))
+    article = save_article(0.5)
+    client = make_client(sentiments_router.router, "/api/v1/sentiments")
+    etag = client.get("/api/v1/sentiments/trend/AAPL").headers["ETag"]
+
+    # Same count and newest _id, only the insight was rescored
+    article.insights[0].sentiment_score = -0.5
+    article.save()
+
+    response = client.get(
+        "/api/v1/sentiments/trend/AAPL", headers={"If-None-Match": etag}
+    )
+    assert response.status_code == 200
+    assert response.json()["data"] == [{"s": -0.5, "t": "2026-01-02"}]
+    assert response.headers["ETag"] != etag
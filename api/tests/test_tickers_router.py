@@ -0,0 +1,57 @@
+# custom modules
+from models.stock_model import Stock
+from routers import tickers_router
+
+
+def setup_function():
+    tickers_router.profile_cache.invalidate()
+
+
+def test_unknown_ticker_is_not_cached_for_the_profile_ttl(db, monkeypatch, make_client):
+    monkeypatch.setattr(tickers_router, "TICKER_NOT_FOUND_TTL", 0)
+    client = make_client(tickers_router.router, "/api/v1/tickers")
+
+    assert client.get("/api/v1/tickers/NEWCO").status_code == 404
+
+    Stock.objects.insert(Stock(ticker="NEWCO", company_name="New Co"))
+    response = client.get("/api/v1/tickers/NEWCO")
+    assert response.status_code == 200
+    assert response.json()["data"]["ticker"] == "NEWCO"
+
+
+def test_profile_is_revalidated_with_its_etag(db, make_client):
+    Stock.objects.insert(Stock(ticker="AAPL", company_name="Apple Inc."))
+    client = make_client(tickers_router.router, "/api/v1/tickers")
+
+    etag = client.get("/api/v1/tickers/AAPL").headers["ETag"]
+    response = client.get("/api/v1/tickers/AAPL", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+
+
+def test_tickers_sort_by_model_or_db_field_names(db, make_client):
+    Stock.objects.insert(
+        [
+            Stock(ticker="MSFT", company_name="Microsoft"),
+            Stock(ticker="AAPL", company_name="Apple Inc."),
+        ]
+    )
+    client = make_client(tickers_router.router, "/api/v1/tickers")
+
+    for sort_by in ("company_name", "companyName"):
+        response = client.get(
+            "/api/v1/tickers", params={"market": "stocks", "sort_by": sort_by}
+        )
+        assert response.status_code == 200
+        assert [t["ticker"] for t in response.json()["data"]] == ["AAPL", "MSFT"]
+
+
+def test_tickers_reject_unknown_sort_fields(db, make_client):
+    Stock.objects.insert(Stock(ticker="AAPL", company_name="Apple Inc."))
+    client = make_client(tickers_router.router, "/api/v1/tickers")
+
+    for sort_by in ("$where", "companyName.x", "exchange.name", "nope"):
+        response = client.get(
+            "/api/v1/tickers", params={"market": "stocks", "sort_by": sort_by}
+        )
+        assert response.status_code == 400
+        assert response.json()["status"] is False
@@ -0,0 +1,36 @@
+# built-in modules
+import time
+
+# custom modules
+from services import token_cache_service
+from services.cache_service import MemoryCacheBackend
+from services.token_cache_service import TokenCache
+
+PAYLOAD = {"sub": "ada@example.com", "exp": time.time() + 3600}
+USER = {"email": "ada@example.com", "api_key": "old-key"}
+
+
+def test_invalidating_a_user_reaches_other_workers(monkeypatch):
+    monkeypatch.setattr(token_cache_service, "CACHE_GENERATION_CHECK_INTERVAL", 0)
+    backend = MemoryCacheBackend()
+    worker, other_worker = TokenCache(backend=backend), TokenCache(backend=backend)
+    for cache in (worker, other_worker):
+        cache.set("token", PAYLOAD, USER)
+        assert cache.get("token") == USER
+
+    worker.invalidate_user("ada@example.com")
+
+    assert worker.get("token") is None
+    assert other_worker.get("token") is None
+
+
+def test_entries_are_kept_between_generation_checks():
+    backend = MemoryCacheBackend()
+    worker, other_worker = TokenCache(backend=backend), TokenCache(backend=backend)
+    other_worker.set("token", PAYLOAD, USER)
+    assert other_worker.get("token") == USER
+
+    worker.invalidate_user("grace@example.com")
+
+    # Not checked again within CACHE_GENERATION_CHECK_INTERVAL
+    assert other_worker.get("token") == USER
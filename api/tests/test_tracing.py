@@ -0,0 +1,57 @@
+# built-in modules
+import time
+import pstats
+import threading
+
+# custom modules
+from pipelines.tracing import Tracer
+
+
+def slow_stage():
+    time.sleep(0.02)
+
+
+def fast_stage():
+    pass
+
+
+def test_items_traced_across_threads_are_profiled(tmp_path):
+    tracer = Tracer(profile_slowest=1, profile_dir=str(tmp_path))
+    slow, fast = tracer.begin("slow"), tracer.begin("fast")
+
+    def run(trace, stage, fn):
+        with tracer.resume(trace):
+            with tracer.span(stage):
+                fn()
+
+    # Each item's stages run on threads of their own, as in StagedRunner
+    for trace, fn in ((slow, slow_stage), (fast, fast_stage)):
+        for stage in ("fetch", "score"):
+            thread = threading.Thread(target=run, args=(trace, stage, fn))
+            thread.start()
+            thread.join()
+        tracer.end(trace)
+
+    paths = tracer.save_profiles()
+    assert len(paths) == 1 and "(slow," in paths[0]
+
+    stats = pstats.Stats(paths[0].split(" ")[0])
+    calls = {
+        function: stat[0]
+        for (_, _, function), stat in stats.stats.items()
+        if function in ("slow_stage", "fast_stage")
+    }
+    # Both of the slow item's resumed blocks are in its profile
+    assert calls == {"slow_stage": 2}
+
+
+def test_items_are_not_profiled_by_default():
+    tracer = Tracer(profile_slowest=0)
+    trace = tracer.begin("article")
+    with tracer.resume(trace):
+        with tracer.span("fetch"):
+            pass
+    tracer.end(trace)
+
+    assert tracer.save_profiles() == []
+    assert [key for _, key, _ in tracer.items] == ["article"]
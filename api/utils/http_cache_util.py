@@ -0,0 +1,57 @@
+# built-in modules
+import os
+import hashlib
+
+# pip modules
+from fastapi import Request, Response, status
+
+
+# Seconds browsers and CDNs may reuse a response before revalidating it
+TICKER_MAX_AGE = int(os.getenv("TICKER_CACHE_MAX_AGE") or 300)
+NEWS_MAX_AGE = int(os.getenv("NEWS_CACHE_MAX_AGE") or 60)
+SENTIMENT_MAX_AGE = int(os.getenv("SENTIMENT_CACHE_MAX_AGE") or 300)
+
+
+def cache_control(max_age: int) -> str:
+    return f"public, max-age={max_age}"
+
+
+def make_etag(*parts) -> str:
+    """Build a strong ETag from the values that determine a response.
+
+    Args:
+        *parts: Anything whose `repr` changes when the response changes, e.g.
+            ids and `updatedAt` timestamps, counts or request parameters.
+    """
+    digest = hashlib.blake2b(repr(parts).encode(), digest_size=16).hexdigest()
+    return f'"{digest}"'
+
+
+def is_not_modified(request: Request, etag: str) -> bool:
+    """Check the request's `If-None-Match` header against `etag`."""
+    if_none_match = request.headers.get("If-None-Match")
+    if not if_none_match:
+        return False
+
+    if if_none_match.strip() == "*":
+        return True
+
+    # If-None-Match uses weak comparison, so W/ prefixes are ignored
+    candidates = (tag.strip().removeprefix("W/") for tag in if_none_match.split(","))
+    return etag in candidates
+
+
+def not_modified(etag: str, cache_control: str) -> Response:
+    return Response(
+        status_code=status.HTTP_304_NOT_MODIFIED,
+        headers=cache_headers(etag, cache_control),
+    )
+
+
+def cache_headers(etag: str, cache_control: str) -> dict:
+    return {
+        "ETag": etag,
+        "Cache-Control": cache_control,
+        # Keys sent as a header must not share cache entries
+        "Vary": "Authorization",
+    }
@@ -0,0 +1,90 @@
+# pip modules
+import orjson
+from fastapi import Response
+from mongoengine.fields import EmbeddedDocumentField, ListField
+
+
+class Serializer:
+    """Converts raw pymongo documents into snake_case API dicts.
+
+    The key mapping is compiled once from the MongoEngine field definitions
+    (`db_field` -> attribute name), so serialising a document is a single
+    pass over its keys with no MongoEngine document construction. Keys that
+    are not declared on the model are passed through unchanged.
+
+    Args:
+        document_cls: MongoEngine `Document` or `EmbeddedDocument` class.
+        rename (dict, optional): Extra raw key -> output key overrides, also
+            applied to embedded documents.
+        exclude (set, optional): Output keys to drop.
+    """
+
+    def __init__(self, document_cls, rename: dict | None = None, exclude: set | None = None):
+        rename = rename or {}
+        exclude = set(exclude or ())
+
+        self._keys: dict[str, str] = dict(rename)
+        self._nested: dict[str, tuple["Serializer", bool]] = {}
+        self._skip: set[str] = set()
+
+        for name, field in document_cls._fields.items():
+            raw_key = field.db_field or name
+            out_key = "id" if raw_key == "_id" else rename.get(raw_key, name)
+
+            if out_key in exclude:
+                self._skip.add(raw_key)
+                continue
+
+            self._keys[raw_key] = out_key
+
+            if isinstance(field, EmbeddedDocumentField):
+                self._nested[raw_key] = (Serializer(field.document_type, rename), False)
+            elif isinstance(field, ListField) and isinstance(
+                field.field, EmbeddedDocumentField
+            ):
+                self._nested[raw_key] = (
+                    Serializer(field.field.document_type, rename),
+                    True,
+                )
+
+    def __call__(self, raw: dict) -> dict:
+        keys = self._keys
+        nested = self._nested
+        skip = self._skip
+
+        doc = {}
+        for key, value in raw.items():
+            if key in skip:
+                continue
+
+            if key == "_id":
+                value = str(value)
+            elif key in nested and value is not None:
+                serializer, many = nested[key]
+                if many:
+                    value = [
+                        serializer(item) if isinstance(item, dict) else item
+                        for item in value
+                    ]
+                elif isinstance(value, dict):
+                    value = serializer(value)
+
+            doc[keys.get(key, key)] = value
+
+        return doc
+
+    def many(self, raws) -> list[dict]:
+        return [self(raw) for raw in raws]
+
+
+class FastJSONResponse(Response):
+    """JSON response rendered with orjson.
+
+    Returning this from an endpoint skips FastAPI's `jsonable_encoder` pass.
+    ObjectIds and other unknown types are rendered with `str`.
+    """
+
+    media_type = "application/json"
+
+    def render(self, content) -> bytes:
+        return orjson.dumps(content, default=str, option=orjson.OPT_NON_STR_KEYS)